@@ -8,8 +8,17 @@ from flask_cors import CORS
 from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.automation import automation_bp
-
+from src.routes.application_history import application_history_bp
 from src.routes.resume_analysis import resume_analysis_bp
+from src.routes.resume_match import resume_match_bp
+from src.analysis.resume_analyzer import get_resume_analyzer
+from src.models.jobs import Job  # tabelas lidas pelo /api/resume/match
+from src.models.job_detail import JobDetail
+from src.models.analysis_cache import ResumeAnalysisCacheEntry  # tabela do cache de análises
+from src.models.application_dedup import get_application_dedup_cache
+from src.models.application_recorder import get_application_recorder
+from src.database.migrations import run_migrations
+from src.database.sqlite_profile import configure_sqlite, engine_options
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -20,13 +29,24 @@ CORS(app)
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(automation_bp, url_prefix='/api')
 app.register_blueprint(resume_analysis_bp, url_prefix='/api')
+app.register_blueprint(resume_match_bp, url_prefix='/api')
+app.register_blueprint(application_history_bp)
 
 # uncomment if you need to use database
 app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# mesma inicialização de src/main.py: PRAGMAs, migrações (triggers/índices que o create_all não cria),
+# cache de duplicadas e gravação write-behind
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options()
 db.init_app(app)
 with app.app_context():
+    configure_sqlite(app, db)
     db.create_all()
+    run_migrations(db)
+    get_application_dedup_cache().warm()
+get_application_recorder().start(app)
+# monta o analisador de currículos (NLTK, stopwords, radicais) antes da primeira requisição
+get_resume_analyzer()
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
@@ -0,0 +1,253 @@
+"""
+Análise de currículos em lote (vários arquivos ou um .zip por requisição).
+
+/upload-resume analisa um arquivo por vez, na thread da requisição, e a extração do PDF
+(PyPDF2, Python puro) segura o GIL. Aqui cada arquivo vai para um pool de processos
+(ProcessPoolExecutor, analisador já montado em cada worker pelo initializer) com no
+máximo `queue_size` arquivos em andamento: a leitura do upload/zip só avança quando
+um resultado sai, então a memória fica limitada mesmo com pastas grandes. Os resultados
+são devolvidos na ordem em que terminam.
+
+Cache: os resultados ficam só no AnalysisCache (texto normalizado + versão das
+palavras-chave), o mesmo de /upload-resume e /analyze-text, gravado pelo processo
+principal — os workers analisam sem cache. Um LRU em memória guarda apenas SHA-256 dos
+bytes -> texto extraído, para o arquivo reenviado não passar de novo pela extração do PDF
+antes da consulta ao AnalysisCache. Arquivos repetidos dentro do lote são analisados uma vez.
+"""
+import atexit
+import hashlib
+import logging
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.analysis.resume_analyzer import ResumeAnalyzer, get_resume_analyzer
+from src.models.analysis_cache import get_analysis_cache
+
+logger = logging.getLogger("BatchResumeAnalyzer")
+
+MAX_FILE_BYTES = 10 * 1024 * 1024
+MAX_BATCH_FILES = 200
+DEFAULT_CACHE_SIZE = 512
+
+# (nome do arquivo, bytes, erro de leitura)
+Upload = Tuple[str, Optional[bytes], Optional[str]]
+
+
+def _init_worker():
+    """Monta o analisador (NLTK, radicais, autômato) uma vez por processo do pool"""
+    get_resume_analyzer()
+
+
+def analyze_upload(filename: str, data: Optional[bytes], text: Optional[str] = None) -> Tuple[Optional[str], Dict]:
+    """
+    Roda no worker: extrai o texto (PDF da memória, demais como UTF-8), se ainda não veio
+    pronto, e analisa sem cache. Retorna (texto, análise); texto None se a extração falhou.
+    """
+    analyzer = get_resume_analyzer()
+    if text is None:
+        try:
+            text = analyzer.extract_bytes(data, filename)
+        except Exception as e:
+            return None, ResumeAnalyzer.error_result(e)
+    return text, analyzer.analyze_content(text, use_cache=False)
+
+
+def _allowed(filename: str, extensions: Set[str]) -> bool:
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in extensions
+
+
+def expand_uploads(files: Iterable[Tuple[str, IO]], extensions: Set[str],
+                   max_files: int = MAX_BATCH_FILES) -> Iterator[Upload]:
+    """
+    Arquivos enviados -> (nome, bytes, erro). Um .zip vira os seus arquivos permitidos
+    (pastas e __MACOSX ignorados); arquivos acima de MAX_FILE_BYTES viram erro sem serem lidos
+    por inteiro. Lido sob demanda: só o que o pool consome fica em memória.
+    """
+    count = 0
+    for filename, stream in files:
+        if filename.lower().endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(stream)
+            except zipfile.BadZipFile as e:
+                yield filename, None, f'Zip inválido: {e}'
+                continue
+            with archive:
+                for info in archive.infolist():
+                    name = info.filename
+                    if info.is_dir() or name.startswith('__MACOSX/') or not _allowed(name, extensions):
+                        continue
+                    count += 1
+                    if count > max_files:
+                        yield name, None, f'Limite de {max_files} arquivos por lote'
+                        return
+                    if info.file_size > MAX_FILE_BYTES:
+                        yield name, None, 'Arquivo muito grande'
+                        continue
+                    with archive.open(info) as member:
+                        data = member.read(MAX_FILE_BYTES + 1)
+                    if len(data) > MAX_FILE_BYTES:
+                        yield name, None, 'Arquivo muito grande'
+                        continue
+                    yield name, data, None
+            continue
+        if not _allowed(filename, extensions):
+            yield filename, None, 'Tipo de arquivo não permitido'
+            continue
+        count += 1
+        if count > max_files:
+            yield filename, None, f'Limite de {max_files} arquivos por lote'
+            return
+        data = stream.read(MAX_FILE_BYTES + 1)
+        if len(data) > MAX_FILE_BYTES:
+            yield filename, None, 'Arquivo muito grande'
+            continue
+        yield filename, data, None
+
+
+class BatchResumeAnalyzer:
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        if workers is None:
+            workers = int(os.environ.get('JOBHUNTER_RESUME_WORKERS', min(4, os.cpu_count() or 1)))
+        if queue_size is None:
+            queue_size = int(os.environ.get('JOBHUNTER_RESUME_QUEUE', workers * 2))
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._texts: "OrderedDict[str, str]" = OrderedDict()  # sha256 dos bytes -> texto extraído
+        self.stats = {'hits': 0, 'misses': 0, 'text_hits': 0, 'analyzed': 0, 'errors': 0}
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        self._reset_pool()
+
+    # -------------------------- cache --------------------------
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _text_of(self, digest: str) -> Optional[str]:
+        with self._lock:
+            text = self._texts.get(digest)
+            if text is not None:
+                self._texts.move_to_end(digest)
+                self.stats['text_hits'] += 1
+            return text
+
+    def _remember_text(self, digest: str, text: str):
+        with self._lock:
+            self._texts[digest] = text
+            self._texts.move_to_end(digest)
+            while len(self._texts) > self.cache_size:
+                self._texts.popitem(last=False)
+
+    @staticmethod
+    def _cached_result(text: str) -> Optional[Dict]:
+        key, _ = get_resume_analyzer().cache_key(text)
+        return get_analysis_cache().get(key)
+
+    @staticmethod
+    def _store_result(text: str, result: Dict):
+        # erros não entram no cache (AnalysisCache.put ignora): o próximo envio tenta de novo
+        key, version = get_resume_analyzer().cache_key(text)
+        get_analysis_cache().put(key, version, result)
+
+    # -------------------------- lote --------------------------
+
+    def analyze(self, uploads: Iterable[Upload]) -> Iterator[Dict]:
+        """
+        Um item por arquivo, na ordem em que terminam:
+        {'filename', 'sha256', 'cached', 'analysis'} ou {'filename', 'error'}
+        """
+        pending: Dict[Future, str] = {}
+        waiting: Dict[str, List[str]] = {}  # sha256 -> arquivos aguardando esse resultado
+        for filename, data, error in uploads:
+            if error:
+                self._count('errors')
+                yield {'filename': filename, 'error': error}
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            if digest in waiting:  # repetido dentro do lote
+                waiting[digest].append(filename)
+                continue
+            text = self._text_of(digest)
+            result = self._cached_result(text) if text else None
+            if result is not None:
+                self._count('hits')
+                yield self._item(filename, digest, result, cached=True)
+                continue
+            self._count('misses')
+            # fila limitada: só lê o próximo arquivo quando há vaga no pool
+            while len(pending) >= self.queue_size:
+                yield from self._collect(pending, waiting)
+            # texto já conhecido: o worker só analisa (sem reenviar os bytes nem extrair de novo)
+            future = self._executor().submit(analyze_upload, filename, None if text else data, text)
+            pending[future] = digest
+            waiting[digest] = [filename]
+        while pending:
+            yield from self._collect(pending, waiting)
+
+    def _collect(self, pending: Dict[Future, str], waiting: Dict[str, List[str]]) -> Iterator[Dict]:
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            digest = pending.pop(future)
+            text = None
+            try:
+                text, result = future.result()
+            except BrokenProcessPool as e:
+                logger.error(f"❌ Pool de análise caiu, recriando: {e}")
+                self._reset_pool()
+                result = ResumeAnalyzer.error_result(e)
+            except Exception as e:
+                result = ResumeAnalyzer.error_result(e)
+            if text:
+                self._remember_text(digest, text)
+                self._store_result(text, result)
+            self._count('errors' if result.get('error') else 'analyzed')
+            for position, filename in enumerate(waiting.pop(digest)):
+                yield self._item(filename, digest, result, cached=position > 0)
+
+    @staticmethod
+    def _item(filename: str, digest: str, result: Dict, cached: bool) -> Dict:
+        item = {'filename': filename, 'sha256': digest, 'cached': cached, 'analysis': result}
+        if result.get('error'):
+            item['error'] = result['error']
+        return item
+
+    def info(self) -> Dict:
+        with self._lock:
+            return {'workers': self.workers, 'queue_size': self.queue_size,
+                    'text_entries': len(self._texts), **self.stats}
+
+
+_batch = None
+_batch_lock = threading.Lock()
+
+
+def get_batch_analyzer() -> BatchResumeAnalyzer:
+    """Pool de análise do processo (criado no primeiro lote, encerrado na saída)"""
+    global _batch
+    with _batch_lock:
+        if _batch is None:
+            _batch = BatchResumeAnalyzer()
+            atexit.register(_batch.shutdown)
+        return _batch
@@ -0,0 +1,314 @@
+"""
+Ranking de vagas para um currículo (TF-IDF + cosseno, NumPy).
+
+O currículo era comparado só com as cinco listas fixas de palavras-chave. O JobMatchIndex
+mantém uma matriz esparsa (COO: linha = vaga, coluna = termo, valor = 1 + log tf) sobre
+título + descrição + requisitos de todas as vagas guardadas (tabelas jobs e job_details),
+projeta o currículo no mesmo espaço e calcula o cosseno com todas as vagas num único
+produto matriz-vetor (np.bincount sobre as entradas não nulas).
+
+Termos: palavras sem acento/minúsculas (sem stopwords), título com peso dobrado e as
+frases-chave do KeywordMatcher ("fluxo de caixa", "contas a pagar") como termos próprios.
+
+Atualização incremental: refresh() só lê o que entrou depois da última leitura
+(jobs.id > último id, job_details.change_seq > último contador — contador atribuído
+por trigger na gravação, em ordem de commit; fetched_at é a hora da leitura no processo
+e não serve de marca d'água). Um detalhe com o mesmo content_hash já indexado é
+ignorado. O status "applied" das vagas muda depois da inserção: não é relido a cada
+refresh() — só para as vagas devolvidas (mark_applied) e, inteiro, quando a consulta
+pede exclude_applied (refresh_applied). Uma vaga reindexada
+tem a linha antiga desativada; quando as linhas mortas passam de COMPACT_RATIO, a
+matriz é reconstruída. Os pesos IDF e as normas das linhas ficam em cache até a
+próxima alteração do índice.
+"""
+import json
+import logging
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.analysis.keyword_matcher import fold, get_keyword_matcher
+
+logger = logging.getLogger("JobMatchIndex")
+
+TITLE_WEIGHT = 2
+PHRASE_WEIGHT = 2
+COMPACT_RATIO = 0.3
+JOB_VIEW_URL = "https://www.linkedin.com/jobs/view/{}/"
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#&]*")
+STOPWORDS = {
+    "a", "o", "as", "os", "e", "de", "da", "do", "das", "dos", "em", "no", "na", "nos", "nas",
+    "para", "por", "com", "um", "uma", "que", "se", "ao", "aos", "ou", "mais", "como", "sua", "seu",
+    "suas", "seus", "the", "of", "and", "for", "in", "to", "with", "on", "at", "an", "is", "are",
+    "vaga", "vagas", "empresa", "sobre", "voce", "nossa", "nosso", "ser", "sera", "sao", "ter",
+}
+
+
+def extract_terms(text: Optional[str], title: Optional[str] = None) -> Counter:
+    """Frequência dos termos de um documento (título conta TITLE_WEIGHT vezes)"""
+    counts = Counter()
+    for source, weight in ((text, 1), (title, TITLE_WEIGHT)):
+        if not source:
+            continue
+        for token in _TOKEN_RE.findall(fold(source)):
+            if len(token) > 2 and token not in STOPWORDS:
+                counts[token] += weight
+        # frases de várias palavras (um termo cada)
+        for phrase, entry in get_keyword_matcher().scan(source).items():
+            if " " in phrase:
+                counts[phrase] += entry["count"] * weight * PHRASE_WEIGHT
+    return counts
+
+
+def _requirements_text(value) -> str:
+    if not value:
+        return ""
+    try:
+        items = json.loads(value) if isinstance(value, str) else value
+    except ValueError:
+        return value
+    return "\n".join(items) if isinstance(items, list) else str(items)
+
+
+class JobMatchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.vocab: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.df: List[int] = []
+        # entradas da matriz (crescem por append; viram arrays NumPy na consulta)
+        self._rows = array("i")
+        self._cols = array("i")
+        self._tf = array("f")
+        self.docs: List[Dict] = []          # metadados por linha
+        self._span: List[tuple] = []        # (início, fim) das entradas de cada linha
+        self._alive: List[bool] = []
+        self.row_of: Dict[str, int] = {}    # job_id -> linha ativa
+        self.applied: set = set()           # job_ids com status applied (tabela jobs)
+        self._version = 0
+        self._cache = None
+        self._last_job_id = 0
+        self._last_detail_seq = 0
+
+    # -------------------------- escrita --------------------------
+
+    def add(self, job_id: str, title: Optional[str], text: Optional[str], **meta) -> Optional[int]:
+        """Indexa (ou reindexa) uma vaga. Retorna a linha, ou None se não há termos"""
+        counts = extract_terms(text, title)
+        if not counts:
+            return None
+        with self._lock:
+            self._remove_locked(job_id)
+            row = len(self.docs)
+            start = len(self._cols)
+            for term, tf in counts.items():
+                col = self.vocab.get(term)
+                if col is None:
+                    col = self.vocab[term] = len(self.terms)
+                    self.terms.append(term)
+                    self.df.append(0)
+                self.df[col] += 1
+                self._rows.append(row)
+                self._cols.append(col)
+                self._tf.append(1.0 + math.log(tf))
+            self.docs.append({"job_id": job_id, "title": title, **meta})
+            self._span.append((start, len(self._cols)))
+            self._alive.append(True)
+            self.row_of[job_id] = row
+            self._version += 1
+            return row
+
+    def _remove_locked(self, job_id: str):
+        row = self.row_of.pop(job_id, None)
+        if row is None:
+            return
+        start, end = self._span[row]
+        for col in self._cols[start:end]:
+            self.df[col] -= 1
+        self._alive[row] = False
+        dead = len(self._alive) - len(self.row_of)
+        if dead > COMPACT_RATIO * len(self._alive) and dead > 100:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        """Reconstrói as entradas só com as linhas ativas"""
+        rows, cols, tf = array("i"), array("i"), array("f")
+        docs, span, alive, row_of = [], [], [], {}
+        for old_row, doc in enumerate(self.docs):
+            if not self._alive[old_row]:
+                continue
+            start, end = self._span[old_row]
+            new_row = len(docs)
+            new_start = len(cols)
+            cols.extend(self._cols[start:end])
+            tf.extend(self._tf[start:end])
+            rows.extend([new_row] * (end - start))
+            docs.append(doc)
+            span.append((new_start, len(cols)))
+            alive.append(True)
+            row_of[doc["job_id"]] = new_row
+        self._rows, self._cols, self._tf = rows, cols, tf
+        self.docs, self._span, self._alive, self.row_of = docs, span, alive, row_of
+        self._version += 1
+
+    def refresh(self) -> int:
+        """Indexa as vagas novas/alteradas desde a última leitura (precisa de app context)"""
+        from src.models.job_detail import JobDetail
+        from src.models.jobs import Job
+
+        added = 0
+        with self._lock:
+            query = Job.query.filter(Job.id > self._last_job_id).order_by(Job.id)
+            for job in query.yield_per(500):
+                self._last_job_id = job.id
+                key = job.job_id or f"row:{job.id}"
+                body = "\n".join(filter(None, [job.company, job.description, _requirements_text(job.requirements)]))
+                if job.status == "applied":
+                    self.applied.add(key)
+                if self.add(key, job.title, body, company=job.company, url=job.url,
+                            platform=job.platform, source="job") is not None:
+                    added += 1
+            query = JobDetail.query.filter(JobDetail.change_seq > self._last_detail_seq) \
+                .order_by(JobDetail.change_seq)
+            for detail in query.yield_per(500):
+                self._last_detail_seq = detail.change_seq
+                previous = self.row_of.get(detail.job_id)
+                if previous is not None and self.docs[previous].get("content_hash") == detail.content_hash:
+                    continue
+                body = "\n".join(filter(None, [detail.company, detail.description,
+                                               _requirements_text(detail.requirements)]))
+                # o detalhe substitui a linha da vaga (mesmo job_id), mantendo a URL original
+                url = self.docs[previous].get("url") if previous is not None else None
+                if self.add(detail.job_id, detail.title, body, company=detail.company,
+                            url=url or JOB_VIEW_URL.format(detail.job_id), platform=detail.platform,
+                            source="job_detail", content_hash=detail.content_hash) is not None:
+                    added += 1
+        if added:
+            logger.info(f"🧮 Índice de vagas: +{added} (total {len(self.row_of)})")
+        return added
+
+    def refresh_applied(self, keys: Optional[Iterable[str]] = None) -> set:
+        """
+        Relê o status "applied" (precisa de app context): só das chaves dadas ou, sem
+        `keys`, de todas as vagas aplicadas (índice status). Retorna as aplicadas lidas.
+        """
+        from src.models.jobs import Job, db
+
+        query = Job.query.with_entities(Job.id, Job.job_id).filter(Job.status == "applied")
+        if keys is not None:
+            keys = set(keys)
+            row_ids = [int(key[4:]) for key in keys if key.startswith("row:") and key[4:].isdigit()]
+            job_ids = [key for key in keys if not key.startswith("row:")]
+            if not row_ids and not job_ids:
+                return set()
+            query = query.filter(db.or_(Job.job_id.in_(job_ids), Job.id.in_(row_ids)))
+        found = {job_id or f"row:{row_id}" for row_id, job_id in query}
+        if keys is not None:
+            found &= keys
+        with self._lock:
+            if keys is None:
+                self.applied = found
+            else:
+                self.applied = (self.applied - keys) | found
+        return found
+
+    def mark_applied(self, results: List[Dict]) -> List[Dict]:
+        """Atualiza o campo 'applied' dos resultados com o status atual no banco"""
+        applied = self.refresh_applied([r['job_id'] for r in results])
+        for result in results:
+            result['applied'] = result['job_id'] in applied
+        return results
+
+    # -------------------------- consulta --------------------------
+
+    def _matrix(self):
+        """(linhas, colunas, pesos tf-idf, normas das linhas, idf, ativas) — recalculado só quando o índice muda"""
+        if self._cache is not None and self._cache[0] == self._version:
+            return self._cache[1]
+        rows = np.frombuffer(self._rows, dtype=np.int32).copy()
+        cols = np.frombuffer(self._cols, dtype=np.int32).copy()
+        tf = np.frombuffer(self._tf, dtype=np.float32).astype(np.float64)
+        n_docs = max(1, len(self.row_of))
+        df = np.asarray(self.df, dtype=np.float64)
+        idf = np.log((n_docs + 1.0) / (df + 1.0)) + 1.0
+        weights = tf * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(self.docs)))
+        alive = np.asarray(self._alive, dtype=bool)
+        matrix = (rows, cols, weights, norms, idf, alive)
+        self._cache = (self._version, matrix)
+        return matrix
+
+    def match(self, text: str, limit: int = 20, min_score: float = 0.0,
+              job_ids: Optional[Iterable[str]] = None, exclude_applied: bool = False) -> List[Dict]:
+        """Vagas mais parecidas com o texto (cosseno TF-IDF), da maior para a menor pontuação"""
+        query_terms = extract_terms(text)
+        with self._lock:
+            if not self.row_of or not query_terms:
+                return []
+            rows, cols, weights, norms, idf, alive = self._matrix()
+            q = np.zeros(len(self.terms), dtype=np.float64)
+            for term, tf in query_terms.items():
+                col = self.vocab.get(term)
+                if col is not None:
+                    q[col] = (1.0 + math.log(tf)) * idf[col]
+            q_norm = float(np.linalg.norm(q))
+            if q_norm == 0.0:
+                return []
+            # produto matriz-vetor: soma de peso * q[coluna] por linha
+            dots = np.bincount(rows, weights=weights * q[cols], minlength=len(self.docs))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.where(norms > 0, dots / (norms * q_norm), 0.0)
+            mask = alive.copy()
+            if job_ids is not None:
+                allowed = np.zeros(len(self.docs), dtype=bool)
+                allowed[[self.row_of[j] for j in job_ids if j in self.row_of]] = True
+                mask &= allowed
+            if exclude_applied and self.applied:
+                mask[[self.row_of[j] for j in self.applied if j in self.row_of]] = False
+            scores = np.where(mask & (scores >= min_score) & (scores > 0), scores, -1.0)
+            k = min(limit, int((scores >= 0).sum()))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [self._result(int(row), float(scores[row]), q) for row in top]
+
+    def _result(self, row: int, score: float, q) -> Dict:
+        doc = self.docs[row]
+        start, end = self._span[row]
+        shared = [col for col in self._cols[start:end] if q[col] > 0]
+        shared.sort(key=lambda col: -q[col])
+        return {
+            'job_id': doc['job_id'],
+            'title': doc.get('title'),
+            'company': doc.get('company'),
+            'url': doc.get('url'),
+            'platform': doc.get('platform'),
+            'source': doc.get('source'),
+            'score': round(score, 4),
+            'applied': doc['job_id'] in self.applied,
+            'matched_terms': [self.terms[col] for col in shared[:10]]
+        }
+
+    def info(self) -> Dict:
+        with self._lock:
+            return {'jobs': len(self.row_of), 'terms': len(self.terms), 'entries': len(self._cols),
+                    'dead_rows': len(self._alive) - len(self.row_of)}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_job_match_index() -> JobMatchIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JobMatchIndex()
+        return _index
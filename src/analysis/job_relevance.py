@@ -0,0 +1,130 @@
+"""
+Relevância das vagas antes do clique.
+
+Abrir um card (e o painel de detalhes) é o passo mais caro da automação. O
+JobRelevanceScorer pontua cada vaga só com o que a lista já traz — título, empresa,
+local, Easy Apply e a descrição do cache de detalhes (job_details) — contra os tipos de
+vaga selecionados e o perfil do currículo (saída do ResumeAnalyzer: job_scores e skills).
+A automação abre só as vagas acima do limiar, da melhor para a pior, até o top-K.
+
+Pontuação (0 a 1):
+    título      0.50  frase do tipo de vaga (ou sinônimo) no título; senão fração dos termos
+    palavras    0.20  palavras-chave do tipo de vaga no título/descrição
+    habilidades 0.15  habilidades do currículo citadas na descrição/requisitos
+    easy apply  0.10
+    local       0.05  cidade da busca (ou remoto) no local da vaga
+As parcelas de título e palavras-chave são ponderadas pela aderência do currículo ao tipo
+de vaga (job_scores), quando há perfil. Candidatura externa conhecida vale 0.
+"""
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.analysis.keyword_matcher import fold, get_keyword_matcher
+from src.analysis.keywords import TITLE_SYNONYMS, job_type_key
+
+DEFAULT_THRESHOLD = 0.25
+WEIGHTS = {'title': 0.50, 'keywords': 0.20, 'skills': 0.15, 'easy_apply': 0.10, 'location': 0.05}
+KEYWORD_SATURATION = 6  # palavras-chave encontradas para a parcela valer 1
+SKILL_SATURATION = 3
+_STOPWORDS = {'a', 'o', 'de', 'da', 'do', 'e', 'em', 'para', 'of', 'and'}
+
+
+def _phrase_pattern(phrases: List[str]) -> Optional[re.Pattern]:
+    """Uma regex com todas as frases (limite de palavra), já sem acentos"""
+    phrases = sorted({fold(p).strip() for p in phrases if p and p.strip()}, key=len, reverse=True)
+    if not phrases:
+        return None
+    return re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(p) for p in phrases) + r')(?!\w)')
+
+
+class _Target:
+    """Um tipo de vaga selecionado, com os padrões pré-compilados"""
+
+    def __init__(self, label: str, fit: float):
+        self.label = label
+        self.key = job_type_key(label)
+        self.fit = fit
+        self.title = _phrase_pattern([label] + TITLE_SYNONYMS.get(self.key, []))
+        # radicais curtos dos termos do rótulo: "financeiro" também casa "financeira"
+        self.stems = [fold(t)[:6] for t in label.split() if fold(t) not in _STOPWORDS and len(t) > 2]
+        self.group = f'job:{self.key}'
+
+    def title_score(self, title: str) -> float:
+        if self.title is not None and self.title.search(title):
+            return 1.0
+        if not self.stems:
+            return 0.0
+        words = title.split()
+        found = sum(1 for stem in self.stems if any(w.startswith(stem) for w in words))
+        return 0.5 * found / len(self.stems)
+
+    def keyword_score(self, matcher, hits: Dict) -> float:
+        return min(1.0, len(matcher.found(hits, self.group)) / KEYWORD_SATURATION)
+
+
+class JobRelevanceScorer:
+    def __init__(self, job_types: List[str], profile: Optional[Dict] = None,
+                 threshold: Optional[float] = None, location: Optional[str] = None):
+        if threshold is None:
+            threshold = float(os.environ.get('JOBHUNTER_RELEVANCE_THRESHOLD', DEFAULT_THRESHOLD))
+        self.threshold = threshold
+        profile = profile or {}
+        job_scores = profile.get('job_scores') or {}
+        self.targets = []
+        for label in job_types or []:
+            key = job_type_key(label)
+            # aderência do currículo ao tipo (0-100): pesa de 0.5 a 1.0; sem perfil, 1.0
+            fit = 0.5 + 0.5 * min(100.0, float(job_scores[key])) / 100 if key in job_scores else 1.0
+            self.targets.append(_Target(label, fit))
+        # palavras-chave do tipo de vaga e habilidades do currículo: uma passada do autômato por vaga
+        self.matcher = get_keyword_matcher()
+        self.skills = {' '.join(fold(s).split()) for s in profile.get('skills') or [] if s}
+        city = fold((location or '').split(',')[0]).strip()
+        self.location = _phrase_pattern([city, 'remoto', 'remote']) if city else None
+
+    def details(self, job: Dict) -> Dict[str, float]:
+        """Parcelas da pontuação de uma vaga (antes dos pesos)"""
+        if job.get('apply_method') == 'external':
+            return {'external': 1.0}
+        title = fold(job.get('title'))
+        requirements = job.get('requirements') or []
+        body = '\n'.join([job.get('title') or '', job.get('company') or '', job.get('description') or '',
+                          '\n'.join(requirements) if isinstance(requirements, list) else requirements])
+        hits = self.matcher.scan(body)
+        best, best_target = 0.0, None
+        parts = {'title': 0.0, 'keywords': 0.0}
+        for target in self.targets:
+            title_score = target.title_score(title)
+            keyword_score = target.keyword_score(self.matcher, hits)
+            combined = (WEIGHTS['title'] * title_score + WEIGHTS['keywords'] * keyword_score) * target.fit
+            if combined > best or best_target is None:
+                best, best_target = combined, target
+                parts = {'title': title_score, 'keywords': keyword_score, 'fit': target.fit}
+        skill_hits = len(self.skills & hits.keys())
+        parts['skills'] = min(1.0, skill_hits / SKILL_SATURATION)
+        parts['easy_apply'] = 1.0 if job.get('easy_apply') or job.get('apply_method') == 'easy_apply' else 0.0
+        parts['location'] = 1.0 if self.location is not None and self.location.search(fold(job.get('location'))) else 0.0
+        parts['matched_type'] = best_target.label if best_target else None
+        return parts
+
+    def score(self, job: Dict) -> float:
+        parts = self.details(job)
+        if parts.get('external'):
+            return 0.0
+        total = (WEIGHTS['title'] * parts['title'] + WEIGHTS['keywords'] * parts['keywords']) * parts.get('fit', 1.0)
+        total += WEIGHTS['skills'] * parts['skills'] + WEIGHTS['easy_apply'] * parts['easy_apply'] \
+            + WEIGHTS['location'] * parts['location']
+        return round(min(1.0, total), 3)
+
+    def rank(self, jobs: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        (selecionadas, descartadas): grava job['relevance'] em todas, devolve as que passam
+        do limiar da maior para a menor pontuação (empate mantém a ordem da lista).
+        """
+        for job in jobs:
+            job['relevance'] = self.score(job)
+        selected = sorted((j for j in jobs if j['relevance'] >= self.threshold),
+                          key=lambda j: j['relevance'], reverse=True)
+        skipped = [j for j in jobs if j['relevance'] < self.threshold]
+        return selected, skipped
@@ -0,0 +1,165 @@
+"""
+Busca de várias frases-chave de uma vez (autômato de Aho-Corasick).
+
+Comparar radicais soltos separa frases como "fluxo de caixa", "contas a pagar" ou
+"activity based costing" em palavras independentes, e cada lista de padrões de formação
+era varrida com um `in` por padrão. Aqui todas as frases (palavras-chave por tipo de vaga,
+habilidades e padrões de formação) viram um único autômato, montado uma vez por processo,
+que encontra todas as ocorrências numa só passada pelo texto.
+
+Texto e frases são normalizados caractere a caractere (minúsculas, sem acento: um
+caractere de saída para cada caractere de entrada), então as posições devolvidas valem
+para o texto original. Espaços repetidos/quebras de linha contam como um espaço e as
+frases só casam inteiras (limite de palavra nas duas pontas: "r" não casa dentro de "rotina").
+"""
+import threading
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from src.analysis.keywords import EDUCATION_PATTERNS, JOB_KEYWORDS, REQUIRED_SKILLS
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(c: str) -> str:
+    base = unicodedata.normalize('NFKD', c)[:1] or c
+    lowered = base.lower()
+    return lowered[:1] or base
+
+
+def fold(text: Optional[str]) -> str:
+    """Minúsculas e sem acentos, mesmo comprimento do texto ("Precificação" -> "precificacao")"""
+    return ''.join(_fold_char(c) for c in text or '')
+
+
+def _normalize_phrase(phrase: str) -> str:
+    return ' '.join(fold(phrase).split())
+
+
+class Match(NamedTuple):
+    phrase: str   # frase normalizada
+    start: int    # posição no texto original
+    end: int
+
+
+class KeywordMatcher:
+    """Autômato sobre frases agrupadas (uma frase pode estar em vários grupos)."""
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups: Dict[str, Set[str]] = {}
+        self.phrase_groups: Dict[str, Set[str]] = {}
+        for group, phrases in groups.items():
+            normalized = {_normalize_phrase(p) for p in phrases if p and p.strip()}
+            self.groups[group] = normalized
+            for phrase in normalized:
+                self.phrase_groups.setdefault(phrase, set()).add(group)
+        self.phrases: List[str] = sorted(self.phrase_groups)
+        self._build()
+
+    def _build(self):
+        # trie: transições por estado, saída = ids das frases que terminam no estado
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[List[int]] = [[]]
+        for pid, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(pid)
+        # links de falha em largura; a saída de um estado herda a do seu link de falha
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._lengths = [len(p) for p in self.phrases]
+
+    def find(self, text: Optional[str]) -> List[Match]:
+        """Todas as ocorrências (com limite de palavra), na ordem do texto"""
+        if not text:
+            return []
+        matches = []
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        positions: List[int] = []  # posição original de cada caractere alimentado no autômato
+        state = 0
+        previous_space = True
+        n = len(text)
+        for i, raw in enumerate(text):
+            ch = _fold_char(raw)
+            if ch.isspace():
+                if previous_space:
+                    continue
+                ch = ' '
+                previous_space = True
+            else:
+                previous_space = False
+            positions.append(i)
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            # limite de palavra à direita: próximo caractere não pode ser letra/dígito
+            if i + 1 < n and text[i + 1].isalnum():
+                continue
+            for pid in out[state]:
+                start = positions[-lengths[pid]]
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                matches.append(Match(self.phrases[pid], start, i + 1))
+        matches.sort(key=lambda m: (m.start, m.end))
+        return matches
+
+    def scan(self, text: Optional[str]) -> Dict[str, Dict]:
+        """{frase: {'count': n, 'positions': [(início, fim), ...]}} numa passada"""
+        hits: Dict[str, Dict] = {}
+        for match in self.find(text):
+            entry = hits.setdefault(match.phrase, {'count': 0, 'positions': []})
+            entry['count'] += 1
+            entry['positions'].append((match.start, match.end))
+        return hits
+
+    def found(self, hits: Dict[str, Dict], group: str) -> Set[str]:
+        """Frases do grupo presentes no resultado de scan()"""
+        return self.groups.get(group, set()) & hits.keys()
+
+    def group_counts(self, hits: Dict[str, Dict]) -> Dict[str, int]:
+        """Ocorrências por grupo"""
+        counts: Dict[str, int] = {}
+        for phrase, entry in hits.items():
+            for group in self.phrase_groups.get(phrase, ()):
+                counts[group] = counts.get(group, 0) + entry['count']
+        return counts
+
+
+def default_groups() -> Dict[str, List[str]]:
+    """job:<tipo>, skill:<categoria> e education:<critério> a partir de src/analysis/keywords.py"""
+    groups = {f'job:{key}': phrases for key, phrases in JOB_KEYWORDS.items()}
+    groups.update({f'skill:{key}': phrases for key, phrases in REQUIRED_SKILLS.items()})
+    groups.update({f'education:{key}': phrases for key, phrases in EDUCATION_PATTERNS.items()})
+    return groups
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Autômato do processo sobre todas as palavras-chave, habilidades e padrões de formação"""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = KeywordMatcher(default_groups())
+        return _matcher
@@ -0,0 +1,118 @@
+"""
+Palavras-chave por tipo de vaga e habilidades usadas na análise de currículo e na
+relevância das vagas (sem dependências: a automação importa daqui sem carregar o NLTK).
+"""
+import hashlib
+import json
+
+JOB_KEYWORDS = {
+    'analista_financeiro': [
+        'financeiro', 'financial', 'análise', 'analysis', 'demonstrações', 'statements',
+        'balanço', 'balance', 'dre', 'fluxo de caixa', 'cash flow', 'orçamento', 'budget',
+        'planejamento', 'planning', 'controladoria', 'controlling', 'excel', 'powerbi',
+        'tableau', 'sql', 'python', 'r', 'sap', 'oracle', 'contabilidade', 'accounting',
+        'auditoria', 'audit', 'compliance', 'risco', 'risk', 'investimento', 'investment'
+    ],
+    'contas_pagar': [
+        'contas a pagar', 'accounts payable', 'fornecedores', 'suppliers', 'pagamentos',
+        'payments', 'conciliação', 'reconciliation', 'fluxo de caixa', 'cash flow',
+        'vencimentos', 'due dates', 'negociação', 'negotiation', 'desconto', 'discount',
+        'juros', 'interest', 'multa', 'penalty', 'sap', 'oracle', 'totvs', 'protheus',
+        'excel', 'planilhas', 'spreadsheets', 'processo', 'process', 'rotina', 'routine'
+    ],
+    'contas_receber': [
+        'contas a receber', 'accounts receivable', 'clientes', 'customers', 'cobrança',
+        'collection', 'inadimplência', 'default', 'crédito', 'credit', 'análise de crédito',
+        'credit analysis', 'limite', 'limit', 'faturamento', 'billing', 'nota fiscal',
+        'invoice', 'recebimentos', 'receipts', 'conciliação', 'reconciliation', 'spc',
+        'serasa', 'protesto', 'protest', 'negociação', 'negotiation', 'acordo', 'agreement'
+    ],
+    'analista_precificacao': [
+        'precificação', 'pricing', 'preço', 'price', 'margem', 'margin', 'custo', 'cost',
+        'markup', 'competitividade', 'competitiveness', 'mercado', 'market', 'pesquisa',
+        'research', 'análise', 'analysis', 'estratégia', 'strategy', 'produto', 'product',
+        'serviço', 'service', 'valor', 'value', 'elasticidade', 'elasticity', 'demanda',
+        'demand', 'oferta', 'supply', 'concorrência', 'competition', 'benchmark'
+    ],
+    'custos': [
+        'custos', 'costs', 'custeio', 'costing', 'abc', 'activity based costing',
+        'centro de custo', 'cost center', 'rateio', 'allocation', 'apropriação',
+        'appropriation', 'variação', 'variance', 'padrão', 'standard', 'orçamento',
+        'budget', 'controle', 'control', 'redução', 'reduction', 'otimização',
+        'optimization', 'eficiência', 'efficiency', 'produtividade', 'productivity',
+        'margem', 'margin', 'rentabilidade', 'profitability', 'break even'
+    ]
+}
+
+REQUIRED_SKILLS = {
+    'technical': [
+        'excel', 'powerbi', 'tableau', 'sql', 'python', 'r', 'sap', 'oracle', 'totvs',
+        'protheus', 'microsiga', 'senior', 'datasul', 'rm', 'logix', 'access', 'vba'
+    ],
+    'soft_skills': [
+        'comunicação', 'communication', 'liderança', 'leadership', 'trabalho em equipe',
+        'teamwork', 'organização', 'organization', 'proatividade', 'proactive',
+        'analítico', 'analytical', 'detalhista', 'detail oriented', 'responsabilidade',
+        'responsibility', 'pontualidade', 'punctuality', 'flexibilidade', 'flexibility'
+    ],
+    'education': [
+        'administração', 'administration', 'economia', 'economics', 'contabilidade',
+        'accounting', 'engenharia', 'engineering', 'matemática', 'mathematics',
+        'estatística', 'statistics', 'mba', 'pós-graduação', 'graduate', 'mestrado',
+        'master', 'doutorado', 'phd', 'crc', 'cfa', 'frm'
+    ]
+}
+
+# formação (ResumeAnalyzer.analyze_education): critério -> padrões
+EDUCATION_PATTERNS = {
+    'superior_completo': [
+        'graduação', 'graduado', 'bacharel', 'licenciatura', 'superior completo',
+        'formado em', 'degree', 'bachelor', 'graduated'
+    ],
+    'pos_graduacao': [
+        'pós-graduação', 'pós graduação', 'especialização', 'postgraduate',
+        'especialista em', 'graduate certificate'
+    ],
+    'mba': ['mba', 'master of business administration', 'mestrado profissional'],
+    'area_relevante': [
+        'administração', 'economia', 'contabilidade', 'ciências contábeis',
+        'engenharia', 'matemática', 'estatística', 'finanças', 'business',
+        'accounting', 'economics', 'finance', 'engineering', 'mathematics'
+    ]
+}
+
+# rótulo de busca (JOB_TYPE_CRITERIA do runner) -> chave de JOB_KEYWORDS
+JOB_TYPE_KEYS = {
+    'analista financeiro': 'analista_financeiro',
+    'contas a pagar': 'contas_pagar',
+    'contas a receber': 'contas_receber',
+    'analista de precificacao': 'analista_precificacao',
+    'analista de precificação': 'analista_precificacao',
+    'custos': 'custos',
+}
+
+# variações de título que contam como o tipo de vaga (as do is_relevant_job dos drivers)
+TITLE_SYNONYMS = {
+    'analista_financeiro': ['analista financeiro', 'financial analyst', 'financeiro', 'finanças', 'fp&a'],
+    'contas_pagar': ['contas a pagar', 'accounts payable'],
+    'contas_receber': ['contas a receber', 'accounts receivable', 'cobrança'],
+    'analista_precificacao': ['precificação', 'pricing', 'preço'],
+    'custos': ['custos', 'custo', 'cost', 'costing'],
+}
+
+
+def job_type_key(label: str) -> str:
+    """'Contas a Pagar' -> 'contas_pagar' (rótulos desconhecidos viram a própria chave)"""
+    label = (label or '').strip().lower()
+    return JOB_TYPE_KEYS.get(label, label.replace(' ', '_'))
+
+
+# sobe quando a forma de pontuar muda (invalida o cache de análises junto com as listas acima)
+ANALYSIS_VERSION = 1
+
+
+def keyword_set_version(job_keywords=None, required_skills=None, education_patterns=None) -> str:
+    """Hash das listas de palavras-chave em uso: muda sozinho quando alguma lista muda"""
+    raw = json.dumps([ANALYSIS_VERSION, job_keywords or JOB_KEYWORDS, required_skills or REQUIRED_SKILLS,
+                      education_patterns or EDUCATION_PATTERNS], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
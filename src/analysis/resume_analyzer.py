@@ -1,75 +1,49 @@
+import io
 import re
 import os
 import logging
-from typing import Dict, List, Tuple
+import threading
+from functools import lru_cache
+from typing import BinaryIO, Dict, FrozenSet, Iterator, List, Optional, Set, TextIO, Tuple, Union
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import PorterStemmer
 import PyPDF2
-from collections import Counter
+
+from src.analysis.keyword_matcher import fold, get_keyword_matcher
+from src.analysis.keywords import JOB_KEYWORDS, REQUIRED_SKILLS, keyword_set_version
+from src.models.analysis_cache import analysis_key, get_analysis_cache
 
 class ResumeAnalyzer:
+    # compilados uma vez por processo (antes: re.findall com a string a cada análise)
+    EXPERIENCE_PATTERNS = [
+        re.compile(r'(\d+)\s*anos?\s*de\s*experiência'),
+        re.compile(r'(\d+)\s*years?\s*of\s*experience'),
+        re.compile(r'experiência\s*de\s*(\d+)\s*anos?'),
+        re.compile(r'(\d+)\s*anos?\s*atuando'),
+        re.compile(r'(\d+)\s*anos?\s*trabalhando')
+    ]
+    CLEAN_RE = re.compile(r'[^a-záàâãéèêíïóôõöúçñ\s]')
+    
     def __init__(self):
         self.setup_nltk()
         self.setup_logging()
-        self.job_keywords = {
-            'analista_financeiro': [
-                'financeiro', 'financial', 'análise', 'analysis', 'demonstrações', 'statements',
-                'balanço', 'balance', 'dre', 'fluxo de caixa', 'cash flow', 'orçamento', 'budget',
-                'planejamento', 'planning', 'controladoria', 'controlling', 'excel', 'powerbi',
-                'tableau', 'sql', 'python', 'r', 'sap', 'oracle', 'contabilidade', 'accounting',
-                'auditoria', 'audit', 'compliance', 'risco', 'risk', 'investimento', 'investment'
-            ],
-            'contas_pagar': [
-                'contas a pagar', 'accounts payable', 'fornecedores', 'suppliers', 'pagamentos',
-                'payments', 'conciliação', 'reconciliation', 'fluxo de caixa', 'cash flow',
-                'vencimentos', 'due dates', 'negociação', 'negotiation', 'desconto', 'discount',
-                'juros', 'interest', 'multa', 'penalty', 'sap', 'oracle', 'totvs', 'protheus',
-                'excel', 'planilhas', 'spreadsheets', 'processo', 'process', 'rotina', 'routine'
-            ],
-            'contas_receber': [
-                'contas a receber', 'accounts receivable', 'clientes', 'customers', 'cobrança',
-                'collection', 'inadimplência', 'default', 'crédito', 'credit', 'análise de crédito',
-                'credit analysis', 'limite', 'limit', 'faturamento', 'billing', 'nota fiscal',
-                'invoice', 'recebimentos', 'receipts', 'conciliação', 'reconciliation', 'spc',
-                'serasa', 'protesto', 'protest', 'negociação', 'negotiation', 'acordo', 'agreement'
-            ],
-            'analista_precificacao': [
-                'precificação', 'pricing', 'preço', 'price', 'margem', 'margin', 'custo', 'cost',
-                'markup', 'competitividade', 'competitiveness', 'mercado', 'market', 'pesquisa',
-                'research', 'análise', 'analysis', 'estratégia', 'strategy', 'produto', 'product',
-                'serviço', 'service', 'valor', 'value', 'elasticidade', 'elasticity', 'demanda',
-                'demand', 'oferta', 'supply', 'concorrência', 'competition', 'benchmark'
-            ],
-            'custos': [
-                'custos', 'costs', 'custeio', 'costing', 'abc', 'activity based costing',
-                'centro de custo', 'cost center', 'rateio', 'allocation', 'apropriação',
-                'appropriation', 'variação', 'variance', 'padrão', 'standard', 'orçamento',
-                'budget', 'controle', 'control', 'redução', 'reduction', 'otimização',
-                'optimization', 'eficiência', 'efficiency', 'produtividade', 'productivity',
-                'margem', 'margin', 'rentabilidade', 'profitability', 'break even'
-            ]
-        }
+        self.job_keywords = JOB_KEYWORDS
+        self.required_skills = REQUIRED_SKILLS
         
-        self.required_skills = {
-            'technical': [
-                'excel', 'powerbi', 'tableau', 'sql', 'python', 'r', 'sap', 'oracle', 'totvs',
-                'protheus', 'microsiga', 'senior', 'datasul', 'rm', 'logix', 'access', 'vba'
-            ],
-            'soft_skills': [
-                'comunicação', 'communication', 'liderança', 'leadership', 'trabalho em equipe',
-                'teamwork', 'organização', 'organization', 'proatividade', 'proactive',
-                'analítico', 'analytical', 'detalhista', 'detail oriented', 'responsabilidade',
-                'responsibility', 'pontualidade', 'punctuality', 'flexibilidade', 'flexibility'
-            ],
-            'education': [
-                'administração', 'administration', 'economia', 'economics', 'contabilidade',
-                'accounting', 'engenharia', 'engineering', 'matemática', 'mathematics',
-                'estatística', 'statistics', 'mba', 'pós-graduação', 'graduate', 'mestrado',
-                'master', 'doutorado', 'phd', 'crc', 'cfa', 'frm'
-            ]
-        }
+        # stopwords, stemmer e radicais das palavras-chave montados aqui, não a cada chamada:
+        # a requisição só tokeniza o currículo (use get_resume_analyzer() para reaproveitar)
+        self.stop_words = frozenset(stopwords.words('portuguese'))
+        self.stemmer = PorterStemmer()
+        self._stem = lru_cache(maxsize=50_000)(self.stemmer.stem)
+        # frases (multi-palavra), habilidades e formação: um autômato só (Aho-Corasick)
+        self.matcher = get_keyword_matcher()
+        # análises já feitas, por SHA-256 do texto + versão das palavras-chave
+        self.cache = get_analysis_cache()
+        self._keyword_units: Dict[Tuple[str, ...], Tuple[FrozenSet[str], Tuple[Tuple[str, FrozenSet[str]], ...]]] = {}
+        for keywords in list(self.job_keywords.values()) + list(self.required_skills.values()):
+            self.keyword_units(keywords)
         
     def setup_nltk(self):
         """Configura o NLTK baixando os recursos necessários"""
@@ -88,15 +62,25 @@ class ResumeAnalyzer:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(self.__class__.__name__)
         
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extrai texto de um arquivo PDF"""
+    def iter_pdf_pages(self, pdf_source: Union[str, bytes, BinaryIO]) -> Iterator[str]:
+        """Texto de cada página, uma por vez (caminho, bytes ou arquivo binário, ex.: BytesIO)"""
+        if isinstance(pdf_source, str):
+            with open(pdf_source, 'rb') as file:
+                yield from self.iter_pdf_pages(file)
+            return
+        if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+            pdf_source = io.BytesIO(pdf_source)
+        elif not pdf_source.seekable():
+            # PdfReader precisa de seek (tabela xref no fim do arquivo)
+            pdf_source = io.BytesIO(pdf_source.read())
+        for page in PyPDF2.PdfReader(pdf_source).pages:
+            yield page.extract_text() or ""
+            
+    def extract_text_from_pdf(self, pdf_source: Union[str, bytes, BinaryIO]) -> str:
+        """Extrai texto de um PDF (caminho, bytes ou arquivo binário já aberto)"""
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-                return text
+            # join no fim em vez de += por página (cópia quadrática em PDFs longos)
+            return "\n".join(self.iter_pdf_pages(pdf_source))
         except Exception as e:
             self.logger.error(f"Erro ao extrair texto do PDF: {str(e)}")
             return ""
@@ -108,18 +92,16 @@ class ResumeAnalyzer:
             text = text.lower()
             
             # Remove caracteres especiais e números
-            text = re.sub(r'[^a-záàâãéèêíïóôõöúçñ\s]', '', text)
+            text = self.CLEAN_RE.sub('', text)
             
             # Tokeniza
             tokens = word_tokenize(text, language='portuguese')
             
             # Remove stopwords
-            stop_words = set(stopwords.words('portuguese'))
-            tokens = [token for token in tokens if token not in stop_words and len(token) > 2]
+            tokens = [token for token in tokens if token not in self.stop_words and len(token) > 2]
             
-            # Aplica stemming
-            stemmer = PorterStemmer()
-            tokens = [stemmer.stem(token) for token in tokens]
+            # Aplica stemming (radicais em cache: o vocabulário de currículos se repete muito)
+            tokens = [self._stem(token) for token in tokens]
             
             return tokens
             
@@ -127,40 +109,50 @@ class ResumeAnalyzer:
             self.logger.error(f"Erro no pré-processamento: {str(e)}")
             return []
             
-    def calculate_keyword_score(self, resume_tokens: List[str], keywords: List[str]) -> float:
-        """Calcula a pontuação baseada na presença de palavras-chave"""
+    def keyword_units(self, keywords: List[str]):
+        """
+        (radicais das palavras-chave de uma palavra, frases de várias palavras normalizadas
+        -> seus radicais), calculados uma vez por lista
+        """
+        key = tuple(keywords)
+        units = self._keyword_units.get(key)
+        if units is None:
+            stems, phrases = set(), {}
+            for keyword in keywords:
+                if len(keyword.split()) > 1:
+                    phrases[' '.join(fold(keyword).split())] = frozenset(self.preprocess_text(keyword))
+                else:
+                    stems.update(self.preprocess_text(keyword))
+            units = self._keyword_units[key] = (frozenset(stems), tuple(phrases.items()))
+        return units
+        
+    def calculate_keyword_score(self, resume_tokens, keywords: List[str], phrases_found: Optional[Set[str]] = None) -> float:
+        """
+        Calcula a pontuação baseada na presença de palavras-chave. Palavras soltas comparam
+        radicais; frases ("fluxo de caixa") contam inteiras, pelas ocorrências do autômato
+        (`phrases_found`, chaves de matcher.scan) ou, sem elas, com todos os radicais presentes.
+        """
         if not resume_tokens or not keywords:
             return 0.0
             
-        # Pré-processa as palavras-chave
-        processed_keywords = []
-        for keyword in keywords:
-            processed_keywords.extend(self.preprocess_text(keyword))
-            
-        # Conta as ocorrências
-        resume_counter = Counter(resume_tokens)
-        keyword_matches = 0
-        total_keywords = len(set(processed_keywords))
-        
-        for keyword in set(processed_keywords):
-            if keyword in resume_counter:
+        stems, phrases = self.keyword_units(keywords)
+        resume_set = resume_tokens if isinstance(resume_tokens, (set, frozenset)) else set(resume_tokens)
+        keyword_matches = len(stems & resume_set)
+        for phrase, phrase_stems in phrases:
+            if phrases_found is not None:
+                keyword_matches += phrase in phrases_found
+            elif phrase_stems and phrase_stems <= resume_set:
                 keyword_matches += 1
+        total_keywords = len(stems) + len(phrases)
                 
         return (keyword_matches / total_keywords) * 100 if total_keywords > 0 else 0.0
         
     def analyze_experience_level(self, text: str) -> Tuple[int, str]:
         """Analisa o nível de experiência baseado no texto"""
-        experience_patterns = [
-            (r'(\d+)\s*anos?\s*de\s*experiência', 'anos de experiência'),
-            (r'(\d+)\s*years?\s*of\s*experience', 'years of experience'),
-            (r'experiência\s*de\s*(\d+)\s*anos?', 'experiência de anos'),
-            (r'(\d+)\s*anos?\s*atuando', 'anos atuando'),
-            (r'(\d+)\s*anos?\s*trabalhando', 'anos trabalhando')
-        ]
-        
+        text_lower = text.lower()
         years = []
-        for pattern, description in experience_patterns:
-            matches = re.findall(pattern, text.lower())
+        for pattern in self.EXPERIENCE_PATTERNS:
+            matches = pattern.findall(text_lower)
             for match in matches:
                 try:
                     years.append(int(match))
@@ -178,60 +170,21 @@ class ResumeAnalyzer:
         else:
             return 0, "Não identificado"
             
-    def analyze_education(self, text: str) -> Dict[str, bool]:
-        """Analisa a formação educacional"""
-        education_analysis = {
-            'superior_completo': False,
-            'pos_graduacao': False,
-            'mba': False,
-            'area_relevante': False
+    def analyze_education(self, text: str, hits: Optional[Dict] = None) -> Dict[str, bool]:
+        """Analisa a formação educacional (`hits`: resultado de matcher.scan do mesmo texto)"""
+        if hits is None:
+            hits = self.matcher.scan(text)
+        return {
+            criterion: bool(self.matcher.found(hits, f'education:{criterion}'))
+            for criterion in ('superior_completo', 'pos_graduacao', 'mba', 'area_relevante')
         }
         
-        text_lower = text.lower()
-        
-        # Verifica ensino superior
-        superior_patterns = [
-            'graduação', 'graduado', 'bacharel', 'licenciatura', 'superior completo',
-            'formado em', 'degree', 'bachelor', 'graduated'
-        ]
-        
-        for pattern in superior_patterns:
-            if pattern in text_lower:
-                education_analysis['superior_completo'] = True
-                break
-                
-        # Verifica pós-graduação
-        pos_patterns = [
-            'pós-graduação', 'pós graduação', 'especialização', 'postgraduate',
-            'especialista em', 'graduate certificate'
-        ]
-        
-        for pattern in pos_patterns:
-            if pattern in text_lower:
-                education_analysis['pos_graduacao'] = True
-                break
-                
-        # Verifica MBA
-        mba_patterns = ['mba', 'master of business administration', 'mestrado profissional']
-        
-        for pattern in mba_patterns:
-            if pattern in text_lower:
-                education_analysis['mba'] = True
-                break
-                
-        # Verifica área relevante
-        relevant_areas = [
-            'administração', 'economia', 'contabilidade', 'ciências contábeis',
-            'engenharia', 'matemática', 'estatística', 'finanças', 'business',
-            'accounting', 'economics', 'finance', 'engineering', 'mathematics'
-        ]
-        
-        for area in relevant_areas:
-            if area in text_lower:
-                education_analysis['area_relevante'] = True
-                break
-                
-        return education_analysis
+    def find_skills(self, text: str, hits: Optional[Dict] = None) -> List[str]:
+        """Habilidades técnicas citadas no texto (perfil usado na relevância das vagas)"""
+        if hits is None:
+            hits = self.matcher.scan(text)
+        found = self.matcher.found(hits, 'skill:technical')
+        return [skill for skill in self.required_skills['technical'] if fold(skill) in found]
         
     def generate_recommendations(self, analysis_results: Dict) -> List[str]:
         """Gera recomendações de melhoria baseadas na análise"""
@@ -291,30 +244,91 @@ class ResumeAnalyzer:
             else:
                 with open(file_path, 'r', encoding='utf-8') as file:
                     text = file.read()
-                    
+        except Exception as e:
+            self.logger.error(f"Erro na análise do currículo: {str(e)}")
+            return self.error_result(e)
+        return self.analyze_content(text)
+        
+    def analyze_bytes(self, data: Union[bytes, BinaryIO], filename: Optional[str] = None) -> Dict:
+        """
+        Analisa um upload direto da memória (bytes ou stream binário), sem arquivo temporário.
+        PDF pela extensão ou pela assinatura %PDF; o resto é lido como UTF-8.
+        """
+        try:
+            text = self.extract_bytes(data, filename)
+        except Exception as e:
+            self.logger.error(f"Erro na análise do currículo: {str(e)}")
+            return self.error_result(e)
+        return self.analyze_content(text)
+        
+    def extract_bytes(self, data: Union[bytes, BinaryIO], filename: Optional[str] = None) -> str:
+        """Texto de um upload em memória (levanta exceção se não der para ler)"""
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = data.read()
+        is_pdf = (filename or '').lower().endswith('.pdf') or bytes(data[:5]) == b'%PDF-'
+        if is_pdf:
+            return self.extract_text_from_pdf(data)
+        return bytes(data).decode('utf-8')
+        
+    def analyze_text(self, text: Union[str, TextIO]) -> Dict:
+        """Analisa o texto do currículo (str ou stream de texto)"""
+        if not isinstance(text, str):
+            text = text.read()
+        return self.analyze_content(text)
+        
+    def cache_key(self, text: str) -> Tuple[str, str]:
+        """(chave no AnalysisCache, versão das palavras-chave) de um texto"""
+        version = keyword_set_version(self.job_keywords, self.required_skills)
+        return analysis_key(text, version), version
+        
+    def analyze_content(self, text: str, use_cache: bool = True) -> Dict:
+        """
+        Análise a partir do texto já extraído (usada por todas as entradas acima). O mesmo
+        texto com as mesmas palavras-chave volta do cache sem ser analisado de novo.
+        use_cache=False: workers do lote, cujo resultado é guardado pelo processo principal.
+        """
+        if not text or not use_cache:
+            return self._analyze_content(text)
+        key, version = self.cache_key(text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._analyze_content(text)
+        self.cache.put(key, version, result)
+        return result
+        
+    def _analyze_content(self, text: str) -> Dict:
+        try:
             if not text:
                 raise ValueError("Não foi possível extrair texto do arquivo")
                 
-            # Pré-processa o texto
-            tokens = self.preprocess_text(text)
+            # Pré-processa o texto (conjunto de radicais, comparado com os das palavras-chave)
+            tokens = set(self.preprocess_text(text))
+            
+            # Frases-chave, habilidades e formação numa só passada (Aho-Corasick)
+            hits = self.matcher.scan(text)
+            phrases_found = set(hits)
             
             # Calcula pontuações para cada tipo de vaga
             job_scores = {}
             for job_type, keywords in self.job_keywords.items():
-                score = self.calculate_keyword_score(tokens, keywords)
+                score = self.calculate_keyword_score(tokens, keywords, phrases_found)
                 job_scores[job_type] = round(score, 1)
                 
             # Analisa habilidades técnicas
-            technical_score = self.calculate_keyword_score(tokens, self.required_skills['technical'])
+            technical_score = self.calculate_keyword_score(tokens, self.required_skills['technical'], phrases_found)
             
             # Analisa soft skills
-            soft_skills_score = self.calculate_keyword_score(tokens, self.required_skills['soft_skills'])
+            soft_skills_score = self.calculate_keyword_score(tokens, self.required_skills['soft_skills'], phrases_found)
             
             # Analisa experiência
             experience_years, experience_level = self.analyze_experience_level(text)
             
             # Analisa educação
-            education = self.analyze_education(text)
+            education = self.analyze_education(text, hits)
+            
+            # Habilidades técnicas citadas (perfil para a relevância das vagas)
+            skills = self.find_skills(text, hits)
             
             # Calcula pontuação geral (0-5 estrelas)
             overall_scores = []
@@ -333,6 +347,8 @@ class ResumeAnalyzer:
                 'experience_years': experience_years,
                 'experience_level': experience_level,
                 'education': education,
+                'skills': skills,
+                'keyword_hits': {phrase: entry['count'] for phrase, entry in hits.items()},
                 'overall_rating': round(average_score, 1),
                 'star_ratings': {job_type: round((score / 20), 1) for job_type, score in job_scores.items()}
             }
@@ -345,16 +361,35 @@ class ResumeAnalyzer:
             
         except Exception as e:
             self.logger.error(f"Erro na análise do currículo: {str(e)}")
-            return {
-                'error': str(e),
-                'job_scores': {},
-                'technical_score': 0,
-                'soft_skills_score': 0,
-                'experience_years': 0,
-                'experience_level': 'Erro',
-                'education': {},
-                'overall_rating': 0,
-                'star_ratings': {},
-                'recommendations': ['Erro ao analisar o currículo. Verifique o formato do arquivo.']
-            }
+            return self.error_result(e)
+            
+    @staticmethod
+    def error_result(error: Exception) -> Dict:
+        """Resultado vazio com a mensagem de erro (mesmo formato da análise)"""
+        return {
+            'error': str(error),
+            'job_scores': {},
+            'technical_score': 0,
+            'soft_skills_score': 0,
+            'experience_years': 0,
+            'experience_level': 'Erro',
+            'education': {},
+            'skills': [],
+            'keyword_hits': {},
+            'overall_rating': 0,
+            'star_ratings': {},
+            'recommendations': ['Erro ao analisar o currículo. Verifique o formato do arquivo.']
+        }
+
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
 
+def get_resume_analyzer() -> ResumeAnalyzer:
+    """Analisador do processo: NLTK, stopwords, stemmer e radicais montados na primeira chamada"""
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = ResumeAnalyzer()
+        return _analyzer
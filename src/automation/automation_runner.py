@@ -0,0 +1,268 @@
+# src/automation/automation_runner.py
+"""
+Execução de um AutomationJob (usado pelo worker de src/worker.py).
+
+O que antes vivia em routes/automation.run_linkedin_automation, escrevendo no dict
+global automation_status, agora reporta progresso e logs em linhas do banco
+(AutomationJobEvent) via JobReporter. Um thread de heartbeat mantém o job vivo na
+fila e, quando o usuário pede /api/stop de outro processo, sinaliza o stop_event do bot,
+que para no próximo ponto seguro (entre vagas). Cada job em execução fica registrado no
+SessionRegistry do processo, com seu próprio bot, navegador e stop_event.
+"""
+import json
+import logging
+import threading
+import time
+
+from src.automation.browser_pool import BrowserPoolTimeout
+from src.automation.cancellation import AutomationCancelled, CancellationToken
+from src.automation.event_stream import get_event_hub
+from src.automation.session_registry import get_session_registry
+from src.database.sqlite_profile import session_scope
+from src.models.application_recorder import get_application_recorder
+from src.models.automation_job import AutomationJob, AutomationJobEvent
+from src.models.credentials import Credentials
+from src.models.job_detail import get_job_detail_cache
+from src.models.jobs import Job, db
+
+logger = logging.getLogger("AutomationRunner")
+
+HEARTBEAT_INTERVAL = 10
+
+JOB_TYPE_CRITERIA = [
+    ('analista_financeiro', "analista financeiro"),
+    ('contas_pagar', "contas a pagar"),
+    ('contas_receber', "contas a receber"),
+    ('analista_precificacao', "analista de precificacao"),
+    ('custos', "custos"),
+]
+
+
+class JobCancelled(Exception):
+    """Cancelamento pedido antes de a automação começar."""
+
+
+class JobReporter:
+    """Logs/progresso de um job em AutomationJobEvent + heartbeat com checagem de cancelamento."""
+
+    def __init__(self, app, job_id, session=None):
+        self.app = app
+        self.job_id = job_id
+        self.session = session
+        self.stop_event = session.stop_event if session else threading.Event()
+        self.progress_value = 0
+        self.current_platform = None
+        self._stop_heartbeat = threading.Event()
+        self._thread = None
+
+    def log(self, message, level="INFO"):
+        logger.info(f"[{self.job_id[:8]}] {message}")
+        AutomationJobEvent.add(self.job_id, message, level, self.progress_value)
+
+    def progress(self, value, platform=None):
+        self.progress_value = value
+        if platform is not None:
+            self.current_platform = platform
+        if self.session:
+            self.session.progress = value
+            self.session.current_platform = self.current_platform
+        self.beat()
+
+    def beat(self):
+        if AutomationJob.heartbeat(self.job_id, self.progress_value, self.current_platform):
+            self.stop_event.set()
+
+    @property
+    def cancelled(self):
+        return self.stop_event.is_set()
+
+    # -------------------------- heartbeat --------------------------
+
+    def _heartbeat_loop(self):
+        # cada batida numa sessão curta: a conexão volta ao pool entre uma e outra
+        while not self._stop_heartbeat.wait(HEARTBEAT_INTERVAL):
+            try:
+                with session_scope(self.app, db):
+                    self.beat()
+            except Exception as e:
+                logger.warning(f"⚠️ Heartbeat falhou para {self.job_id}: {e}")
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop_heartbeat.set()
+        if self._thread:
+            self._thread.join(timeout=HEARTBEAT_INTERVAL + 5)
+        return False
+
+
+def job_types_from_criteria(job_criteria):
+    job_types = [label for key, label in JOB_TYPE_CRITERIA if job_criteria.get(key)]
+    return job_types or ["analista financeiro"]  # Padrão
+
+
+def _job_row(job_info, session_id):
+    # descrição/requisitos lidos do painel (ou do cache de detalhes, mesmo vencido)
+    detail = get_job_detail_cache().get(job_info.get('job_id'), allow_stale=True) or {}
+    requirements = job_info.get('requirements') or detail.get('requirements')
+    return Job(
+        title=job_info.get('title') or '',
+        company=job_info.get('company') or '',
+        location=job_info.get('location') or '',
+        platform='LinkedIn',
+        url=job_info.get('url') or '',
+        status='applied',
+        job_id=job_info.get('job_id') or '',
+        job_type=job_info.get('job_type'),
+        description=job_info.get('description') or detail.get('description'),
+        requirements=json.dumps(requirements, ensure_ascii=False) if requirements else None,
+        automation_session_id=session_id
+    )
+
+
+def _save_applied_jobs(applied_jobs, reporter):
+    """Grava as vagas aplicadas ligadas à sessão (para /api/results?session_id=) num único commit"""
+    if not applied_jobs:
+        return
+    try:
+        db.session.add_all([_job_row(job_info, reporter.job_id) for job_info in applied_jobs])
+        db.session.commit()
+        reporter.log(f"💾 {len(applied_jobs)} vagas salvas")
+        return
+    except Exception as e:
+        db.session.rollback()
+        reporter.log(f"⚠️ Erro ao salvar vagas em lote ({str(e)}); salvando uma a uma", "WARNING")
+    # fallback: isola a linha problemática
+    for job_info in applied_jobs:
+        try:
+            db.session.add(_job_row(job_info, reporter.job_id))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            reporter.log(f"⚠️ Erro ao salvar vaga {job_info.get('title', 'N/A')}: {str(e)}", "WARNING")
+
+
+def run_linkedin_job(payload, reporter):
+    """Executa a automação do LinkedIn de um job. Retorna o dict de resultados."""
+    from src.automation.linkedin_full_flow import LinkedInFullFlow
+
+    reporter.log("🚀 Iniciando automação do LinkedIn...", "SUCCESS")
+    reporter.progress(10, 'LinkedIn')
+
+    linkedin_cred = Credentials.query.filter_by(platform='linkedin').first()
+    if not linkedin_cred or not linkedin_cred.username or not linkedin_cred.password:
+        raise ValueError("Credenciais do LinkedIn não fornecidas ou incompletas.")
+    reporter.log("✅ Credenciais do LinkedIn carregadas")
+
+    job_criteria = payload.get('criteria', {})
+    job_types = job_types_from_criteria(job_criteria)
+    max_applications = job_criteria.get('max_applications', 3)
+    reporter.log(f"🎯 Tipos de vaga selecionados: {', '.join(job_types)}")
+    reporter.log(f"📊 Máximo de aplicações configurado: {max_applications}")
+
+    if reporter.cancelled:
+        raise JobCancelled()
+
+    # token criado antes do bot: a espera por um navegador do pool já respeita /api/stop e run_timeout
+    cancel_token = CancellationToken(stop_event=reporter.stop_event, run_timeout=payload.get('run_timeout'))
+    try:
+        linkedin_bot = LinkedInFullFlow(
+            headless=payload.get('headless', False),  # visual por padrão para verificação manual
+            use_pool=True,   # reaproveita navegador já autenticado do pool
+            block_resources=payload.get('block_resources'),  # None = padrão (ligado só em headless)
+            cancel_token=cancel_token
+        )
+    except AutomationCancelled:
+        raise JobCancelled()
+    except BrowserPoolTimeout as e:
+        raise RuntimeError(f"Sem navegador livre no pool: {e}")
+    # /api/stop -> registry (mesmo processo) ou heartbeat marcam o stop_event da sessão, que é o do bot
+    if reporter.session:
+        reporter.session.attach_bot(linkedin_bot)
+    else:
+        linkedin_bot.stop_event = reporter.stop_event
+    lease = linkedin_bot.browser_lease
+    reporter.log(f"✅ Bot do LinkedIn inicializado" + (f" (navegador do slot {lease.slot})" if lease else ""))
+    reporter.progress(20)
+
+    try:
+        result = linkedin_bot.start_full_automation(
+            username=linkedin_cred.username,
+            password=linkedin_cred.password,
+            job_types=job_types,
+            max_applications=max_applications,
+            session_id=reporter.job_id,
+            run_timeout=payload.get('run_timeout'),   # prazo (s) da execução inteira
+            job_timeout=payload.get('job_timeout'),   # prazo (s) por vaga
+            resume_profile=payload.get('resume_profile'),          # análise do currículo (/upload-resume)
+            relevance_threshold=payload.get('relevance_threshold'),
+            max_cards=payload.get('max_cards')        # top-K de cards abertos
+        )
+    finally:
+        linkedin_bot.close()
+        reporter.log("🔚 Navegador fechado")
+
+    reporter.progress(90)
+    if not result.get("success"):
+        raise RuntimeError(result.get("error", "Erro desconhecido"))
+    if result.get("status") == "timeout":
+        reporter.log(f"⏰ Prazo da execução ({payload.get('run_timeout')}s) esgotado; encerrando com o que foi aplicado.", "WARNING")
+
+    applications_sent = result.get("applications_sent", 0)
+    applied_jobs = result.get("applied_jobs", [])
+    reporter.log("🎉 Automação concluída com sucesso!", "SUCCESS")
+    reporter.log(f"📈 Total de aplicações enviadas: {applications_sent}", "SUCCESS")
+    _save_applied_jobs(applied_jobs, reporter)
+
+    results = {
+        'total_jobs': len(applied_jobs),
+        'applications_sent': applications_sent,
+        'success_rate': 100.0 if applied_jobs else 0,
+        'jobs_by_platform': {'LinkedIn': {'found': len(applied_jobs), 'applied': applications_sent}}
+    }
+    blocking = result.get("request_blocking")
+    if blocking:
+        results['request_blocking'] = blocking
+        reporter.log(f"🚫 Recursos bloqueados: {blocking['blocked_requests']} requisições "
+                     f"(~{blocking['estimated_bytes_saved'] // 1024} KB economizados)")
+    return results
+
+
+RUNNERS = {
+    'linkedin': run_linkedin_job,
+}
+
+
+def execute_job(app, job, worker_id=None):
+    """Roda um job já reivindicado até o fim, gravando status final, resultado e eventos."""
+    runner = RUNNERS.get(job.platform)
+    payload = job.to_dict()['payload']
+    started = time.time()
+    # os logs deste job passam por este processo: /api/stream pode servir direto do ring buffer
+    get_event_hub().attach(job.id, AutomationJobEvent.last_id(job.id))
+    registry = get_session_registry()
+    session = registry.register(job.id, job.platform, worker_id)
+    if job.cancel_requested:
+        session.stop_event.set()
+    with JobReporter(app, job.id, session) as reporter:
+        try:
+            if runner is None:
+                raise ValueError(f"Plataforma sem automação: {job.platform}")
+            results = runner(payload, reporter)
+            status = 'cancelled' if reporter.cancelled else 'succeeded'
+            AutomationJob.finish(job.id, status, result=results)
+        except JobCancelled:
+            AutomationJob.finish(job.id, 'cancelled')
+        except Exception as e:
+            db.session.rollback()
+            reporter.log(f"💥 Erro crítico na automação: {str(e)}", "ERROR")
+            AutomationJob.finish(job.id, 'failed', error=str(e))
+        finally:
+            registry.unregister(job.id)
+            # não deixa histórico de candidaturas da sessão parado na fila do write-behind
+            get_application_recorder().flush()
+            get_job_detail_cache().flush()
+        reporter.log(f"🏁 Automação finalizada ({time.time() - started:.0f}s)", "SUCCESS")
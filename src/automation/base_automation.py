@@ -11,17 +11,146 @@ import platform
 import os
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import threading
 import requests
 
+from src.automation.cancellation import CancellationToken
+from src.automation.job_api_capture import JobApiCapture
+from src.automation.request_blocking import RequestBlockingProfile
+from src.automation.wait_engine import RatePolicy, WaitEngine
+
+
+_chromedriver_lock = threading.Lock()
+_chromedriver_cached_path = None
+
+
+def _chromedriver_path():
+    """ChromeDriverManager().install() só uma vez por processo (consulta rede/cache em disco)."""
+    global _chromedriver_cached_path
+    with _chromedriver_lock:
+        if not _chromedriver_cached_path:
+            _chromedriver_cached_path = ChromeDriverManager().install()
+        return _chromedriver_cached_path
+
 
 class BaseAutomation:
-    def __init__(self, headless=True, captcha_api_key: str = None):
+    def __init__(self, headless=True, captcha_api_key: str = None, use_pool: bool = False,
+                 block_resources: bool = None, cancel_token: CancellationToken = None):
         self.driver = None
         self.wait = None
         self.headless = headless
         self.captcha_api_key = captcha_api_key  # 🔑 chave do 2captcha
+        self.browser_lease = None
+        self._waits = None
+        self.request_blocking = None
+        self.job_api_capture = None
+        # stop_event (worker / /api/stop) + prazos da execução e por vaga; checado em cada espera
+        # (o do job, quando vem do runner: a espera pelo pool já respeita /api/stop)
+        self.cancel_token = cancel_token or CancellationToken()
         self.setup_logging()
-        self.setup_driver()
+        self.rate_policy = RatePolicy(logger=self.logger)
+        self.rate_policy.token = self.cancel_token
+        if use_pool:
+            self.lease_driver_from_pool()
+        else:
+            self.setup_driver()
+        # bloqueio de imagens/fontes/vídeo/trackers: padrão ligado só em headless
+        self.configure_request_blocking(headless if block_resources is None else block_resources)
+
+    def configure_request_blocking(self, enabled=True, blocked_types=None):
+        """Liga (ou remove) o perfil de bloqueio de recursos via CDP no driver atual"""
+        if not self.driver:
+            return False
+        if not enabled:
+            # navegador do pool pode ter ficado com bloqueio de uma sessão anterior
+            RequestBlockingProfile.clear(self.driver)
+            if self.request_blocking:
+                self.waits.remove_cdp_listener(self.request_blocking.on_cdp_event)
+            self.request_blocking = None
+            return False
+        self.request_blocking = RequestBlockingProfile(blocked_types=blocked_types, logger=self.logger)
+        self.waits.add_cdp_listener(self.request_blocking.on_cdp_event)
+        return self.request_blocking.apply(self.driver)
+
+    @property
+    def stop_event(self):
+        return self.cancel_token.stop_event
+
+    @stop_event.setter
+    def stop_event(self, event):
+        # quem sinaliza (SessionRegistry / heartbeat) passa o próprio Event
+        self.cancel_token.stop_event = event
+
+    def use_cancel_token(self, token):
+        """Troca o token (cancelamento + prazos) usado por esperas, pausas e checkpoints"""
+        self.cancel_token = token
+        self.rate_policy.token = token
+        if self._waits is not None:
+            self._waits.token = token
+
+    def should_stop(self):
+        """True se foi pedido cancelamento ou o prazo da execução acabou"""
+        return self.cancel_token.cancelled
+
+    def checkpoint(self, timeout=None):
+        """
+        Ponto seguro: levanta AutomationCancelled/JobDeadlineExceeded se for o caso.
+        Com `timeout`, devolve-o limitado ao prazo restante (para WebDriverWait).
+        """
+        self.cancel_token.check()
+        return self.cancel_token.clamp(timeout) if timeout is not None else None
+
+    def prepare_current_tab(self):
+        """
+        Reaplica na aba atual o que o CDP só liga por aba: Network.enable (captura JSON)
+        e o bloqueio de recursos. Chamar logo após abrir/trocar para uma aba nova.
+        """
+        if not self.driver:
+            return
+        if self.request_blocking:
+            self.request_blocking.apply(self.driver)
+        elif self.job_api_capture:
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+            except Exception as e:
+                self.logger.debug(f"Network.enable falhou na aba nova: {e}")
+
+    def enable_job_api_capture(self):
+        """Passa a capturar as respostas JSON de vagas (voyager) que a página já carrega"""
+        if not self.driver:
+            return None
+        if self.job_api_capture is None:
+            self.job_api_capture = JobApiCapture(self.driver, self.logger)
+            self.waits.add_cdp_listener(self.job_api_capture.on_cdp_event)
+        return self.job_api_capture
+
+    def get_captured_jobs(self, job_ids=None, limit=30):
+        """Vagas capturadas da API (lê os eventos CDP pendentes antes). [] se nada capturado"""
+        if not self.job_api_capture:
+            return []
+        self.waits.pump_cdp_events()
+        return self.job_api_capture.jobs(job_ids=job_ids, limit=limit)
+
+    def get_request_blocking_stats(self):
+        """Requisições/bytes economizados pelo bloqueio (None se desligado)"""
+        if not self.request_blocking:
+            return None
+        self.waits.pump_cdp_events()
+        return self.request_blocking.stats()
+
+    def lease_driver_from_pool(self, timeout=None):
+        """
+        Pega um navegador já aquecido/autenticado do BrowserPool do processo. A espera é
+        limitada (BrowserPoolTimeout) e interrompida pelo cancel_token.
+        """
+        from src.automation.browser_pool import get_browser_pool
+
+        self.browser_lease = get_browser_pool().acquire(timeout=timeout, headless=self.headless,
+                                                        token=self.cancel_token)
+        self.driver = self.browser_lease.driver
+        self.wait = WebDriverWait(self.driver, 20)
+        self.logger.info(f"♻️ Navegador emprestado do pool (slot {self.browser_lease.slot}, "
+                         f"sessão {self.browser_lease.sessions + 1}).")
 
     def _connect_existing_chrome(self):
         """Tenta conectar em um Chrome já aberto com remote debugging"""
@@ -116,13 +245,25 @@ class BaseAutomation:
             self.logger.info("➡️ Iniciando nova sessão do Chrome...")
 
         # 🔹 Caso falhe, abre nova sessão Selenium (plano B)
+        self.driver = self.launch_chrome(self.headless, logger=self.logger)
+        self.wait = WebDriverWait(self.driver, 20)
+        self.logger.info("✅ Nova sessão ChromeDriver inicializada com sucesso!")
+
+    @staticmethod
+    def launch_chrome(headless=True, profile_dir="./chrome_automation_profile", logger=None):
+        """
+        Abre uma nova sessão do Chrome com o perfil exclusivo da automação e stealth mode.
+        Usado pelo setup_driver (plano B) e pelo BrowserPool, que passa um profile_dir
+        por slot (duas instâncias do Chrome não podem compartilhar o mesmo user-data-dir).
+        """
+        logger = logger or logging.getLogger("BaseAutomation")
         chrome_options = Options()
-        automation_profile = os.path.abspath("./chrome_automation_profile")
+        automation_profile = os.path.abspath(profile_dir)
         os.makedirs(automation_profile, exist_ok=True)
 
         chrome_options.add_argument(f"user-data-dir={automation_profile}")
         chrome_options.add_argument("profile-directory=Default")
-        self.logger.info(f"👤 Usando perfil exclusivo da automação em: {automation_profile}")
+        logger.info(f"👤 Usando perfil exclusivo da automação em: {automation_profile}")
 
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
@@ -142,32 +283,33 @@ class BaseAutomation:
         }
         chrome_options.add_experimental_option("prefs", prefs)
 
-        if self.headless:
+        if headless:
             chrome_options.add_argument("--headless=new")
 
+        # eventos CDP (Network.*) no log 'performance' -> WaitEngine.network_idle
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
         if platform.system().lower() == "linux" and os.path.exists("/usr/bin/google-chrome-stable"):
             chrome_options.binary_location = "/usr/bin/google-chrome-stable"
             service = Service("./chromedriver-linux64/chromedriver")
         else:
-            service = Service(ChromeDriverManager().install())
+            service = Service(_chromedriver_path())
 
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver = webdriver.Chrome(service=service, options=chrome_options)
 
         try:
-            self.driver.execute_cdp_cmd(
+            driver.execute_cdp_cmd(
                 "Page.addScriptToEvaluateOnNewDocument",
                 {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"}
             )
         except Exception as e:
-            self.logger.warning(f"⚠️ Não foi possível aplicar stealth mode: {e}")
+            logger.warning(f"⚠️ Não foi possível aplicar stealth mode: {e}")
 
-        self.wait = WebDriverWait(self.driver, 20)
         try:
-            self.driver.maximize_window()
+            driver.maximize_window()
         except Exception:
             pass
-
-        self.logger.info("✅ Nova sessão ChromeDriver inicializada com sucesso!")
+        return driver
 
     def _load_cookies(self):
         """Carrega cookies salvos para evitar login manual"""
@@ -240,10 +382,17 @@ class BaseAutomation:
             return None
 
     def close_driver(self):
-        """Fecha o driver e salva cookies"""
+        """Fecha o driver e salva cookies (ou devolve ao pool, se veio de lá)"""
         if self.driver:
             self.save_cookies()
-            self.driver.quit()
+            if self.browser_lease:
+                from src.automation.browser_pool import get_browser_pool
+
+                get_browser_pool().release(self.browser_lease)
+                self.browser_lease = None
+            else:
+                self.driver.quit()
+            self.driver = None
 
     def setup_logging(self):
         logging.basicConfig(
@@ -257,7 +406,7 @@ class BaseAutomation:
         """Espera um elemento aparecer e clica nele"""
         try:
             self.logger.debug(f"Tentando clicar no elemento: {value} (By: {by})")
-            element = WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(self.driver, self.checkpoint(timeout)).until(
                 EC.element_to_be_clickable((by, value))
             )
             element.click()
@@ -274,7 +423,7 @@ class BaseAutomation:
         """Espera um elemento aparecer e envia texto"""
         try:
             self.logger.debug(f"Tentando enviar texto '{text}' para o elemento: {value} (By: {by})")
-            element = WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(self.driver, self.checkpoint(timeout)).until(
                 EC.presence_of_element_located((by, value))
             )
             element.clear()
@@ -292,7 +441,7 @@ class BaseAutomation:
         """Espera um elemento aparecer"""
         try:
             self.logger.debug(f"Aguardando elemento: {value} (By: {by})")
-            element = WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(self.driver, self.checkpoint(timeout)).until(
                 EC.presence_of_element_located((by, value))
             )
             self.logger.info(f"✅ Elemento encontrado: {value}")
@@ -307,16 +456,55 @@ class BaseAutomation:
     def safe_sleep(self, seconds):
         """Sleep seguro com log"""
         self.logger.info(f"Aguardando {seconds} segundos...")
-        time.sleep(seconds)
+        self.cancel_token.sleep(seconds)
+
+    # -------------------------- Esperas por condição --------------------------
+
+    @property
+    def waits(self) -> WaitEngine:
+        """WaitEngine ligado ao driver atual (recriado se o driver mudar)."""
+        if self._waits is None or self._waits.driver is not self.driver:
+            self._waits = WaitEngine(self.driver, self.logger)
+            self._waits.token = self.cancel_token
+            if getattr(self, "request_blocking", None):
+                self._waits.add_cdp_listener(self.request_blocking.on_cdp_event)
+            if getattr(self, "job_api_capture", None):
+                self.job_api_capture.driver = self.driver
+                self._waits.add_cdp_listener(self.job_api_capture.on_cdp_event)
+        return self._waits
+
+    def wait_for_dom_stable(self, quiet_ms=500, timeout=10, root_selector=None):
+        """Espera o DOM ficar sem mutações por quiet_ms (MutationObserver)"""
+        return self.waits.dom_stable(quiet_ms=quiet_ms, timeout=timeout, root_selector=root_selector)
+
+    def wait_for_network_idle(self, idle_ms=500, timeout=15, max_inflight=0):
+        """Espera a rede ficar ociosa (eventos CDP)"""
+        return self.waits.network_idle(idle_ms=idle_ms, timeout=timeout, max_inflight=max_inflight)
+
+    def wait_for_element_count_stable(self, css_selector, stable_ms=600, timeout=10, min_count=1):
+        """Espera a contagem de elementos de um seletor parar de mudar"""
+        return self.waits.element_count_stable(css_selector, stable_ms=stable_ms, timeout=timeout, min_count=min_count)
+
+    def wait_for_modal_step_change(self, previous_signature, timeout=6):
+        """Espera o passo do modal Easy Apply mudar; retorna a nova assinatura ou None"""
+        return self.waits.modal_step_changed(previous_signature, timeout=timeout)
+
+    def wait_for_page_ready(self, timeout=20, quiet_ms=400):
+        """readyState complete + rede ociosa + DOM estável"""
+        return self.waits.page_ready(timeout=timeout, quiet_ms=quiet_ms)
+
+    def pace(self, kind, log=False):
+        """Pausa humana explícita (RatePolicy) — separada das esperas de prontidão"""
+        return self.rate_policy.pace(kind, log=log)
 
     def scroll_to_bottom(self):
         """Rola a página até o final"""
         self.logger.info("Rolando a página até o final...")
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        self.safe_sleep(2)
+        self.wait_for_dom_stable(quiet_ms=500, timeout=5)
 
     def scroll_to_element(self, element):
         """Rola até um elemento específico"""
         self.logger.info("Rolando até o elemento...")
         self.driver.execute_script("arguments[0].scrollIntoView();", element)
-        self.safe_sleep(1)
+        self.wait_for_dom_stable(quiet_ms=250, timeout=3)
@@ -0,0 +1,329 @@
+# src/automation/browser_pool.py
+"""
+Pool de navegadores (WebDriver) compartilhado pelo processo.
+
+Cada /api/start ou /api/run criava um LinkedInFullFlow / LinkedInSuperRobustDriver novo,
+que abria o Chrome, carregava cookies e fazia login de novo. O pool mantém até `size`
+instâncias já aquecidas (cookies carregados, feed aberto) e as empresta para as classes
+de automação. Na devolução faz um health-check e recicla a instância depois de
+`max_sessions` usos ou quando o heap JS passa de `max_memory_mb`.
+
+Um único pool por processo atende os modos headless e visual: cada slot tem o seu
+user-data-dir (chrome_pool_profiles/slot_<n>, separado do ./chrome_automation_profile do
+launch_chrome avulso) e `size` limita o total de navegadores abertos. Um pedido num modo
+sem navegador ocioso nesse modo reaproveita o slot de um ocioso do outro modo (fecha e reabre).
+
+Configuração por variáveis de ambiente:
+    JOBHUNTER_BROWSER_POOL_SIZE          (padrão JOBHUNTER_MAX_SESSIONS: um navegador por sessão)
+    JOBHUNTER_BROWSER_POOL_PROFILE_DIR   (padrão ./chrome_pool_profiles)
+    JOBHUNTER_BROWSER_POOL_MAX_SESSIONS  (padrão 20)
+    JOBHUNTER_BROWSER_POOL_MAX_MEMORY_MB (padrão 1024)
+    JOBHUNTER_BROWSER_POOL_ACQUIRE_TIMEOUT (padrão 300 s de espera por um navegador livre)
+
+A espera de acquire() é sempre limitada e, com um CancellationToken, acorda a cada
+WAIT_SLICE segundos para checar /api/stop e o prazo da execução.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.automation.session_registry import max_concurrent_sessions
+
+logger = logging.getLogger("BrowserPool")
+
+DEFAULT_COOKIES_FILE = os.path.join(os.getcwd(), "linkedin_cookies.json")
+FEED_URL = "https://www.linkedin.com/feed/"
+DEFAULT_PROFILE_ROOT = "./chrome_pool_profiles"
+DEFAULT_ACQUIRE_TIMEOUT = 300
+WAIT_SLICE = 1.0
+
+
+def acquire_timeout() -> float:
+    return float(os.environ.get("JOBHUNTER_BROWSER_POOL_ACQUIRE_TIMEOUT", DEFAULT_ACQUIRE_TIMEOUT))
+
+
+class BrowserPoolTimeout(Exception):
+    """Nenhum navegador ficou livre dentro do timeout de acquire()."""
+
+
+class BrowserLease:
+    """Um navegador do pool e seus contadores de uso."""
+
+    def __init__(self, driver, slot: int, headless: bool = True):
+        self.driver = driver
+        self.slot = slot
+        self.headless = headless
+        self.sessions = 0
+        self.created_at = time.time()
+        self.last_used_at = None
+        self.authenticated = False
+
+    def to_dict(self):
+        return {
+            'slot': self.slot,
+            'headless': self.headless,
+            'sessions': self.sessions,
+            'created_at': self.created_at,
+            'last_used_at': self.last_used_at,
+            'authenticated': self.authenticated
+        }
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        size: int = 1,
+        max_sessions: int = 20,
+        max_memory_mb: int = 1024,
+        cookies_file: str = DEFAULT_COOKIES_FILE,
+        factory: Optional[Callable[[bool, int], object]] = None,
+        profile_root: str = DEFAULT_PROFILE_ROOT
+    ):
+        self.size = max(1, int(size))
+        self.max_sessions = max(1, int(max_sessions))
+        self.max_memory_mb = max_memory_mb
+        self.cookies_file = cookies_file
+        self.profile_root = profile_root
+        self.factory = factory or self._default_factory
+
+        self._cond = threading.Condition()
+        self._idle: List[BrowserLease] = []
+        self._leased: Dict[int, BrowserLease] = {}
+        self._free_slots = list(range(self.size))
+        self._closed = False
+
+    # -------------------------- Criação / aquecimento --------------------------
+
+    def _default_factory(self, headless: bool, slot: int):
+        from src.automation.base_automation import BaseAutomation
+
+        # um user-data-dir por slot: o mesmo slot nunca tem dois Chromes abertos ao mesmo tempo
+        profile = os.path.join(self.profile_root, f"slot_{slot}")
+        return BaseAutomation.launch_chrome(headless, profile_dir=profile, logger=logger)
+
+    def _warm_up(self, lease: BrowserLease):
+        """Carrega os cookies salvos e abre o feed para a instância já sair autenticada."""
+        driver = lease.driver
+        try:
+            if os.path.exists(self.cookies_file):
+                with open(self.cookies_file, "r", encoding="utf-8") as f:
+                    cookies = json.load(f)
+                driver.get("https://www.linkedin.com/")
+                for cookie in cookies:
+                    try:
+                        driver.add_cookie(cookie)
+                    except Exception:
+                        continue
+            driver.get(FEED_URL)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao aquecer navegador do slot {lease.slot}: {e}")
+        lease.authenticated = self._is_authenticated(driver)
+        logger.info(f"🔥 Navegador do slot {lease.slot} aquecido | autenticado={lease.authenticated}")
+
+    def _create(self, slot: int, headless: bool) -> BrowserLease:
+        mode = "headless" if headless else "visual"
+        logger.info(f"🚀 Abrindo navegador ({mode}) para o slot {slot} do pool...")
+        lease = BrowserLease(self.factory(headless, slot), slot, headless)
+        self._warm_up(lease)
+        return lease
+
+    # -------------------------- Saúde / reciclagem --------------------------
+
+    @staticmethod
+    def _is_authenticated(driver) -> bool:
+        try:
+            return bool(driver.get_cookie("li_at"))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _memory_mb(driver) -> Optional[float]:
+        """Heap JS usado pela aba atual (CDP Performance.getMetrics, fallback performance.memory)."""
+        try:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            metrics = driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])
+            for m in metrics:
+                if m.get("name") == "JSHeapUsedSize":
+                    return m.get("value", 0) / (1024 * 1024)
+        except Exception:
+            pass
+        try:
+            used = driver.execute_script("return (performance.memory && performance.memory.usedJSHeapSize) || null;")
+            return used / (1024 * 1024) if used else None
+        except Exception:
+            return None
+
+    def _is_healthy(self, lease: BrowserLease) -> bool:
+        driver = lease.driver
+        try:
+            handles = driver.window_handles
+            if not handles:
+                return False
+            # fecha abas extras deixadas pelo fluxo e volta para a primeira
+            for handle in handles[1:]:
+                try:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                except Exception:
+                    pass
+            driver.switch_to.window(handles[0])
+            return driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+
+    def _should_recycle(self, lease: BrowserLease) -> Optional[str]:
+        if lease.sessions >= self.max_sessions:
+            return f"{lease.sessions} sessões"
+        if self.max_memory_mb:
+            mem = self._memory_mb(lease.driver)
+            if mem is not None and mem > self.max_memory_mb:
+                return f"heap JS de {mem:.0f}MB"
+        return None
+
+    @staticmethod
+    def _quit(lease: BrowserLease):
+        try:
+            lease.driver.quit()
+        except Exception:
+            pass
+
+    # -------------------------- API pública --------------------------
+
+    def acquire(self, timeout: Optional[float] = None, headless: bool = True, token=None) -> BrowserLease:
+        """
+        Empresta um navegador no modo pedido. Reaproveita um ocioso do mesmo modo; senão
+        abre um novo num slot livre (ou no slot de um ocioso do outro modo, que é fechado);
+        senão espera até `timeout` segundos (None = JOBHUNTER_BROWSER_POOL_ACQUIRE_TIMEOUT)
+        e levanta BrowserPoolTimeout. Com `token` (CancellationToken) a espera respeita o
+        cancelamento e o prazo da execução (AutomationCancelled).
+        """
+        headless = bool(headless)
+        if timeout is None:
+            timeout = acquire_timeout()
+        if token is not None:
+            timeout = token.clamp(timeout)
+        deadline = time.time() + timeout
+        slot = None
+        replaced = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("BrowserPool encerrado")
+                same_mode = [l for l in self._idle if l.headless == headless]
+                if same_mode:
+                    lease = same_mode[-1]
+                    self._idle.remove(lease)
+                    break
+                if self._free_slots:
+                    slot = self._free_slots.pop(0)
+                    lease = None
+                    break
+                if self._idle:
+                    # todos os slots ocupados, mas há um ocioso do outro modo: troca de modo
+                    replaced = self._idle.pop(0)
+                    slot = replaced.slot
+                    lease = None
+                    break
+                if token is not None:
+                    token.check()
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise BrowserPoolTimeout(f"Nenhum navegador livre no pool em {timeout:.0f}s")
+                self._cond.wait(min(remaining, WAIT_SLICE) if token is not None else remaining)
+
+        if lease is None:
+            # abre o Chrome fora do lock (pode levar vários segundos)
+            if replaced is not None:
+                logger.info(f"♻️ Slot {slot} trocando de modo (headless={headless}).")
+                self._quit(replaced)
+            try:
+                lease = self._create(slot, headless)
+            except Exception:
+                with self._cond:
+                    self._free_slots.append(slot)
+                    self._cond.notify()
+                raise
+
+        lease.last_used_at = time.time()
+        with self._cond:
+            self._leased[lease.slot] = lease
+        return lease
+
+    def release(self, lease: BrowserLease):
+        """Devolve o navegador: health-check, recicla se necessário e libera o slot."""
+        with self._cond:
+            self._leased.pop(lease.slot, None)
+        lease.sessions += 1
+        lease.last_used_at = time.time()
+
+        reason = None
+        if self._closed:
+            reason = "pool encerrado"
+        elif not self._is_healthy(lease):
+            reason = "health-check falhou"
+        else:
+            reason = self._should_recycle(lease)
+
+        if reason:
+            logger.info(f"♻️ Reciclando navegador do slot {lease.slot} ({reason}).")
+            self._quit(lease)
+            with self._cond:
+                self._free_slots.append(lease.slot)
+                self._cond.notify()
+            return
+
+        lease.authenticated = self._is_authenticated(lease.driver)
+        with self._cond:
+            self._idle.append(lease)
+            self._cond.notify()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                'size': self.size,
+                'idle': [l.to_dict() for l in self._idle],
+                'leased': [l.to_dict() for l in self._leased.values()],
+                'free_slots': len(self._free_slots)
+            }
+
+    def shutdown(self):
+        """Fecha todos os navegadores ociosos; os emprestados são fechados na devolução."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for lease in idle:
+            self._quit(lease)
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Pool do processo (headless e visual dividem os mesmos slots), configurado pelas variáveis de ambiente."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                size=int(os.environ.get("JOBHUNTER_BROWSER_POOL_SIZE", max_concurrent_sessions())),
+                max_sessions=int(os.environ.get("JOBHUNTER_BROWSER_POOL_MAX_SESSIONS", 20)),
+                max_memory_mb=int(os.environ.get("JOBHUNTER_BROWSER_POOL_MAX_MEMORY_MB", 1024)),
+                profile_root=os.environ.get("JOBHUNTER_BROWSER_POOL_PROFILE_DIR", DEFAULT_PROFILE_ROOT)
+            )
+        return _pool
+
+
+def shutdown_browser_pools():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+atexit.register(shutdown_browser_pools)
@@ -0,0 +1,122 @@
+# src/automation/cancellation.py
+"""
+Cancelamento cooperativo e prazos (deadlines) das automações.
+
+Um CancellationToken junta o stop_event da sessão (/api/stop), um prazo para a execução
+inteira e um prazo por vaga. Os fluxos chamam token.check() em cada espera, em cada card
+e em cada passo do modal; as esperas usam token.clamp(timeout) para nunca dormir além do
+prazo e token.sleep() no lugar de time.sleep, acordando assim que o stop_event dispara.
+
+As interrupções herdam de BaseException (como KeyboardInterrupt): os fluxos do LinkedIn
+têm muitos `except Exception` defensivos, e o cancelamento precisa atravessá-los até o
+ponto que sabe tratá-lo (a vaga atual para JobDeadlineExceeded, start_full_automation
+para AutomationCancelled), executando os `finally` pelo caminho.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+class AutomationInterrupted(BaseException):
+    """Base das interrupções cooperativas (não é capturada por `except Exception`)."""
+
+    def __init__(self, reason: str = "cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AutomationCancelled(AutomationInterrupted):
+    """Cancelamento pedido pelo usuário ou prazo da execução esgotado: encerra a sessão."""
+
+
+class JobDeadlineExceeded(AutomationInterrupted):
+    """Prazo da vaga atual esgotado: abandona só esta vaga e segue para a próxima."""
+
+    def __init__(self, reason: str = "job_timeout"):
+        super().__init__(reason)
+
+
+class CancellationToken:
+    MIN_WAIT = 0.1
+
+    def __init__(self, stop_event: Optional[threading.Event] = None,
+                 run_timeout: Optional[float] = None, job_timeout: Optional[float] = None):
+        self.stop_event = stop_event or threading.Event()
+        self.run_deadline = None
+        self.job_timeout = job_timeout
+        self._job_deadline = None
+        if run_timeout:
+            self.start_run(run_timeout)
+
+    # -------------------------- prazos --------------------------
+
+    def start_run(self, run_timeout: Optional[float] = None, job_timeout: Optional[float] = None):
+        """Começa a contar o prazo da execução (None = sem prazo)"""
+        self.run_deadline = time.time() + run_timeout if run_timeout else None
+        if job_timeout is not None:
+            self.job_timeout = job_timeout or None
+
+    @contextmanager
+    def job_scope(self, timeout: Optional[float] = None):
+        """Prazo de uma vaga (padrão: job_timeout do token). Aninhado, vale o mais curto."""
+        timeout = timeout or self.job_timeout
+        previous = self._job_deadline
+        if timeout:
+            deadline = time.time() + timeout
+            self._job_deadline = min(deadline, previous) if previous else deadline
+        try:
+            yield self
+        finally:
+            self._job_deadline = previous
+
+    def remaining(self) -> Optional[float]:
+        """Segundos até o prazo mais próximo (execução ou vaga); None se não há prazo"""
+        deadlines = [d for d in (self.run_deadline, self._job_deadline) if d]
+        if not deadlines:
+            return None
+        return min(deadlines) - time.time()
+
+    def clamp(self, timeout: float) -> float:
+        """Timeout de uma espera limitado ao prazo restante"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return max(self.MIN_WAIT, min(timeout, remaining))
+
+    # -------------------------- cancelamento --------------------------
+
+    def cancel(self):
+        self.stop_event.set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        """'cancelled', 'deadline', 'job_timeout' ou None"""
+        now = time.time()
+        if self.stop_event.is_set():
+            return "cancelled"
+        if self.run_deadline and now >= self.run_deadline:
+            return "deadline"
+        if self._job_deadline and now >= self._job_deadline:
+            return "job_timeout"
+        return None
+
+    @property
+    def cancelled(self) -> bool:
+        """True se a execução inteira deve parar (cancelamento ou prazo da execução)"""
+        return self.reason in ("cancelled", "deadline")
+
+    def check(self):
+        """Levanta a interrupção pendente, se houver (chamado em todo ponto seguro)"""
+        reason = self.reason
+        if reason == "job_timeout":
+            raise JobDeadlineExceeded()
+        if reason:
+            raise AutomationCancelled(reason)
+
+    def sleep(self, seconds: float):
+        """time.sleep interrompível: acorda no cancelamento e respeita os prazos"""
+        self.check()
+        if seconds > 0:
+            self.stop_event.wait(self.clamp(seconds))
+        self.check()
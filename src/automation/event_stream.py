@@ -0,0 +1,139 @@
+# src/automation/event_stream.py
+"""
+Logs e progresso das automações em memória, por sessão, para o canal push
+(SSE em /api/stream e long-poll em /api/logs/poll).
+
+Cada sessão tem um ring buffer de tamanho fixo (deque com maxlen), então anexar um log
+não reconstrói lista nenhuma. O id de cada entrada é o id da linha AutomationJobEvent
+gravada pelo worker — crescente e persistente —, de modo que o cliente retoma do último
+id visto (Last-Event-ID) e, se o buffer já descartou esse trecho ou o job roda em outro
+processo (buffer não marcado como `local`), a rota completa a partir do banco com o
+mesmo cursor.
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+DEFAULT_CAPACITY = 500
+
+
+class SessionEventLog:
+    """Ring buffer de logs de uma sessão + último progresso, com espera por novidades."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._entries = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self.local = False          # o job roda neste processo (o buffer vê todos os logs)
+        self.dropped_through = 0    # maior id que saiu do buffer (ou que nunca entrou)
+        self.progress: Dict = {}
+        self.progress_version = 0
+        self.finished = False
+        self.updated_at = time.time()
+
+    @property
+    def last_id(self) -> int:
+        with self._cond:
+            return self._entries[-1]['id'] if self._entries else 0
+
+    @property
+    def first_id(self) -> int:
+        with self._cond:
+            return self._entries[0]['id'] if self._entries else 0
+
+    def append(self, entry: Dict):
+        with self._cond:
+            if len(self._entries) == self._entries.maxlen:
+                self.dropped_through = self._entries[0]['id']
+            self._entries.append(entry)
+            self.updated_at = time.time()
+            self._cond.notify_all()
+
+    def set_progress(self, finished: bool = False, **values):
+        with self._cond:
+            changed = {k: v for k, v in values.items() if self.progress.get(k) != v}
+            if changed or finished != self.finished:
+                self.progress.update(changed)
+                self.finished = self.finished or finished
+                self.progress_version += 1
+                self.updated_at = time.time()
+                self._cond.notify_all()
+
+    def covers(self, after_id: int) -> bool:
+        """True se o buffer tem tudo depois de `after_id` (nada foi descartado no meio)."""
+        with self._cond:
+            return self.local and after_id >= self.dropped_through
+
+    def since(self, after_id: int) -> List[Dict]:
+        with self._cond:
+            return [e for e in self._entries if e['id'] > after_id]
+
+    def tail(self, limit: int = 100) -> List[Dict]:
+        with self._cond:
+            if limit <= 0:
+                return []
+            return list(self._entries)[-limit:]
+
+    def wait(self, after_id: int, progress_version: int, timeout: float) -> bool:
+        """Espera até chegar log com id > after_id, mudar o progresso ou terminar. True se mudou."""
+        deadline = time.time() + timeout
+        with self._cond:
+            while True:
+                if (self._entries and self._entries[-1]['id'] > after_id) \
+                        or self.progress_version != progress_version or self.finished:
+                    return True
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+
+
+class EventHub:
+    """Registro sessão -> SessionEventLog do processo. Sessões antigas são descartadas."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, max_sessions: int = 50):
+        self.capacity = capacity
+        self.max_sessions = max_sessions
+        self._logs: Dict[str, SessionEventLog] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, create: bool = False) -> Optional[SessionEventLog]:
+        with self._lock:
+            log = self._logs.get(session_id)
+            if log is None and create:
+                log = self._logs[session_id] = SessionEventLog(self.capacity)
+                self._evict_locked()
+            return log
+
+    def _evict_locked(self):
+        if len(self._logs) <= self.max_sessions:
+            return
+        # descarta primeiro as sessões terminadas menos recentes
+        ordered = sorted(self._logs.items(), key=lambda item: (not item[1].finished, item[1].updated_at))
+        for session_id, _ in ordered[:len(self._logs) - self.max_sessions]:
+            del self._logs[session_id]
+
+    def attach(self, session_id: str, known_through: int = 0) -> SessionEventLog:
+        """
+        Marca a sessão como executada neste processo. `known_through` é o último id já
+        gravado no banco antes daqui: se o buffer ainda não tem nada, esse trecho só existe lá.
+        """
+        log = self.get(session_id, create=True)
+        with log._cond:
+            if not log._entries:
+                log.dropped_through = max(log.dropped_through, known_through)
+            log.local = True
+        return log
+
+    def publish(self, session_id: str, entry: Dict):
+        self.get(session_id, create=True).append(entry)
+
+    def publish_progress(self, session_id: str, finished: bool = False, **values):
+        self.get(session_id, create=True).set_progress(finished=finished, **values)
+
+
+_hub = EventHub()
+
+
+def get_event_hub() -> EventHub:
+    return _hub
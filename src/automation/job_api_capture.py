@@ -0,0 +1,233 @@
+# src/automation/job_api_capture.py
+"""
+Captura das respostas JSON da API interna do LinkedIn (voyager) via eventos CDP.
+
+A lista de vagas e o painel de detalhes são preenchidos por XHRs que o navegador já
+faz. Em vez de raspar o DOM renderizado card a card, o JobApiCapture escuta os
+eventos Network.* (repassados pelo WaitEngine), lê o corpo das respostas JSON com
+Network.getResponseBody e monta um índice job_id -> vaga com os mesmos campos que
+LinkedInFullFlow._collect_jobs_from_list devolve (+ descrição e método de candidatura).
+
+Os payloads são normalizados ('data' + 'included' com objetos '$type'); o parser é
+tolerante às duas gerações de tipos (com.linkedin.voyager.jobs.* e
+com.linkedin.voyager.dash.jobs.*) e ignora o que não reconhece.
+"""
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+API_URL_MARKERS = ("/voyager/api/", "/jobs-guest/api/")
+JOB_VIEW_URL = "https://www.linkedin.com/jobs/view/{}/"
+
+_JOB_ID_RE = re.compile(r"(?:jobPosting(?:Card)?|jobPostingId|currentJobId)[:=(]+(\d+)")
+_EASY_RE = re.compile(r"candidatura simplificada|easy apply", re.I)
+_APPLIED_RE = re.compile(r"candidatura enviada|candidatou-se|\bapplied\b", re.I)
+
+
+def _text(value) -> str:
+    """Campos de texto vêm como string ou {'text': ...}."""
+    if isinstance(value, dict):
+        value = value.get("text") or value.get("accessibilityText") or ""
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _job_id_from(obj: dict) -> str:
+    for key in ("jobPostingUrn", "*jobPosting", "jobPosting", "entityUrn", "dashEntityUrn", "trackingUrn"):
+        value = obj.get(key)
+        if isinstance(value, str):
+            m = _JOB_ID_RE.search(value)
+            if m:
+                return m.group(1)
+    value = obj.get("jobPostingId")
+    return str(value) if value else ""
+
+
+def _find_company_urn(obj) -> Optional[str]:
+    if isinstance(obj, str):
+        return obj if obj.startswith("urn:li:") and "company" in obj.lower() else None
+    if isinstance(obj, dict):
+        for value in obj.values():
+            found = _find_company_urn(value)
+            if found:
+                return found
+    if isinstance(obj, list):
+        for value in obj:
+            found = _find_company_urn(value)
+            if found:
+                return found
+    return None
+
+
+def _apply_method(posting: dict) -> Optional[str]:
+    """'easy_apply' (onsite) / 'external' (offsite) a partir do applyMethod do JobPosting."""
+    method = posting.get("applyMethod")
+    if not isinstance(method, dict):
+        return None
+    signature = " ".join([method.get("$type", "")] + list(method.keys()))
+    if "Offsite" in signature:
+        return "external"
+    if "Onsite" in signature:
+        return "easy_apply"
+    return None
+
+
+def parse_job_payload(payload: Any) -> List[Dict[str, Any]]:
+    """
+    Extrai vagas de uma resposta voyager. Retorna dicts parciais
+    (job_id + os campos que vieram nessa resposta).
+    """
+    if not isinstance(payload, dict):
+        return []
+    objects = list(payload.get("included") or [])
+    data = payload.get("data")
+    if isinstance(data, dict):
+        objects.append(data)
+        objects.extend(e for e in (data.get("elements") or []) if isinstance(e, dict))
+    objects.extend(e for e in (payload.get("elements") or []) if isinstance(e, dict))
+
+    companies = {}
+    for obj in objects:
+        otype = obj.get("$type", "")
+        if otype.endswith(".Company") and obj.get("entityUrn"):
+            companies[obj["entityUrn"]] = _text(obj.get("name"))
+
+    jobs = []
+    for obj in objects:
+        otype = obj.get("$type", "")
+        job_id = _job_id_from(obj)
+        if not job_id:
+            continue
+
+        if otype.endswith("JobPostingCard"):
+            footer = " ".join(
+                f"{f.get('type', '')} {_text(f.get('text'))}" for f in (obj.get("footerItems") or []) if isinstance(f, dict)
+            )
+            jobs.append({
+                "job_id": job_id,
+                "title": _text(obj.get("jobPostingTitle")) or _text(obj.get("title")),
+                "company": _text(obj.get("primaryDescription")),
+                "location": _text(obj.get("secondaryDescription")),
+                "easy_apply": "EASY_APPLY" in footer or bool(_EASY_RE.search(footer)),
+                "already_applied": "APPLIED" in footer or bool(_APPLIED_RE.search(footer)),
+            })
+
+        elif otype.endswith("JobPosting"):
+            company = _text(obj.get("companyName"))
+            if not company:
+                details = obj.get("companyDetails") or {}
+                for value in details.values() if isinstance(details, dict) else []:
+                    if isinstance(value, dict) and value.get("companyName"):
+                        company = _text(value.get("companyName"))
+                if not company:
+                    company = companies.get(_find_company_urn(details) or "", "")
+            method = _apply_method(obj)
+            applying = obj.get("applyingInfo") if isinstance(obj.get("applyingInfo"), dict) else {}
+            job = {
+                "job_id": job_id,
+                "title": _text(obj.get("title")),
+                "company": company,
+                "location": _text(obj.get("formattedLocation")) or _text(obj.get("location")),
+                "description": _text(obj.get("description")),
+                "apply_method": method,
+            }
+            if method:
+                job["easy_apply"] = method == "easy_apply"
+            if "applied" in applying or "applied" in obj:
+                job["already_applied"] = bool(applying.get("applied", obj.get("applied")))
+            jobs.append(job)
+    return jobs
+
+
+class JobApiCapture:
+    """Índice de vagas vistas nas respostas JSON da página (listener de WaitEngine)."""
+
+    def __init__(self, driver, logger: Optional[logging.Logger] = None):
+        self.driver = driver
+        self.logger = logger or logging.getLogger("JobApiCapture")
+        self._lock = threading.Lock()
+        self._json_requests: Dict[str, str] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self.responses_parsed = 0
+
+    def reset(self):
+        with self._lock:
+            self._json_requests.clear()
+            self._jobs.clear()
+
+    def on_cdp_event(self, event: dict):
+        method = event.get("method", "")
+        params = event.get("params", {})
+        if method == "Network.responseReceived":
+            response = params.get("response", {})
+            url = response.get("url", "")
+            if any(m in url for m in API_URL_MARKERS) and "json" in (response.get("mimeType") or ""):
+                self._json_requests[params.get("requestId")] = url
+        elif method == "Network.loadingFinished":
+            request_id = params.get("requestId")
+            url = self._json_requests.pop(request_id, None)
+            if url:
+                self._read_body(request_id, url)
+        elif method == "Network.loadingFailed":
+            self._json_requests.pop(params.get("requestId"), None)
+
+    def _read_body(self, request_id: str, url: str):
+        try:
+            body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            payload = json.loads(body.get("body") or "null")
+        except Exception as e:
+            self.logger.debug(f"corpo da resposta indisponível ({url[:80]}): {e}")
+            return
+        self.add_payload(payload)
+
+    def add_payload(self, payload: Any) -> int:
+        """
+        Mescla as vagas de um payload no índice. Campo vazio não sobrescreve campo
+        preenchido e flag booleana só é sobrescrita por True, exceto `easy_apply`
+        vindo do applyMethod do JobPosting, que prevalece sobre o rodapé do card.
+        """
+        parsed = parse_job_payload(payload)
+        if not parsed:
+            return 0
+        with self._lock:
+            self.responses_parsed += 1
+            for job in parsed:
+                current = self._jobs.setdefault(job["job_id"], {
+                    "url": JOB_VIEW_URL.format(job["job_id"]),
+                    "job_id": job["job_id"],
+                    "platform": "LinkedIn",
+                })
+                authoritative = bool(job.get("apply_method"))
+                for key, value in job.items():
+                    if key not in current or current[key] in (None, ""):
+                        current[key] = value
+                    elif key == "easy_apply" and current.get("apply_method") and not authoritative:
+                        continue
+                    elif isinstance(value, bool):
+                        if value or (key == "easy_apply" and authoritative):
+                            current[key] = value
+                    elif value not in (None, ""):
+                        current[key] = value
+        return len(parsed)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(str(job_id))
+            return dict(job) if job else None
+
+    def jobs(self, job_ids: Optional[List[str]] = None, limit: int = 30) -> List[Dict[str, Any]]:
+        """
+        Vagas capturadas com título, na ordem de `job_ids` (ex.: ids dos cards visíveis)
+        ou na ordem de captura.
+        """
+        with self._lock:
+            order = [str(j) for j in job_ids] if job_ids else list(self._jobs.keys())
+            out = []
+            for job_id in order:
+                job = self._jobs.get(job_id)
+                if job and job.get("title"):
+                    out.append(dict(job))
+                if len(out) >= limit:
+                    break
+            return out
@@ -0,0 +1,260 @@
+# src/automation/job_card_snapshot.py
+"""
+Snapshot dos cards da lista de vagas em UMA chamada execute_script.
+
+O caminho por elemento (find_element para âncora, título, empresa, local,
+XPaths de 'Candidatura simplificada' / 'Candidatura enviada', is_displayed...)
+custa várias idas e voltas HTTP ao chromedriver por card. Aqui o navegador
+monta tudo e devolve um array JSON; os drivers continuam com o caminho antigo
+como fallback quando o snapshot falha ou volta vazio.
+"""
+import hashlib
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("JobCardSnapshot")
+
+# Seletores de container de card (ordem de preferência)
+CARD_SELECTORS = [
+    "li[data-occludable-job-id]",
+    ".jobs-search-results__list-item",
+    ".job-card-container",
+    ".job-search-card",
+    "[data-job-id]",
+    ".jobs-search-results-list__item",
+    ".scaffold-layout__list-item",
+    "ul.scaffold-layout__list-container li",
+    "ul.jobs-search__results-list li",
+]
+
+# União dos seletores usados pelos extract_job_info dos drivers linkedin_*
+ANCHOR_SELECTORS = [
+    "a[href*='/jobs/view/']",
+    "a.base-card__full-link",
+    "a.job-card-list__title",
+    "a.job-card-container__link",
+]
+TITLE_SELECTORS = [
+    ".job-card-list__title",
+    ".base-search-card__title",
+    ".job-card-container__title",
+    ".job-search-card__title",
+    ".job-card__title",
+    "[data-job-title]",
+    "[data-control-name='job_search_job_title']",
+    "h3 a",
+    "h3",
+    ".job-title",
+]
+COMPANY_SELECTORS = [
+    ".job-card-container__company-name",
+    ".job-card-container__primary-description",
+    ".artdeco-entity-lockup__subtitle",
+    ".base-search-card__subtitle",
+    ".job-search-card__subtitle",
+    ".job-card-list__company",
+    ".job-card__subtitle",
+    "[data-job-company]",
+    "h4 a",
+    "h4",
+    ".job-company",
+]
+LOCATION_SELECTORS = [
+    ".job-card-list__location",
+    ".job-search-card__location",
+    ".job-card-container__metadata-item",
+    ".artdeco-entity-lockup__caption",
+    ".job-card__location",
+    "[data-job-location]",
+    ".job-location",
+]
+
+_SNAPSHOT_JS = r"""
+const cards = arguments[0];
+const sel = arguments[1];
+const limit = arguments[2] || cards.length;
+
+const visible = (el) => !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+const text = (el) => ((el && (el.innerText || el.textContent)) || '').replace(/\s+/g, ' ').trim();
+const first = (root, list) => {
+  for (const s of list) {
+    try {
+      const el = root.querySelector(s);
+      if (el && text(el)) return el;
+    } catch (e) {}
+  }
+  return null;
+};
+const easyRe = /candidatura simplificada|easy apply/i;
+const appliedRe = /candidatura enviada|candidatou-se|you already applied|\bapplied\b/i;
+
+const out = [];
+const seen = new Set();
+for (const card of cards) {
+  if (out.length >= limit) break;
+  try {
+    let a = null;
+    for (const s of sel.anchor) {
+      a = card.matches && card.matches(s) ? card : card.querySelector(s);
+      if (a) break;
+    }
+    if (!a) a = card.tagName === 'A' ? card : card.querySelector('a');
+    const href = a ? (a.href || a.getAttribute('href') || '') : '';
+    if (!href || href.indexOf('/jobs/view/') === -1) continue;
+    const url = href.split('?')[0];
+    if (seen.has(url)) continue;
+    seen.add(url);
+
+    const m = url.match(/\/jobs\/view\/(?:[^\/]*?-)?(\d+)/);
+    const jobId = card.getAttribute('data-occludable-job-id') || card.getAttribute('data-job-id')
+      || (m ? m[1] : '');
+
+    const titleEl = first(card, sel.title) || a;
+    const companyEl = first(card, sel.company);
+    const locationEl = first(card, sel.location);
+
+    const cardText = text(card);
+    let easy = easyRe.test(cardText);
+    if (!easy) {
+      const btns = card.querySelectorAll(
+        "button.jobs-apply-button, button[data-control-name*='apply'], button[aria-label*='Apply'], button[aria-label*='Candidatura'], a[href*='apply']"
+      );
+      for (const b of btns) { if (visible(b)) { easy = true; break; } }
+    }
+
+    out.push({
+      el: card,
+      url: url,
+      job_id: jobId,
+      title: text(titleEl),
+      company: text(companyEl),
+      location: text(locationEl),
+      easy_apply: easy,
+      already_applied: appliedRe.test(cardText),
+      visible: visible(card)
+    });
+  } catch (e) {}
+}
+return out;
+"""
+
+_FIND_CARDS_JS = r"""
+const selectors = arguments[0];
+const root = arguments[1] || document;
+const visible = (el) => !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+for (const s of selectors) {
+  let els = [];
+  try { els = Array.from(root.querySelectorAll(s)); } catch (e) { continue; }
+  const vis = els.filter(visible);
+  if (vis.length) return {selector: s, cards: vis};
+}
+return {selector: null, cards: []};
+"""
+
+_SELECTOR_ARG = {
+    "anchor": ANCHOR_SELECTORS,
+    "title": TITLE_SELECTORS,
+    "company": COMPANY_SELECTORS,
+    "location": LOCATION_SELECTORS,
+}
+
+
+def find_visible_job_cards(driver, selectors: Optional[List[str]] = None, root=None):
+    """
+    Retorna (seletor, [WebElement]) com os cards visíveis do primeiro seletor que casar,
+    testando todos no navegador numa única chamada.
+    """
+    try:
+        res = driver.execute_script(_FIND_CARDS_JS, selectors or CARD_SELECTORS, root)
+        if res:
+            return res.get("selector"), list(res.get("cards") or [])
+    except Exception as e:
+        logger.debug(f"find_visible_job_cards falhou: {e}")
+    return None, []
+
+
+def snapshot_job_cards(driver, cards=None, limit: int = 30) -> List[Dict[str, Any]]:
+    """
+    Extrai job_id, url, título, empresa, local, easy_apply e already_applied de todos os
+    cards numa única chamada execute_script. Se `cards` não for passado, usa o primeiro
+    seletor de CARD_SELECTORS com cards visíveis. Retorna [] em caso de falha.
+    """
+    try:
+        if cards is None:
+            _, cards = find_visible_job_cards(driver)
+        if not cards:
+            return []
+        jobs = driver.execute_script(_SNAPSHOT_JS, list(cards), _SELECTOR_ARG, limit) or []
+        for job in jobs:
+            job["platform"] = "LinkedIn"
+            if not job.get("job_id"):
+                job["job_id"] = extract_job_id(job.get("url") or "")
+        return jobs
+    except Exception as e:
+        logger.debug(f"snapshot_job_cards falhou: {e}")
+        return []
+
+
+def snapshot_job_card(driver, card) -> Optional[Dict[str, Any]]:
+    """Snapshot de um único card (uma chamada execute_script). None se não der."""
+    jobs = snapshot_job_cards(driver, [card], limit=1)
+    return jobs[0] if jobs else None
+
+
+def job_info_from_snapshot(snapshot: Optional[Dict[str, Any]], **defaults) -> Optional[Dict[str, Any]]:
+    """
+    Converte um snapshot no dict que os extract_job_info devolvem
+    (title/url/company/location/job_id), aplicando os defaults de cada driver
+    para campos vazios. Retorna None se o snapshot não tiver título.
+    """
+    if not snapshot or not snapshot.get("title"):
+        return None
+    job_info = {
+        "title": snapshot["title"],
+        "url": snapshot.get("url"),
+        "company": snapshot.get("company") or "",
+        "location": snapshot.get("location") or "",
+        "job_id": snapshot.get("job_id") or "",
+        "easy_apply": bool(snapshot.get("easy_apply")),
+        "already_applied": bool(snapshot.get("already_applied")),
+    }
+    for key, value in defaults.items():
+        if not job_info.get(key):
+            job_info[key] = value
+    return job_info
+
+
+# defaults que os extract_job_info dos drivers aplicavam aos campos vazios
+SNAPSHOT_DEFAULTS = {
+    "company": "Empresa não identificada",
+    "location": "São Paulo, SP",
+}
+
+
+def fallback_job_id(url: Optional[str]) -> str:
+    """Id estável quando o card não traz um: derivado da URL (o mesmo card gera o mesmo id)"""
+    if url:
+        return "job_" + hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+    return f"job_{int(time.time() * 1000)}"
+
+
+def extract_job_info_snapshot(driver, card, **overrides) -> Optional[Dict[str, Any]]:
+    """
+    Caminho rápido dos extract_job_info: snapshot do card numa única chamada
+    execute_script, com os defaults de SNAPSHOT_DEFAULTS (um default None não é aplicado).
+    Retorna None quando o snapshot falha; o driver segue pelo caminho por elemento.
+    """
+    defaults = {**SNAPSHOT_DEFAULTS, **overrides}
+    job_info = job_info_from_snapshot(snapshot_job_card(driver, card),
+                                      **{k: v for k, v in defaults.items() if v is not None})
+    if job_info and not job_info.get("job_id"):
+        job_info["job_id"] = fallback_job_id(job_info.get("url"))
+    return job_info
+
+
+def extract_job_id(url: str) -> str:
+    """Extrai o id numérico de uma URL /jobs/view/<id>."""
+    m = re.search(r"/jobs/view/(?:[^/]*?-)?(\d+)", url or "")
+    return m.group(1) if m else ""
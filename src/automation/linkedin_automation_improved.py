@@ -7,6 +7,7 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from src.automation.base_automation import BaseAutomation
+from src.automation.job_card_snapshot import extract_job_info_snapshot
 
 class LinkedInAutomationImproved(BaseAutomation):
     def __init__(self, headless=False):  # Mudando para não headless por padrão para debug
@@ -162,6 +163,11 @@ class LinkedInAutomationImproved(BaseAutomation):
         try:
             job_info = {}
             
+            # Snapshot do card em um único execute_script; fallback para o caminho por elemento
+            snapshot_info = extract_job_info_snapshot(self.driver, job_card, company=None, location=None)
+            if snapshot_info:
+                return snapshot_info
+                
             # Título da vaga
             title_selectors = [
                 ".job-card-list__title",
@@ -11,6 +11,7 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from src.automation.job_card_snapshot import extract_job_info_snapshot
 import logging
 
 class LinkedInAutomationReal:
@@ -233,6 +234,12 @@ class LinkedInAutomationReal:
         try:
             job_info = {}
             
+            # Snapshot do card em um único execute_script; fallback para o caminho por elemento
+            snapshot_info = extract_job_info_snapshot(self.driver, job_card, location=None)
+            if snapshot_info:
+                snapshot_info['has_easy_apply'] = snapshot_info['easy_apply']
+                return snapshot_info
+            
             # Título da vaga
             try:
                 title_element = job_card.find_element(By.CSS_SELECTOR, ".job-search-card__title a")
@@ -19,7 +19,11 @@ import re
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import Select
 
+from src.analysis.job_relevance import JobRelevanceScorer
 from src.automation.base_automation import BaseAutomation
+from src.automation.cancellation import AutomationCancelled, CancellationToken, JobDeadlineExceeded
+from src.automation.job_card_snapshot import find_visible_job_cards, snapshot_job_cards
+from src.models.job_detail import get_job_detail_cache
 
 
 
@@ -47,6 +51,13 @@ class LinkedInFullFlow(BaseAutomation):
     BASE_URL = "https://www.linkedin.com"
     JOBS_SEARCH_URL = "https://www.linkedin.com/jobs/search/"
 
+    # Coleta a lista de vagas com um único execute_script (fallback: caminho por elemento)
+    use_dom_snapshot = True
+    # Usa as respostas JSON da API do LinkedIn capturadas via CDP antes de olhar o DOM
+    use_api_capture = True
+    # top-K padrão de cards abertos por execução = max_applications * este fator
+    CARDS_PER_APPLICATION = 4
+
     def __init__(
 
 
@@ -58,9 +69,15 @@ class LinkedInFullFlow(BaseAutomation):
         salary_min: int = 1900,
         max_applications: int = 3,
         headless: bool = False,
-        timeout: int = 40
+        timeout: int = 40,
+        use_pool: bool = False,
+        block_resources: Optional[bool] = None,
+        cancel_token: Optional[CancellationToken] = None
     ):
-        super().__init__(headless=headless)   # ✅ inicializa driver + logger
+        # use_pool=True pega um navegador já autenticado do BrowserPool em vez de abrir outro
+        # block_resources=None -> bloqueio de imagens/fontes/vídeo/trackers só em headless
+        super().__init__(headless=headless, use_pool=use_pool, block_resources=block_resources,
+                         cancel_token=cancel_token)   # ✅ inicializa driver + logger
         # garante que BaseAutomation.save_cookies/_load_cookies tenham caminho válido
         if not hasattr(self, "cookies_file") or not self.cookies_file:
             import os
@@ -73,19 +90,25 @@ class LinkedInFullFlow(BaseAutomation):
         self.salary_min = salary_min
         self.max_applications = max_applications
         self.timeout = timeout
+        self.applied_jobs: List[Dict[str, Any]] = []
+        # relevância antes do clique (configure_relevance): só abre vagas acima do limiar, até max_cards_opened
+        self.relevance_scorer: Optional[JobRelevanceScorer] = None
+        self.max_cards_opened: Optional[int] = None
 
         # ✅ cria diretórios para screenshots e HTMLs de debug
         self._ensure_dirs()
 
+        if self.use_api_capture:
+            self.enable_job_api_capture()
+
         self.logger.info(f"🧭 LinkedInFullFlow inicializado | headless={headless} | timeout={timeout}s")
 
     def _human_type(self, element, text):
         """Digita texto caractere por caractere para simular humano"""
-        import random, time
         element.clear()
         for char in text:
             element.send_keys(char)
-            time.sleep(random.uniform(0.1, 0.3))  # tempo aleatório por caractere
+            self.pace("keystroke")  # tempo aleatório por caractere
     # -------------------------- Helpers de infra --------------------------
 
     def _ensure_dirs(self):
@@ -146,14 +169,17 @@ class LinkedInFullFlow(BaseAutomation):
                 return False
 
             # Pausa aleatória antes do submit
-            self.safe_sleep(random.uniform(1.5, 3.0))
+            self.pace("before_submit", log=True)
 
             # Botão de login
+            login_url = self.driver.current_url
             if not self.wait_and_click(By.XPATH, "//button[@type='submit']"):
                 self._dump_html("login_submit_fail")
                 return False
 
-            self.safe_sleep(random.uniform(2.0, 4.0))
+            # espera o redirecionamento pós-login em vez de um sleep fixo
+            self.waits.url_changed(login_url, timeout=self.timeout)
+            self.wait_for_page_ready(timeout=self.timeout)
             self._snap("02_after_login_submit")
 
             # Verificação de sucesso
@@ -208,14 +234,14 @@ class LinkedInFullFlow(BaseAutomation):
             jobs_url = f"{self.BASE_URL}/jobs/"
             self.logger.info(f"➡️ Acessando: {jobs_url}")
             self.driver.get(jobs_url)
-            self.safe_sleep(2)
+            self.wait_for_page_ready(timeout=self.timeout)
             self._snap("jobs_landing_page")
 
             # Segundo passo: /jobs/collections/recommended
             recommended_url = f"{self.BASE_URL}/jobs/collections/recommended/"
             self.logger.info(f"➡️ Redirecionando para: {recommended_url}")
             self.driver.get(recommended_url)
-            self.safe_sleep(3)
+            self.wait_for_page_ready(timeout=self.timeout)
             self._snap("jobs_recommended_page")
 
             current_url = self.driver.current_url
@@ -279,16 +305,470 @@ class LinkedInFullFlow(BaseAutomation):
             job_term, location, easy_apply_only, posted_last_days, experience_level
         )
 
-    def process_job_listings(self, max_apply: int = 10, limit_cards: int = 30):
+    # -------------------------- Descoberta de vagas --------------------------
+
+    JOB_LIST_ITEM_CSS = "li[data-occludable-job-id], a[href*='/jobs/view/']"
+    JOBS_PER_PAGE = 25
+
+    def _load_more_cards(self) -> bool:
+        """
+        Rola o painel da lista (ou a janela) até o fim para o LinkedIn renderizar os cards
+        ocultos (lista virtualizada). Retorna True se apareceram novos cards com link.
+        """
+        count_js = "return document.querySelectorAll(\"a[href*='/jobs/view/']\").length;"
+        try:
+            before = self.driver.execute_script(count_js) or 0
+            self.driver.execute_script("""
+                const list = document.querySelector('.jobs-search-results-list, .scaffold-layout__list > div, .scaffold-layout__list');
+                if (list && list.scrollHeight > list.clientHeight) { list.scrollTop = list.scrollHeight; }
+                else { window.scrollTo(0, document.body.scrollHeight); }
+            """)
+            self.wait_for_network_idle(idle_ms=300, timeout=5, max_inflight=1)
+            self.wait_for_element_count_stable("a[href*='/jobs/view/']", stable_ms=500, timeout=5)
+            after = self.driver.execute_script(count_js) or 0
+            return after > before
+        except Exception as e:
+            self.logger.debug(f"_load_more_cards falhou: {e}")
+            return False
+
+    def _return_to_listing(self, page_url: str):
+        """Se a etapa de candidatura saiu da busca (abriu a vaga por URL), volta para a página da lista."""
+        from urllib.parse import parse_qs, urlparse
+        try:
+            current = self.driver.current_url or ""
+            # mesma busca (o LinkedIn acrescenta currentJobId etc. na URL ao clicar nos cards)
+            same_search = parse_qs(urlparse(current).query).get("keywords") == parse_qs(urlparse(page_url).query).get("keywords")
+            if "/jobs/search" in current and same_search:
+                return
+            self.logger.info(f"↩️ Voltando para a lista: {page_url}")
+            self.driver.get(page_url)
+            self.wait_for_element_count_stable(self.JOB_LIST_ITEM_CSS, stable_ms=500, timeout=8)
+        except Exception as e:
+            self.logger.debug(f"_return_to_listing falhou: {e}")
+
+    def iter_job_listings(self, max_pages: int = 1, limit_cards: int = 30, keywords: Optional[str] = None):
+        """
+        Gerador de vagas da busca atual. Entrega cada vaga assim que é encontrada;
+        quando a lista visível acaba, rola para carregar mais cards e, esgotada a página,
+        abre a próxima (parâmetro start=). Vagas já inscritas e repetidas são puladas.
+        Como só avança quando o consumidor pede a próxima vaga, nenhuma página é aberta
+        além do necessário para atingir o limite de candidaturas.
+        `keywords` fixa a busca do gerador (várias buscas em abas diferentes).
+        """
+        keywords = keywords or getattr(self, "search_keywords", "analista financeiro")
+        location = getattr(self, "search_location", None) or self.location
+        easy_apply_only = getattr(self, "search_easy_apply_only", True)
+        seen = set()
+        for page in range(max(1, max_pages)):
+            self.checkpoint()
+            if page > 0:
+                self.logger.info(f"📄 Abrindo página {page + 1} da busca...")
+                if not self.go_to_filtered_jobs(
+                    keywords=keywords,
+                    location=location,
+                    easy_apply_only=easy_apply_only,
+                    start=page * self.JOBS_PER_PAGE
+                ):
+                    return
+            page_url = self.driver.current_url
+            found_on_page = 0
+
+            while found_on_page < limit_cards:
+                jobs = self._collect_jobs_from_list(limit=limit_cards)
+                new_jobs = []
+                for job in jobs:
+                    key = job.get("job_id") or job.get("url")
+                    if key and key not in seen:
+                        seen.add(key)
+                        new_jobs.append(job)
+                if not new_jobs:
+                    if self._load_more_cards():
+                        continue
+                    break
+                self._attach_cached_details(new_jobs)
+                new_jobs, skipped = self._rank_jobs(new_jobs)
+                found_on_page += len(skipped)
+
+                for job in new_jobs:
+                    found_on_page += 1
+                    if job.get("already_applied"):
+                        continue
+                    yield job
+                    # a candidatura pode ter navegado para a página da vaga
+                    self._return_to_listing(page_url)
+                    if found_on_page >= limit_cards:
+                        break
+
+            self.logger.info(f"📄 Página {page + 1}: {found_on_page} vagas novas.")
+            if found_on_page == 0:
+                # página vazia: não há mais resultados para esta busca
+                return
+
+    def _apply_to_listed_job(self, job, idx: int) -> bool:
+        """
+        Abre uma vaga vinda da lista (card ou URL) e tenta a candidatura. True se confirmou.
+        Roda dentro do prazo por vaga (job_timeout): estourado, a vaga é abandonada e o
+        fluxo segue para a próxima.
         """
-        Coleta vagas da lista (até `limit_cards`), filtra Easy Apply não inscritas
-        e tenta aplicar até atingir max_apply.
+        try:
+            with self.cancel_token.job_scope():
+                return self._open_listed_job(job, idx)
+        except JobDeadlineExceeded:
+            self.logger.warning(f"⏰ [{idx}] Prazo da vaga esgotado ({self.cancel_token.job_timeout}s); abandonando.")
+            self._abandon_current_job()
+            return False
+
+    def _abandon_current_job(self):
+        """Fecha o modal Easy Apply (descartando) para a próxima vaga começar limpa"""
+        try:
+            self.driver.execute_script("""
+                const click = (el) => { try { el.click(); return true; } catch (e) { return false; } };
+                const dismiss = document.querySelector("button[data-test-modal-close-btn], .artdeco-modal__dismiss");
+                if (dismiss) click(dismiss);
+                const discard = [...document.querySelectorAll("button")].find(b =>
+                    /descartar|discard/i.test(b.innerText || ""));
+                if (discard) click(discard);
+            """)
+        except Exception as e:
+            self.logger.debug(f"_abandon_current_job falhou: {e}")
+
+    def _open_listed_job(self, job, idx: int) -> bool:
+        try:
+            job_url = job.get("url") if isinstance(job, dict) and job.get("url") else (job if isinstance(job, str) else None)
+            if isinstance(job, dict) and job.get("apply_method") == "external":
+                # método de candidatura já conhecido (cache/API): não há Easy Apply para abrir
+                self.logger.info(f"⏭️ [{idx}] Candidatura externa (detalhes em cache) — pulando sem abrir.")
+                return False
+            self.logger.info(f"🧭 [{idx}] Tentando aplicar:  |  | {job_url or '(card element)'}")
+
+            ok = False
+            # se tiver elemento 'el' (WebElement) tente abrir via elemento (mais rápido)
+            if isinstance(job, dict) and job.get("el"):
+                # cuidado com stale element: re-localizar pela job_id/href antes de passar
+                try:
+                    job_el = job.get("el")
+                    job_id = job.get("job_id")
+                    if job_id:
+                        # re-encontrar elemento na lista para reduzir stale
+                        try:
+                            re_el = self.driver.find_element(By.CSS_SELECTOR, f"li[data-occludable-job-id='{job_id}']")
+                            job_el = re_el
+                        except Exception:
+                            # fallback: procurar pelo href
+                            try:
+                                re_a = self.driver.find_element(By.XPATH, f"//a[contains(@href,'/jobs/view/{job_id}')]")
+                                parent = re_a.find_element(By.XPATH, "./ancestor::li[1]")
+                                job_el = parent or job_el
+                            except Exception:
+                                pass
+                    ok = self.open_and_process_job_card(job_el, idx, job=job)
+                except StaleElementReferenceException:
+                    self.logger.warning("⚠️ StaleElementReference ao usar elemento; tentando por URL.")
+                    if job_url:
+                        ok = self.open_and_process_job_card(job_url, idx, job=job)
+                    else:
+                        ok = False
+            else:
+                # usar URL (string)
+                if isinstance(job, dict) and job.get("url"):
+                    ok = self.open_and_process_job_card(job.get("url"), idx, job=job)
+                elif isinstance(job, str):
+                    ok = self.open_and_process_job_card(job, idx)
+                else:
+                    ok = False
+
+            return ok
+        except Exception as e:
+            self.logger.warning(f"⚠️ Erro ao processar vaga {job.get('url') if isinstance(job, dict) else job}: {e}")
+            self._dump_html(f"process_job_error_{idx}")
+            return False
+
+    # -------------------------- Cache de detalhes das vagas --------------------------
+
+    def _attach_cached_details(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Completa as vagas da lista com descrição, requisitos e método de candidatura do
+        cache (job_details). Descrição que já veio na resposta JSON da lista vai para o
+        cache sem precisar abrir o painel.
+        """
+        cache = get_job_detail_cache()
+        for job in jobs:
+            job_id = job.get("job_id")
+            if not job_id:
+                continue
+            try:
+                detail = cache.seen(job_id)
+                if detail is None and job.get("description"):
+                    detail = cache.store(job_id, job.get("description"), job.get("apply_method"),
+                                         title=job.get("title"), company=job.get("company"))
+            except Exception as e:
+                self.logger.debug(f"cache de detalhes indisponível para {job_id}: {e}")
+                continue
+            if detail:
+                self._merge_job_detail(job, detail)
+        return jobs
+
+    @staticmethod
+    def _merge_job_detail(job: Dict[str, Any], detail: Dict[str, Any]):
+        job["description"] = job.get("description") or detail.get("description")
+        job["requirements"] = detail.get("requirements") or []
+        job["apply_method"] = job.get("apply_method") or detail.get("apply_method")
+        job["detail_cached"] = True
+
+    def _read_job_detail_panel(self) -> Dict[str, Any]:
+        """Descrição (innerText, com as quebras de linha) e método de candidatura do painel aberto"""
+        return self.driver.execute_script("""
+            const root = document.querySelector("#job-details, .jobs-description__content, "
+                + ".jobs-box__html-content, .show-more-less-html__markup, .description__text");
+            const buttons = [...document.querySelectorAll(".jobs-apply-button, .jobs-apply-button--top-card button, "
+                + "button[aria-label*='Apply'], button[aria-label*='Candidat']")];
+            const label = buttons.map(b => (b.innerText || "") + " " + (b.getAttribute("aria-label") || "")).join(" ");
+            let method = null;
+            if (/candidatura simplificada|easy apply/i.test(label)) method = "easy_apply";
+            else if (buttons.length) method = "external";
+            return {description: root ? (root.innerText || "").trim() : "", apply_method: method};
+        """) or {}
+
+    def _record_job_detail(self, job: Optional[Dict[str, Any]], job_url: Optional[str] = None):
+        """
+        Guarda no cache os detalhes da vaga cujo painel acabou de abrir. Se o cache já tem
+        os detalhes dentro do TTL o painel não é relido; senão usa a resposta JSON
+        capturada e, na falta dela, o DOM do painel.
+        """
+        job = job if isinstance(job, dict) else {}
+        job_id = job.get("job_id") or (self._extract_job_id_from_url(job_url) if job_url else None)
+        if not job_id:
+            return
+        cache = get_job_detail_cache()
+        try:
+            if job.get("detail_cached"):
+                return
+            detail = cache.get(job_id)
+            if detail is None:
+                captured = None
+                if self.job_api_capture:
+                    self.waits.pump_cdp_events()
+                    captured = self.job_api_capture.get_job(job_id)
+                description = (captured or {}).get("description")
+                apply_method = (captured or {}).get("apply_method")
+                if not description:
+                    panel = self._read_job_detail_panel()
+                    description = panel.get("description")
+                    apply_method = apply_method or panel.get("apply_method")
+                detail = cache.store(job_id, description, apply_method,
+                                     title=job.get("title"), company=job.get("company"))
+            if detail:
+                self._merge_job_detail(job, detail)
+        except Exception as e:
+            self.logger.debug(f"_record_job_detail falhou para {job_id}: {e}")
+
+    # -------------------------- Relevância antes do clique --------------------------
+
+    def configure_relevance(self, job_types: List[str], profile: Optional[Dict[str, Any]] = None,
+                            threshold: Optional[float] = None, max_cards: Optional[int] = None):
+        """
+        Liga a pontuação das vagas pela lista (título, empresa, local, Easy Apply, descrição
+        em cache) contra os tipos de vaga e o perfil do currículo (saída do ResumeAnalyzer).
+        `max_cards` é o top-K: quantos cards no máximo são abertos na execução.
+        """
+        self.relevance_scorer = JobRelevanceScorer(
+            job_types, profile=profile, threshold=threshold,
+            location=getattr(self, "search_location", None) or self.location
+        )
+        self.max_cards_opened = max_cards
+        self.logger.info(
+            f"🎯 Relevância: limiar={self.relevance_scorer.threshold} | top-K={max_cards or 'sem limite'}"
+            + (f" | perfil com {len((profile or {}).get('skills') or [])} habilidades" if profile else "")
+        )
+
+    def _rank_jobs(self, jobs: List[Dict[str, Any]]):
+        """(vagas a abrir, melhor primeiro; vagas abaixo do limiar). Sem scorer, tudo na ordem da lista"""
+        if not self.relevance_scorer or not jobs:
+            return jobs, []
+        selected, skipped = self.relevance_scorer.rank(jobs)
+        for job in skipped:
+            self.logger.info(f"🙈 Irrelevante ({job['relevance']:.2f}): {job.get('title') or job.get('url')} — não abre.")
+        return selected, skipped
+
+    def _card_budget_exhausted(self, opened: int) -> bool:
+        if self.max_cards_opened and opened >= self.max_cards_opened:
+            self.logger.info(f"🎯 Top-K atingido: {opened} cards abertos (máx. {self.max_cards_opened}).")
+            return True
+        return False
+
+    # -------------------------- Várias buscas na mesma sessão --------------------------
+
+    def _job_priority(self, job: Dict[str, Any], keywords: str, query_rank: int) -> float:
+        """
+        Prioridade de uma vaga para o agendador de buscas: relevância (quando ligada),
+        quanto do termo aparece no título, bônus para Easy Apply e leve preferência pela
+        ordem das buscas.
+        """
+        title = (job.get("title") or "").lower()
+        tokens = [t for t in keywords.lower().split() if len(t) > 2]
+        score = 3.0 * job.get("relevance", 0.0)
+        if tokens:
+            score += 2.0 * sum(1 for t in tokens if t in title) / len(tokens)
+        if keywords.lower() in title:
+            score += 1.0
+        if job.get("easy_apply"):
+            score += 1.0
+        return score - 0.1 * query_rank
+
+    def _open_query_tabs(self, job_types: List[str], use_tabs: bool = True) -> List[Dict[str, Any]]:
+        """
+        Prepara uma busca por termo. A primeira usa a aba atual; as demais são abertas
+        com window.open e carregam em segundo plano enquanto a primeira é processada.
+        Cada aba nova nasce em branco e recebe o bloqueio de recursos e a captura JSON
+        (prepare_current_tab) antes de carregar a busca.
+        """
+        location = getattr(self, "search_location", None) or self.location
+        easy_apply_only = getattr(self, "search_easy_apply_only", True)
+        queries = []
+        for rank, keywords in enumerate(job_types):
+            handle = self.driver.current_window_handle if rank == 0 or use_tabs else None
+            if rank > 0 and use_tabs:
+                url = self.build_filtered_jobs_url(keywords=keywords, location=location, easy_apply_only=easy_apply_only)
+                first = queries[0]["handle"]
+                before = set(self.driver.window_handles)
+                try:
+                    self.driver.execute_script("window.open('about:blank', '_blank');")
+                    opened = [h for h in self.driver.window_handles if h not in before]
+                    handle = opened[0] if opened else None
+                    if handle:
+                        # CDP é por aba: bloqueio/captura antes da navegação, que segue em segundo plano
+                        self.driver.switch_to.window(handle)
+                        self.prepare_current_tab()
+                        self.driver.execute_script("window.location.href = arguments[0];", url)
+                        self.logger.info(f"🗂️ Aba aberta para a busca '{keywords}'.")
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Não consegui abrir aba para '{keywords}': {e}")
+                    handle = None
+                finally:
+                    if first:
+                        self.driver.switch_to.window(first)
+            queries.append({"rank": rank, "keywords": keywords, "handle": handle, "listings": None})
+        return queries
+
+    def _next_query_job(self, query: Dict[str, Any], seen: set, max_pages: int, limit_cards: int):
+        """Próxima vaga ainda não vista da busca `query` (troca para a aba dela). None se esgotou."""
+        if query["handle"]:
+            self.driver.switch_to.window(query["handle"])
+        if query["listings"] is None:
+            if not query["handle"] or (query["rank"] > 0 and "/jobs/search" not in (self.driver.current_url or "")):
+                # sem aba própria (ou aba não carregou): abre a busca na aba atual
+                self.go_to_filtered_jobs(keywords=query["keywords"], location=getattr(self, "search_location", None) or self.location)
+            else:
+                self.wait_for_element_count_stable(self.JOB_LIST_ITEM_CSS, stable_ms=500, timeout=8)
+            query["listings"] = self.iter_job_listings(
+                max_pages=max_pages, limit_cards=limit_cards, keywords=query["keywords"]
+            )
+        for job in query["listings"]:
+            key = job.get("job_id") or job.get("url")
+            if key in seen:
+                continue
+            seen.add(key)
+            return job
+        return None
+
+    def process_search_queries(
+        self,
+        job_types: List[str],
+        max_apply: int = 10,
+        max_pages: int = 1,
+        limit_cards: int = 30,
+        use_tabs: bool = True
+    ) -> int:
+        """
+        Roda todas as buscas (uma por tipo de vaga) na mesma sessão autenticada.
+        Cada busca tem seu gerador de vagas (e sua aba); as vagas são deduplicadas por
+        job_id e a candidatura segue a maior prioridade entre a vaga da vez de cada busca,
+        intercalando os termos. Retorna o número de candidaturas efetuadas.
+        """
+        import heapq
+
+        applied = 0
+        seen = set()
+        queries = self._open_query_tabs(job_types, use_tabs=use_tabs)
+        heap = []
+
+        def _push(query):
+            # sem aba própria, as buscas dividem a aba atual: só uma lista ativa por vez
+            job = self._next_query_job(query, seen, max_pages, limit_cards)
+            if job is not None:
+                priority = self._job_priority(job, query["keywords"], query["rank"])
+                heapq.heappush(heap, (-priority, len(seen), query["rank"], job))
+
+        try:
+            if use_tabs:
+                for query in queries:
+                    _push(query)
+            else:
+                _push(queries[0])
+            pending = [] if use_tabs else list(queries[1:])
+
+            idx = 0
+            while applied < max_apply and (heap or pending):
+                self.checkpoint()
+                if not heap:
+                    _push(pending.pop(0))
+                    continue
+                if self._card_budget_exhausted(idx):
+                    break
+                _, _, rank, job = heapq.heappop(heap)
+                query = queries[rank]
+                if query["handle"]:
+                    self.driver.switch_to.window(query["handle"])
+                idx += 1
+                self.logger.info(f"🔀 Busca '{query['keywords']}' -> {job.get('title') or job.get('url')}")
+                if self._apply_to_listed_job(job, idx):
+                    applied += 1
+                    self._remember_applied(job, job_type=query["keywords"])
+                    self.logger.info(f"✅ Aplicado ({applied}/{max_apply})")
+                else:
+                    self.logger.info("⏭️ Não aplicado (pulando).")
+                if applied >= max_apply:
+                    self.logger.info("🎯 Limite de candidaturas atingido.")
+                    break
+                _push(query)
+                self.pace("between_cards")
+        finally:
+            for query in queries:
+                if query["listings"] is not None:
+                    query["listings"].close()
+            self._close_extra_tabs()
+
+        self.logger.info(f"✅ Buscas finalizadas ({len(job_types)} termos) | Total candidaturas efetuadas: {applied}")
+        return applied
+
+    def _remember_applied(self, job, job_type: Optional[str] = None):
+        """Guarda a vaga aplicada (sem o WebElement) para o resultado de start_full_automation."""
+        info = {k: v for k, v in job.items() if k != "el"} if isinstance(job, dict) else {"url": job}
+        if job_type:
+            info.setdefault("job_type", job_type)
+        self.applied_jobs.append(info)
+
+    def _close_extra_tabs(self):
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+        except Exception as e:
+            self.logger.debug(f"_close_extra_tabs falhou: {e}")
+
+    def process_job_listings(self, max_apply: int = 10, limit_cards: int = 30, max_pages: int = 1):
+        """
+        Consome iter_job_listings (até `limit_cards` por página, até `max_pages` páginas),
+        pula vagas já inscritas e tenta aplicar até atingir max_apply. A candidatura
+        começa na primeira vaga encontrada; novas páginas só são abertas se ainda faltarem
+        candidaturas (o gerador só avança quando pedimos a próxima vaga).
         Retorna o número de candidaturas efetuadas.
         """
         from urllib.parse import quote_plus
         applied = 0
         try:
-            self.safe_sleep(0.6)
 
             # garantir que estamos na página de pesquisa (se não, tenta open fallback)
             try:
@@ -309,118 +789,49 @@ class LinkedInFullFlow(BaseAutomation):
                             final = base + params
                             self.logger.info(f"➡️ Acessando fallback: {final}")
                             self.driver.get(final)
-                            self.safe_sleep(3)
+                            self.wait_for_page_ready(timeout=self.timeout)
                     else:
                         base = "https://www.linkedin.com/jobs/search/"
                         params = f"?keywords={quote_plus(keywords)}&f_AL=true&sortBy=R"
                         final = base + params
                         self.logger.info(f"➡️ Acessando (fallback): {final}")
                         self.driver.get(final)
-                        self.safe_sleep(3)
+                        self.wait_for_page_ready(timeout=self.timeout)
                 except Exception:
                     self.logger.warning("⚠️ Não consegui garantir página de pesquisa - seguindo mesmo assim.")
 
-            self.safe_sleep(0.8)
+            # lista pronta = quantidade de cards parou de mudar
+            self.wait_for_element_count_stable("li[data-occludable-job-id], a[href*='/jobs/view/']", stable_ms=500, timeout=8)
 
-            # coletar vagas (preferindo coleta estruturada)
-            jobs = []
-            try:
-                if hasattr(self, "_collect_jobs_from_list"):
-                    jobs = self._collect_jobs_from_list(limit=limit_cards)
-                else:
-                    anchors = self.driver.find_elements(By.XPATH, "//a[contains(@href,'/jobs/view/')]")
-                    seen = set()
-                    for a in anchors:
-                        href = a.get_attribute("href") or ""
-                        if not href or "/jobs/view/" not in href:
-                            continue
-                        base = href.split("?")[0]
-                        if base in seen:
-                            continue
-                        seen.add(base)
-                        jobs.append({"url": base})
-                        if len(jobs) >= limit_cards:
-                            break
-            except Exception as e:
-                self.logger.warning(f"⚠️ Erro ao coletar lista de vagas: {e}")
-                self._dump_html("collect_jobs_error")
-
-            if not jobs:
-                self.logger.info("🔎 Nenhuma vaga encontrada na lista.")
+            if max_apply <= 0:
                 return applied
 
-            # Filtrar: aceitar somente vagas easy_apply = True (quando disponivel) e que não estejam already_applied
-            filtered = []
-            for j in jobs:
-                # se _collect_jobs_from_list já retornou estrutura rica
-                if isinstance(j, dict) and ("easy_apply" in j or "already_applied" in j):
-                    if j.get("already_applied"):
-                        continue
-                    # se easy_apply é falso/None — ainda assim vamos tentar abrir (pode haver botão no painel)
-                    filtered.append(j)
-                else:
-                    filtered.append(j)
-
-            self.logger.info(f"📝 {len(filtered)} vagas coletadas da lista (limit={limit_cards}).")
-            # iterar e aplicar
-            for idx, job in enumerate(filtered, start=1):
-                if applied >= max_apply:
-                    self.logger.info("🎯 Limite de candidaturas atingido.")
-                    break
-
-                try:
-                    job_url = job.get("url") if isinstance(job, dict) and job.get("url") else (job if isinstance(job, str) else None)
-                    self.logger.info(f"🧭 [{idx}/{len(filtered)}] Tentando aplicar:  |  | {job_url or '(card element)'}")
-
-                    ok = False
-                    # se tiver elemento 'el' (WebElement) tente abrir via elemento (mais rápido)
-                    if isinstance(job, dict) and job.get("el"):
-                        # cuidado com stale element: re-localizar pela job_id/href antes de passar
-                        try:
-                            job_el = job.get("el")
-                            job_id = job.get("job_id")
-                            if job_id:
-                                # re-encontrar elemento na lista para reduzir stale
-                                try:
-                                    re_el = self.driver.find_element(By.CSS_SELECTOR, f"li[data-occludable-job-id='{job_id}']")
-                                    job_el = re_el
-                                except Exception:
-                                    # fallback: procurar pelo href
-                                    try:
-                                        re_a = self.driver.find_element(By.XPATH, f"//a[contains(@href,'/jobs/view/{job_id}')]")
-                                        parent = re_a.find_element(By.XPATH, "./ancestor::li[1]")
-                                        job_el = parent or job_el
-                                    except Exception:
-                                        pass
-                            ok = self.open_and_process_job_card(job_el, idx)
-                        except StaleElementReferenceException:
-                            self.logger.warning("⚠️ StaleElementReference ao usar elemento; tentando por URL.")
-                            if job_url:
-                                ok = self.open_and_process_job_card(job_url, idx)
-                            else:
-                                ok = False
-                    else:
-                        # usar URL (string)
-                        if isinstance(job, dict) and job.get("url"):
-                            ok = self.open_and_process_job_card(job.get("url"), idx)
-                        elif isinstance(job, str):
-                            ok = self.open_and_process_job_card(job, idx)
-                        else:
-                            ok = False
-
-                    if ok:
+            # descoberta sob demanda: cada vaga é aplicada antes da próxima ser buscada
+            listings = self.iter_job_listings(max_pages=max_pages, limit_cards=limit_cards)
+            idx = 0
+            try:
+                for job in listings:
+                    self.checkpoint()
+                    if self._card_budget_exhausted(idx):
+                        break
+                    idx += 1
+                    if self._apply_to_listed_job(job, idx):
                         applied += 1
+                        self._remember_applied(job)
                         self.logger.info(f"✅ Aplicado ({applied}/{max_apply})")
                     else:
                         self.logger.info("⏭️ Não aplicado (pulando).")
 
-                    self.safe_sleep(random.uniform(1.0, 2.0))
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Erro ao processar vaga {job.get('url') if isinstance(job, dict) else job}: {e}")
-                    self._dump_html(f"process_job_error_{idx}")
-                    self.safe_sleep(0.5)
-                    continue
+                    # backpressure: atingido o limite, não pede mais vagas ao gerador
+                    if applied >= max_apply:
+                        self.logger.info("🎯 Limite de candidaturas atingido.")
+                        break
+                    self.pace("between_cards")
+            finally:
+                listings.close()
 
+            if idx == 0:
+                self.logger.info("🔎 Nenhuma vaga encontrada na lista.")
             self.logger.info(f"✅ Processamento finalizado | Total candidaturas efetuadas: {applied}")
             return applied
         except Exception as e:
@@ -439,7 +850,7 @@ class LinkedInFullFlow(BaseAutomation):
             pass
         try:
             self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", element)
-            time.sleep(0.3)
+            self.wait_for_dom_stable(quiet_ms=200, timeout=2)
             try:
                 element.click()
                 return True
@@ -469,6 +880,13 @@ class LinkedInFullFlow(BaseAutomation):
             "a[href*='/jobs/view/']"                # fallback definitivo
         ]
         try:
+            # 1 round trip: testa todos os seletores e a visibilidade no próprio navegador
+            if self.use_dom_snapshot:
+                sel, visible = find_visible_job_cards(self.driver, selectors)
+                if visible:
+                    self.logger.info(f"✅ Encontrados {len(visible)} cards com seletor '{sel}' (snapshot)")
+                    return visible
+
             for sel in selectors:
                 try:
                     els = self.driver.find_elements(By.CSS_SELECTOR, sel)
@@ -494,56 +912,77 @@ class LinkedInFullFlow(BaseAutomation):
             self.logger.warning(f"⚠️ Erro em find_job_cards: {e}")
         return job_cards
 
+    def build_filtered_jobs_url(
+        self,
+        keywords: str = "analista financeiro",
+        location: str = "Brasil",
+        easy_apply_only: bool = True,
+        distance: int = 25,
+        sort_by: str = "R",
+        start: int = 0
+    ) -> str:
+        """Monta a URL de busca de vagas no LinkedIn já com filtros aplicados."""
+        # GeoIdes usados comumente (ajuste/expanda conforme necessário)
+        geo_map = {
+            "brasil": ["1047466682", "104746682", "104746682"],    # variações comuns
+            "são paulo, sp": ["106057199", "104176396"],
+            "sao paulo": ["106057199", "104176396"],
+            "são paulo": ["106057199", "104176396"],
+            "sao paulo, sp": ["106057199", "104176396"],
+        }
+        # selecionar melhor match
+        geo_id = None
+        for k, vals in geo_map.items():
+            if k in location.lower():
+                geo_id = vals[0]
+                break
+        if not geo_id:
+            # tentar extrair geoId direto da url de location (se o usuário passou um geoId)
+            if isinstance(location, str) and location.isdigit():
+                geo_id = location
+            else:
+                # fallback para Brasil
+                geo_id = geo_map["brasil"][0]
+
+        base_url = f"{self.BASE_URL}/jobs/search/"
+        params = {
+            "keywords": keywords,
+            "geoId": geo_id,
+            "distance": distance,
+            # f_AL é o parâmetro que em algumas UIs indica 'Easy Apply' / Aplicações Internas
+            "f_AL": "true" if easy_apply_only else "false",
+            "origin": "JOB_SEARCH_PAGE_JOB_FILTER",
+            "refresh": "true",
+            "sortBy": sort_by,
+        }
+        if start:
+            params["start"] = start
+
+        from urllib.parse import urlencode
+        query = urlencode(params)
+        return f"{base_url}?{query}"
+
     def go_to_filtered_jobs(
         self,
         keywords: str = "analista financeiro",
         location: str = "Brasil",
         easy_apply_only: bool = True,
         distance: int = 25,
-        sort_by: str = "R"  # R = Relevância, DD = Data de publicação
+        sort_by: str = "R",  # R = Relevância, DD = Data de publicação
+        start: int = 0       # offset da paginação (25 vagas por página)
     ):
-        """Monta a URL de busca de vagas no LinkedIn já com filtros aplicados."""
+        """Abre a busca de vagas no LinkedIn já com filtros aplicados."""
         try:
-            # GeoIdes usados comumente (ajuste/expanda conforme necessário)
-            # dentro de go_to_filtered_jobs
-            geo_map = {
-                "brasil": ["1047466682", "104746682", "104746682"],    # variações comuns
-                "são paulo, sp": ["106057199", "104176396"],
-                "sao paulo": ["106057199", "104176396"],
-                "são paulo": ["106057199", "104176396"],
-                "sao paulo, sp": ["106057199", "104176396"],
-            }
-            # selecionar melhor match
-            geo_id = None
-            for k, vals in geo_map.items():
-                if k in location.lower():
-                    geo_id = vals[0]
-                    break
-            if not geo_id:
-                # tentar extrair geoId direto da url de location (se o usuário passou um geoId)
-                if isinstance(location, str) and location.isdigit():
-                    geo_id = location
-                else:
-                    # fallback para Brasil
-                    geo_id = geo_map["brasil"][0]
-
-            base_url = f"{self.BASE_URL}/jobs/search/"
-            params = {
-                "keywords": keywords,
-                "geoId": geo_id,
-                "distance": distance,
-                # f_AL é o parâmetro que em algumas UIs indica 'Easy Apply' / Aplicações Internas
-                "f_AL": "true" if easy_apply_only else "false",
-                "origin": "JOB_SEARCH_PAGE_JOB_FILTER",
-                "refresh": "true",
-                "sortBy": sort_by,
-            }
-
-            from urllib.parse import urlencode
-            query = urlencode(params)
-            final_url = f"{base_url}?{query}"
+            final_url = self.build_filtered_jobs_url(
+                keywords=keywords, location=location, easy_apply_only=easy_apply_only,
+                distance=distance, sort_by=sort_by, start=start
+            )
 
             self.logger.info(f"➡️ Acessando vagas filtradas: {final_url}")
+            # guardados para a paginação em iter_job_listings
+            self.search_keywords = keywords
+            self.search_location = location
+            self.search_easy_apply_only = easy_apply_only
             self.driver.get(final_url)
             # aguardar elementos da lista aparecerem (cards)
             try:
@@ -552,18 +991,19 @@ class LinkedInFullFlow(BaseAutomation):
                 )
             except TimeoutException:
                 self.logger.warning("⏳ Timeout aguardando lista de vagas após acessar URL filtrada.")
-            # dar um pequeno tempo extra para JS carregar cards
-            self.safe_sleep(2.0)
+            # em vez de sleep fixo: espera a lista de cards parar de crescer
+            self.wait_for_element_count_stable("li[data-occludable-job-id], a.base-card__full-link", stable_ms=600, timeout=8)
             self._snap("jobs_search_filtered")
             return True
         except Exception as e:
             self.logger.error(f"❌ Erro ao acessar vagas filtradas: {e}")
             return False
 
-    def open_and_process_job_card(self, anchor_el_or_url, idx: int) -> bool:
+    def open_and_process_job_card(self, anchor_el_or_url, idx: int, job: Optional[Dict[str, Any]] = None) -> bool:
         """
         Abre card/URL, localiza botão 'Easy Apply' / 'Candidatura simplificada' em múltiplos lugares,
         clica e delega para handle_application_modal(). Retorna True apenas se detectar confirmação.
+        `job` (dict da lista) recebe os detalhes lidos do painel (descrição, requisitos).
         """
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
@@ -580,25 +1020,24 @@ class LinkedInFullFlow(BaseAutomation):
                         if b.is_displayed():
                             try:
                                 self.driver.execute_script("arguments[0].click();", b)
-                                self.safe_sleep(0.15)
                             except Exception:
                                 pass
                 except Exception:
                     pass
 
         try:
+            self.checkpoint()
             _close_overlays()
             # abrir via url ou clicando no card
             if isinstance(anchor_el_or_url, str):
                 self.logger.info(f"🔗 ({idx}) Abrindo URL: {anchor_el_or_url}")
                 self.driver.get(anchor_el_or_url)
-                self.safe_sleep(1.2)
+                self.wait_for_page_ready(timeout=self.timeout)
             else:
                 card = anchor_el_or_url
                 try:
                     # clicar no card para abrir painel direito (se aplicável)
                     self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", card)
-                    self.safe_sleep(0.2)
                     try:
                         card.click()
                     except Exception:
@@ -606,10 +1045,15 @@ class LinkedInFullFlow(BaseAutomation):
                             self.driver.execute_script("arguments[0].click();", card)
                         except Exception:
                             pass
-                    self.safe_sleep(0.7)
+                    # painel de detalhes carregado = rede ociosa + DOM estável
+                    self.wait_for_network_idle(idle_ms=300, timeout=6, max_inflight=1)
+                    self.wait_for_dom_stable(quiet_ms=300, timeout=4)
                 except Exception:
                     pass
 
+            # painel aberto: descrição/requisitos/método vão para o cache (ou já estão nele)
+            self._record_job_detail(job, anchor_el_or_url if isinstance(anchor_el_or_url, str) else None)
+
             # buscar botão 'Easy Apply' / 'Candidatura simplificada' em várias localizações:
             apply_selectors = [
                 "#jobs-apply-button-id", # ID específico do botão de candidatura simplificada
@@ -673,7 +1117,7 @@ class LinkedInFullFlow(BaseAutomation):
                         self.driver.execute_script("arguments[0].click();", apply_btn)
                 else:
                     self.driver.execute_script("arguments[0].click();", apply_btn)
-                self.safe_sleep(0.8 + random.random() * 0.6)
+                # handle_application_modal espera o modal aparecer
             except Exception as e:
                 self.logger.warning(f"⚠️ Falha ao clicar apply_btn ({e})")
                 self._snap(f"apply_click_error_{idx}")
@@ -701,7 +1145,63 @@ class LinkedInFullFlow(BaseAutomation):
             self._dump_html(f"open_card_error_{idx}")
             return False
 
-    def _collect_jobs_from_list(self, limit: int = 30) -> List[Dict[str, Any]]:
+    def _collect_jobs_from_list_via_api(self, limit: int = 30) -> List[Dict[str, Any]]:
+        """
+        Monta a lista a partir das respostas JSON capturadas (JobApiCapture), na ordem
+        dos cards da página. Só devolve algo se a API cobriu todos os cards pedidos.
+        """
+        try:
+            pairs = self.driver.execute_script(
+                "return Array.from(document.querySelectorAll('li[data-occludable-job-id]'))"
+                ".map(li => [li.getAttribute('data-occludable-job-id'), li]);"
+            ) or []
+        except Exception:
+            pairs = []
+        cards = {str(job_id): el for job_id, el in pairs if job_id}
+        if not cards:
+            return []
+        wanted = list(cards.keys())[:limit]
+        jobs = self.get_captured_jobs(job_ids=wanted, limit=limit)
+        if len(jobs) < len(wanted):
+            self.logger.debug(f"API capturou {len(jobs)}/{len(wanted)} vagas da lista; usando DOM.")
+            return []
+        for job in jobs:
+            job["el"] = cards.get(job["job_id"])
+        self.logger.info(f"📝 {len(jobs)} vagas coletadas da lista via API JSON (limit={limit}).")
+        return jobs
+
+    def _collect_jobs_from_list(self, limit: int = 30, use_snapshot: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Coleta as vagas da lista. Primeiro tenta as respostas JSON da API já carregadas
+        pela página; depois o snapshot DOM (um único execute_script que devolve
+        job_id/url/título/empresa/local/easy_apply/already_applied de todos os cards);
+        se falhar ou vier vazio, cai no caminho antigo por elemento.
+        """
+        if self.job_api_capture:
+            jobs = self._collect_jobs_from_list_via_api(limit=limit)
+            if jobs:
+                return jobs
+        if use_snapshot is None:
+            use_snapshot = self.use_dom_snapshot
+        if use_snapshot:
+            cards = self.driver.find_elements(By.CSS_SELECTOR,
+                "li[data-occludable-job-id], ul.scaffold-layout__list-container li, ul.jobs-search__results-list li"
+            )
+            jobs = snapshot_job_cards(self.driver, cards, limit=limit)
+            if jobs:
+                for job in jobs:
+                    job.pop("visible", None)
+                    # completa com o que a API já trouxe (descrição, método de candidatura)
+                    captured = self.job_api_capture.get_job(job.get("job_id")) if self.job_api_capture else None
+                    for key, value in (captured or {}).items():
+                        if not job.get(key):
+                            job[key] = value
+                self.logger.info(f"📝 {len(jobs)} vagas coletadas da lista via snapshot (limit={limit}).")
+                return jobs
+            self.logger.debug("Snapshot da lista vazio; usando coleta por elemento.")
+        return self._collect_jobs_from_list_per_element(limit=limit)
+
+    def _collect_jobs_from_list_per_element(self, limit: int = 30) -> List[Dict[str, Any]]:
         jobs = []
         try:
             # Seletores de containers comuns
@@ -1009,7 +1509,7 @@ class LinkedInFullFlow(BaseAutomation):
                         Select(sel).select_by_visible_text(candidate.text)
                         # Disparar evento de mudança para garantir que o LinkedIn (React) reconheça a seleção
                         self.driver.execute_script("var event = new Event(\'change\', { bubbles: true }); arguments[0].dispatchEvent(event);", sel)
-                        self.safe_sleep(0.5) # Pequena pausa para o JS do LinkedIn processar a mudança
+                        self.wait_for_dom_stable(quiet_ms=200, timeout=2) # JS do LinkedIn processar a mudança
                         return True
                     except Exception as e:
                         self.logger.warning(f"⚠️ Falha ao selecionar opção no select nativo com Select: {e}")
@@ -1018,7 +1518,7 @@ class LinkedInFullFlow(BaseAutomation):
                             candidate.click()
                             # Disparar evento de mudança para garantir que o LinkedIn (React) reconheça a seleção
                             self.driver.execute_script("var event = new Event(\'change\', { bubbles: true }); arguments[0].dispatchEvent(event);", sel)
-                            self.safe_sleep(0.5) # Pequena pausa para o JS do LinkedIn processar a mudança
+                            self.wait_for_dom_stable(quiet_ms=200, timeout=2) # JS do LinkedIn processar a mudança
                             return True
                         except Exception:
                             self.logger.warning(f"⚠️ Falha ao clicar na opção do select nativo: {e}")
@@ -1039,7 +1539,7 @@ class LinkedInFullFlow(BaseAutomation):
                 # abrir
                 if not _safe_click(toggle_el):
                     return False
-                time.sleep(0.18)
+                self.wait_for_dom_stable(quiet_ms=150, timeout=2)
                 # procurar menu (após abrir)
                 menu_candidates = []
                 # role=option/listbox
@@ -1121,12 +1621,12 @@ class LinkedInFullFlow(BaseAutomation):
                             btn_save = b
                     if btn_discard and not save_on_discard:
                         _safe_click(btn_discard)
-                        time.sleep(0.4)
+                        self.wait_for_dom_stable(quiet_ms=200, timeout=3)
                         self.logger.info("ℹ️ Popup 'Salvar esta candidatura' -> descartei.")
                         return "discarded"
                     if btn_save and save_on_discard:
                         _safe_click(btn_save)
-                        time.sleep(0.6)
+                        self.wait_for_dom_stable(quiet_ms=200, timeout=3)
                         self.logger.info("ℹ️ Popup 'Salvar esta candidatura' -> salvei.")
                         return "saved"
                     # fallback: fechar
@@ -1137,7 +1637,7 @@ class LinkedInFullFlow(BaseAutomation):
                         close = None
                     if close:
                         _safe_click(close)
-                        time.sleep(0.3)
+                        self.wait_for_dom_stable(quiet_ms=200, timeout=3)
                         return "closed"
             except Exception:
                 pass
@@ -1166,9 +1666,11 @@ class LinkedInFullFlow(BaseAutomation):
 
             steps = 0
             last_progress = time.time()
+            step_signature = self.waits.modal_signature()
             while steps < max_steps:
+                # cancelamento / prazo da vaga: no máximo um passo do modal depois do pedido
+                self.checkpoint()
                 steps += 1
-                time.sleep(0.25)  # respira um pouco
 
                 # dialog = _find_modal_container() or dialog  # atualizar referência - já atualizado pelo wait
                 progressed = False
@@ -1186,7 +1688,6 @@ class LinkedInFullFlow(BaseAutomation):
                                 self.logger.debug(f"📝 select preenchido (nativo) label='{lbl[:60]}'")
                                 # Disparar evento de mudança para garantir que o LinkedIn (React) reconheça a seleção
                                 self.driver.execute_script("var event = new Event('change', { bubbles: true }); arguments[0].dispatchEvent(event);", s)
-                                self.safe_sleep(0.5)  # Pequena pausa para o JS do LinkedIn processar
                         except Exception as e_select:
                             self.logger.warning(f"⚠️ Erro menor ao processar um select: {e_select}")
                             continue
@@ -1327,7 +1828,6 @@ class LinkedInFullFlow(BaseAutomation):
                 popup = handle_save_popup_if_present()
                 if popup == "discarded":
                     # pop-up descartado -> continuar loop (modal ainda aberto)
-                    time.sleep(0.4)
                     continue
                 if popup == "saved":
                     # salvou em vez de enviar -> aborta vaga
@@ -1348,7 +1848,6 @@ class LinkedInFullFlow(BaseAutomation):
                                 if cand in txt:
                                     if _safe_click(b):
                                         clicked_next = True
-                                        time.sleep(0.6)
                                         last_progress = time.time()
                                         self.logger.debug(f"🖱️ Cliquei botão '{txt[:40]}' no modal")
                                         break
@@ -1364,7 +1863,6 @@ class LinkedInFullFlow(BaseAutomation):
                                 if b and b.is_displayed():
                                     if _safe_click(b):
                                         clicked_next = True
-                                        time.sleep(0.6)
                                         last_progress = time.time()
                                         break
                             except Exception:
@@ -1372,6 +1870,14 @@ class LinkedInFullFlow(BaseAutomation):
                 except Exception:
                     pass
 
+                # espera o modal trocar de passo (ou validação aparecer) em vez de sleep fixo
+                if clicked_next:
+                    new_signature = self.wait_for_modal_step_change(step_signature, timeout=6)
+                    if new_signature:
+                        step_signature = new_signature
+                    else:
+                        self.wait_for_dom_stable(quiet_ms=250, timeout=2)
+
                 # 7) detectar confirmação final (texto na página / modal de confirmação)
                 try:
                     body_text = (self.driver.find_element(By.TAG_NAME, "body").text or "").lower()
@@ -1398,7 +1904,9 @@ class LinkedInFullFlow(BaseAutomation):
                                 txt = (b.text or "").strip().lower()
                                 if any(k in txt for k in ["enviar", "submit", "done", "concluído", "concluido"]):
                                     if _safe_click(b):
-                                        time.sleep(0.8)
+                                        new_signature = self.wait_for_modal_step_change(step_signature, timeout=6)
+                                        if new_signature:
+                                            step_signature = new_signature
                                         last_progress = time.time()
                                         progressed = True
                                         break
@@ -1420,8 +1928,8 @@ class LinkedInFullFlow(BaseAutomation):
                         pass
                     return False
 
-                # pequena pausa antes de próxima iteração
-                time.sleep(0.4)
+                # próxima iteração só depois do modal assentar
+                self.wait_for_dom_stable(quiet_ms=200, timeout=2)
 
             # max_steps esgotado sem confirmação
             self.logger.info("⚠️ Max steps atingidos no modal; envio não detectado. Salvando debug.")
@@ -1490,7 +1998,7 @@ class LinkedInFullFlow(BaseAutomation):
                         self.driver.execute_script("arguments[0].click();", link)
                     except Exception:
                         pass
-                self.safe_sleep(0.8)
+                self.wait_for_dom_stable(quiet_ms=300, timeout=4)
                 # procurar no painel direito
                 panel_btns = self.driver.find_elements(By.XPATH,
                     "//button[contains(normalize-space(.),'Candidatura simplificada') or contains(normalize-space(.),'Easy Apply') or contains(normalize-space(.),'Candidatar-se') or contains(@data-control-name,'apply')]"
@@ -1535,7 +2043,7 @@ class LinkedInFullFlow(BaseAutomation):
         """Abre a vaga e tenta aplicar via 'Easy Apply' / 'Candidatura simplificada'."""
         try:
             self.driver.get(job_url)
-            self.safe_sleep(2)
+            self.wait_for_page_ready(timeout=self.timeout)
             self._snap("10_open_job")
 
             # Scroll pra garantir carregamento do botão
@@ -1553,7 +2061,7 @@ class LinkedInFullFlow(BaseAutomation):
                 btns[0].click()
             except ElementClickInterceptedException:
                 self.driver.execute_script("arguments[0].click();", btns[0])
-            self.safe_sleep(2)
+            self.wait_for_modal_step_change("closed", timeout=8)
             self._snap("11_easy_apply_clicked")
 
             # Modal de perguntas
@@ -1567,7 +2075,7 @@ class LinkedInFullFlow(BaseAutomation):
                     try:
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", sel)
                         sel.click()
-                        time.sleep(0.5)
+                        self.wait_for_dom_stable(quiet_ms=150, timeout=2)
                         # tenta marcar "Sim/Yes" se existir, senão pega a 1ª opção válida
                         opts = sel.find_elements(By.TAG_NAME, "option")
                         chosen = None
@@ -1595,18 +2103,19 @@ class LinkedInFullFlow(BaseAutomation):
                         pass
 
                 # tenta avançar / revisar / enviar
+                signature = self.waits.modal_signature()
                 if self.wait_and_click(By.XPATH, "//button[contains(., 'Avançar') or contains(., 'Next')]"):
                     progressed = True
-                    self.safe_sleep(1)
+                    self.wait_for_modal_step_change(signature)
                     continue
 
                 if self.wait_and_click(By.XPATH, "//button[contains(., 'Revisar') or contains(., 'Review')]"):
                     progressed = True
-                    self.safe_sleep(1)
+                    signature = self.wait_for_modal_step_change(signature) or signature
 
                 # enviar candidatura
                 if self.wait_and_click(By.XPATH, "//button[contains(., 'Enviar candidatura') or contains(., 'Submit application')]"):
-                    self.safe_sleep(2)
+                    self.wait_for_modal_step_change(signature, timeout=10)
                     self._snap("12_application_submitted")
                     # fecha modal
                     self.wait_and_click(By.XPATH, "//button[contains(., 'Concluído') or contains(., 'Done') or @aria-label='Fechar']")
@@ -1730,16 +2239,29 @@ class LinkedInFullFlow(BaseAutomation):
 
     # -------------------------- Orquestração --------------------------
 
-    def start_full_automation(self, username, password, job_types, max_applications=10, session_id=None):
+    def start_full_automation(self, username, password, job_types, max_applications=10, session_id=None, max_pages=3,
+                              cancel_token=None, run_timeout=None, job_timeout=None,
+                              resume_profile=None, relevance_threshold=None, max_cards=None):
+        """
+        Login, busca e candidaturas. `cancel_token` (opcional) substitui o token do bot;
+        `run_timeout` é o prazo (s) da execução inteira e `job_timeout` o de cada vaga.
+        Cancelado ou sem prazo, devolve o que já foi aplicado com status 'cancelled'/'timeout'.
+        `resume_profile` (análise do ResumeAnalyzer), `relevance_threshold` e `max_cards`
+        (top-K; padrão max_applications * CARDS_PER_APPLICATION) controlam quais cards são abertos.
+        """
+        if cancel_token is not None:
+            self.use_cancel_token(cancel_token)
+        self.cancel_token.start_run(run_timeout, job_timeout)
         try:
             self.logger.info("🚀 Iniciando automação completa do LinkedIn")
 
             # 1) Login
             if not self.login(username, password):
-                return {"status": "error", "message": "Falha no login"}
+                return {"status": "error", "success": False, "message": "Falha no login", "error": "Falha no login"}
 
             # 2) Tentar acessar diretamente a página de vagas filtradas (mais rápido/robusto)
-            term = (job_types or ["analista financeiro"])[0]
+            terms = job_types or ["analista financeiro"]
+            term = terms[0]
             # tenta acessar URL filtrada já no início (favorecer Easy Apply)
             if not self.go_to_filtered_jobs(
                 keywords=term,
@@ -1750,7 +2272,8 @@ class LinkedInFullFlow(BaseAutomation):
             ):
                 self.logger.warning("⚠️ Falha ao abrir vagas filtradas diretamente; tentando abrir a página de vagas padrão.")
                 if not self.go_to_jobs_page():
-                    return {"status": "error", "message": "Falha ao abrir página de vagas"}
+                    return {"status": "error", "success": False, "message": "Falha ao abrir página de vagas",
+                            "error": "Falha ao abrir página de vagas"}
 
             # 3) Pequena espera para garantir lista renderizada
             try:
@@ -1758,16 +2281,51 @@ class LinkedInFullFlow(BaseAutomation):
                     lambda d: d.find_elements(By.CSS_SELECTOR, "li[data-occludable-job-id]") or d.find_elements(By.CSS_SELECTOR, "a.base-card__full-link")
                 )
             except TimeoutException:
-                self.safe_sleep(2.0)
-
-            # 4) Iterar lista e aplicar em “Candidatura simplificada” (limite e filtro interno)
-            applied_count = self.process_job_listings(max_apply=max_applications)
-            return {"status": "success", "results": f"Candidaturas efetuadas: {applied_count}"}
-
+                self.wait_for_page_ready(timeout=5)
+
+            # 4) Iterar lista e aplicar em “Candidatura simplificada” (limite e filtro interno),
+            #    abrindo só as vagas relevantes, da melhor para a pior
+            self.configure_relevance(terms, profile=resume_profile, threshold=relevance_threshold,
+                                     max_cards=max_cards or max_applications * self.CARDS_PER_APPLICATION)
+            if len(terms) > 1:
+                # todos os tipos selecionados na mesma sessão, cada busca em sua aba
+                applied_count = self.process_search_queries(terms, max_apply=max_applications, max_pages=max_pages)
+            else:
+                applied_count = self.process_job_listings(max_apply=max_applications, max_pages=max_pages)
+            result = {
+                "status": {"cancelled": "cancelled", "deadline": "timeout"}.get(self.cancel_token.reason, "success"),
+                "success": True,
+                "results": f"Candidaturas efetuadas: {applied_count}",
+                "applications_sent": applied_count,
+                "applied_jobs": self.applied_jobs,
+                "session_id": session_id
+            }
+            blocking = self.get_request_blocking_stats()
+            if blocking:
+                self.logger.info(
+                    f"🚫 Bloqueio de recursos: {blocking['blocked_requests']} requisições evitadas "
+                    f"(~{blocking['estimated_bytes_saved'] / 1024:.0f} KB)."
+                )
+                result["request_blocking"] = blocking
+            return result
+
+        except AutomationCancelled as e:
+            status = "timeout" if e.reason == "deadline" else "cancelled"
+            self.logger.info(f"🛑 Automação interrompida ({e.reason}); {len(self.applied_jobs)} candidaturas efetuadas.")
+            return {
+                "status": status,
+                "success": True,
+                "results": f"Candidaturas efetuadas: {len(self.applied_jobs)}",
+                "applications_sent": len(self.applied_jobs),
+                "applied_jobs": self.applied_jobs,
+                "session_id": session_id,
+                "stopped_reason": e.reason
+            }
         except Exception as e:
             self.logger.error(f"💥 Erro crítico na automação: {e}")
-            return {"status": "error", "message": str(e)}
+            return {"status": "error", "success": False, "message": str(e), "error": str(e)}
         finally:
+            # libera o navegador (devolve ao pool) assim que a execução termina ou é cancelada
             self.close_driver()
 
     # se em algum ponto chamam flow.close(), ofereça esse alias:
@@ -1789,8 +2347,8 @@ class LinkedInFullFlow(BaseAutomation):
         **kwargs
     ) -> Dict[str, Any]:
         """
-        Mantido por compatibilidade. Encaminha para start_full_automation.
-        Ignora max_pages (o LinkedIn carrega infinitamente e a UI muda; usamos coleta limitada).
+        Mantido por compatibilidade. Encaminha para start_full_automation
+        (max_pages limita quantas páginas da busca o gerador de vagas pode abrir).
         Aceita **kwargs para não quebrar chamadas antigas com nomes diferentes.
         """
         # aceita também 'max_applications' no kwargs para não estourar erro de assinatura
@@ -1802,7 +2360,8 @@ class LinkedInFullFlow(BaseAutomation):
             password=password or "",
             job_types=job_types or [],
             max_applications=apply_limit,
-            session_id=session_id
+            session_id=session_id,
+            max_pages=max_pages
         )
 
 
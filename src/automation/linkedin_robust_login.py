@@ -12,6 +12,7 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from src.automation.job_card_snapshot import extract_job_info_snapshot
 
 class LinkedInRobustLogin:
     def __init__(self, headless=False, user_data_dir=None, profile_name="Default"):
@@ -788,6 +789,11 @@ class LinkedInRobustLogin:
         try:
             job_info = {}
             
+            # Snapshot do card em um único execute_script; fallback para o caminho por elemento
+            snapshot_info = extract_job_info_snapshot(self.driver, job_card)
+            if snapshot_info:
+                return snapshot_info
+                
             # Título da vaga
             title_selectors = [
                 ".job-search-card__title a",
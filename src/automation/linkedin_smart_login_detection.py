@@ -12,6 +12,7 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from src.automation.job_card_snapshot import extract_job_info_snapshot
 
 class LinkedInSmartLoginDetection:
     def __init__(self, headless=False):
@@ -686,6 +687,11 @@ class LinkedInSmartLoginDetection:
         try:
             job_info = {}
             
+            # Snapshot do card em um único execute_script; fallback para o caminho por elemento
+            snapshot_info = extract_job_info_snapshot(self.driver, job_card)
+            if snapshot_info:
+                return snapshot_info
+                
             # Título da vaga
             title_selectors = [
                 ".job-search-card__title a",
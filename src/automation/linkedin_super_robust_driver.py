@@ -12,10 +12,14 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from src.automation.browser_pool import get_browser_pool
+from src.automation.job_card_snapshot import extract_job_info_snapshot
 
 class LinkedInSuperRobustDriver:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, use_pool=False):
         self.headless = headless
+        self.use_pool = use_pool
+        self.browser_lease = None
         self.driver = None
         self.wait = None
         self.applied_jobs = []
@@ -61,6 +65,8 @@ class LinkedInSuperRobustDriver:
         
     def setup_driver(self):
         """Configura o driver do Chrome com opções robustas"""
+        if self.use_pool:
+            return self.lease_driver_from_pool()
         try:
             self.detailed_log("=== ETAPA 1: CONFIGURANDO DRIVER DO CHROME (ROBUSTO) ===", "SUCCESS")
             
@@ -758,6 +764,11 @@ class LinkedInSuperRobustDriver:
         try:
             job_info = {}
             
+            # Snapshot do card em um único execute_script; fallback para o caminho por elemento
+            snapshot_info = extract_job_info_snapshot(self.driver, job_card)
+            if snapshot_info:
+                return snapshot_info
+                
             # Título da vaga
             title_selectors = [
                 ".job-search-card__title a",
@@ -1237,10 +1248,27 @@ class LinkedInSuperRobustDriver:
             self.take_debug_screenshot("automation_error")
             return {"success": False, "error": str(e)}
             
+    def lease_driver_from_pool(self):
+        """Pega um navegador já aquecido do BrowserPool do processo"""
+        try:
+            self.browser_lease = get_browser_pool().acquire(headless=self.headless)
+            self.driver = self.browser_lease.driver
+            self.wait = WebDriverWait(self.driver, 15)
+            self.detailed_log(f"♻️ Navegador emprestado do pool (slot {self.browser_lease.slot})")
+            return True
+        except Exception as e:
+            self.detailed_log(f"❌ Erro ao obter navegador do pool: {str(e)}", "ERROR")
+            return False
+            
     def close(self):
-        """Fecha o navegador"""
+        """Fecha o navegador (ou devolve ao pool)"""
         try:
-            if self.driver:
+            if self.driver and self.browser_lease:
+                get_browser_pool().release(self.browser_lease)
+                self.browser_lease = None
+                self.driver = None
+                self.detailed_log("Navegador devolvido ao pool")
+            elif self.driver:
                 self.driver.quit()
                 self.detailed_log("Navegador fechado")
         except Exception as e:
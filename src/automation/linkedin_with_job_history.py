@@ -1,5 +1,4 @@
 import time
-import random
 import logging
 import os
 import json
@@ -15,15 +14,25 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from src.models.application_history import ApplicationHistory, db
+from src.models.application_recorder import get_application_recorder
+from src.automation.job_card_snapshot import extract_job_info_snapshot, snapshot_job_cards
+from src.automation.cancellation import AutomationCancelled, CancellationToken, JobDeadlineExceeded
+from src.automation.wait_engine import RatePolicy, WaitEngine
 
 class LinkedInWithJobHistory:
     def __init__(self, headless=False):
         self.headless = headless
         self.driver = None
         self.wait = None
+        self.waits = None
         self.applied_jobs = []
         self.failed_applications = []
         self.setup_logging()
+        # cancelamento (/api/stop) + prazos; checado em cada espera, card e passo do modal
+        self.cancel_token = CancellationToken()
+        # digitação no ritmo que este fluxo já usava (0.05-0.15s por caractere)
+        self.rate_policy = RatePolicy(logger=self.logger, keystroke=(0.05, 0.15))
+        self.rate_policy.token = self.cancel_token
         
         # URLs baseadas no teste em tempo real
         self.login_url = "https://www.linkedin.com/checkpoint/lg/sign-in-another-account"
@@ -48,6 +57,12 @@ class LinkedInWithJobHistory:
         self.logger.info(formatted_message)
         print(formatted_message)
         
+    def human_type(self, element, text):
+        """Digita caractere a caractere no ritmo da RatePolicy (interrompível pelo cancelamento)"""
+        for char in text:
+            element.send_keys(char)
+            self.rate_policy.pace("keystroke")
+            
     def take_debug_screenshot(self, step_name):
         """Tira screenshot para debug com nome descritivo"""
         try:
@@ -91,6 +106,9 @@ class LinkedInWithJobHistory:
             chrome_options.add_argument("--disable-session-crashed-bubble")
             chrome_options.add_argument("--disable-infobars")
             chrome_options.add_argument("--disable-notifications")
+
+            # eventos CDP no log 'performance' (WaitEngine.network_idle)
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
             chrome_options.add_argument("--window-size=1920,1080")
             
             # User agent realista
@@ -111,6 +129,8 @@ class LinkedInWithJobHistory:
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             self.wait = WebDriverWait(self.driver, 15)
+            self.waits = WaitEngine(self.driver, self.logger)
+            self.waits.token = self.cancel_token
             
             # Screenshot inicial
             self.take_debug_screenshot("driver_setup_success")
@@ -130,7 +150,7 @@ class LinkedInWithJobHistory:
             self.driver.get(self.login_url)
             
             self.detailed_log("Aguardando carregamento da página de login...")
-            time.sleep(5)
+            self.waits.page_ready(timeout=15)
             
             current_url = self.driver.current_url
             page_title = self.driver.title
@@ -192,12 +212,10 @@ class LinkedInWithJobHistory:
             # Preenche email
             self.detailed_log(f"Preenchendo email: {username}")
             email_field.clear()
-            time.sleep(1)
+            self.rate_policy.pace("between_actions")
             
             # Digita email de forma humana
-            for char in username:
-                email_field.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.15))
+            self.human_type(email_field, username)
                 
             self.detailed_log("✅ Email preenchido com sucesso")
             
@@ -236,12 +254,10 @@ class LinkedInWithJobHistory:
             # Preenche senha
             self.detailed_log("Preenchendo senha...")
             password_field.clear()
-            time.sleep(1)
+            self.rate_policy.pace("between_actions")
             
             # Digita senha de forma humana
-            for char in password:
-                password_field.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.15))
+            self.human_type(password_field, password)
                 
             self.detailed_log("✅ Senha preenchida com sucesso")
             
@@ -298,10 +314,12 @@ class LinkedInWithJobHistory:
                 
             # Clica no botão de login
             self.detailed_log("Clicando no botão de login...")
+            previous_url = self.driver.current_url
             login_button.click()
             
             self.detailed_log("Aguardando resposta do servidor...")
-            time.sleep(8)  # Aguarda mais tempo para processar login
+            self.waits.url_changed(previous_url, timeout=20)
+            self.waits.page_ready(timeout=15)
             
             current_url = self.driver.current_url
             page_title = self.driver.title
@@ -407,8 +425,8 @@ class LinkedInWithJobHistory:
                     
                     return True
                     
-                # Aguarda 10 segundos antes de verificar novamente
-                time.sleep(10)
+                # Aguarda 10 segundos antes de verificar novamente (acorda no /api/stop)
+                self.cancel_token.sleep(10)
                 remaining_time = timeout_seconds - (time.time() - start_time)
                 self.detailed_log(f"Aguardando verificação manual... {remaining_time/60:.1f} min restantes")
                 
@@ -428,7 +446,7 @@ class LinkedInWithJobHistory:
             self.driver.get(self.jobs_home_url)
             
             self.detailed_log("Aguardando carregamento da página de vagas...")
-            time.sleep(8)  # Aguarda mais tempo para carregamento completo
+            self.waits.page_ready(timeout=20)
             
             current_url = self.driver.current_url
             page_title = self.driver.title
@@ -462,12 +480,12 @@ class LinkedInWithJobHistory:
             
             # Aguarda carregamento completo da página
             self.detailed_log("Aguardando carregamento completo da página...")
-            time.sleep(5)
+            self.waits.page_ready(timeout=15)
             
             # Rola a página para baixo para carregar conteúdo dinâmico
             self.detailed_log("Rolando página para carregar conteúdo dinâmico...")
             self.driver.execute_script("window.scrollTo(0, 500);")
-            time.sleep(3)
+            self.waits.dom_stable(quiet_ms=400, timeout=5)
             
             # Screenshot antes de procurar o botão
             self.take_debug_screenshot("before_show_all_search")
@@ -560,10 +578,11 @@ class LinkedInWithJobHistory:
             # Rola até o elemento para garantir que está visível
             self.detailed_log("Rolando até o elemento...")
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", show_all_element)
-            time.sleep(2)
+            self.waits.dom_stable(quiet_ms=300, timeout=3)
             
             # Tenta clicar no elemento
             self.detailed_log("Clicando no botão 'Exibir todas'...")
+            previous_url = self.driver.current_url
             
             try:
                 # Tenta clique normal primeiro
@@ -577,7 +596,8 @@ class LinkedInWithJobHistory:
             
             # Aguarda navegação
             self.detailed_log("Aguardando navegação...")
-            time.sleep(8)
+            self.waits.url_changed(previous_url, timeout=10)
+            self.waits.page_ready(timeout=15)
             
             current_url = self.driver.current_url
             self.detailed_log(f"URL após clicar: {current_url}")
@@ -610,7 +630,8 @@ class LinkedInWithJobHistory:
             self.driver.get(self.recommended_jobs_url)
             
             self.detailed_log("Aguardando carregamento...")
-            time.sleep(8)
+            self.waits.page_ready(timeout=20)
+            self.waits.element_count_stable("li[data-occludable-job-id], .job-card-container", timeout=10)
             
             current_url = self.driver.current_url
             self.detailed_log(f"URL após navegação direta: {current_url}")
@@ -642,12 +663,14 @@ class LinkedInWithJobHistory:
             
             # Aguarda carregamento completo
             self.detailed_log("Aguardando carregamento completo da página de vagas...")
-            time.sleep(5)
+            self.waits.page_ready(timeout=15)
             
             # Rola a página para carregar vagas
             self.detailed_log("Rolando página para carregar vagas...")
             self.driver.execute_script("window.scrollTo(0, 800);")
-            time.sleep(3)
+            self.waits.element_count_stable(
+                ".job-search-card, .jobs-search-results__list-item, li[data-occludable-job-id]", stable_ms=600, timeout=8
+            )
             
             # Screenshot da página de vagas
             self.take_debug_screenshot("jobs_page_ready")
@@ -696,8 +719,19 @@ class LinkedInWithJobHistory:
             # Screenshot dos cards encontrados
             self.take_debug_screenshot("job_cards_found")
             
+            # Verifica duplicadas da página inteira de uma vez (cache + uma consulta)
+            page_duplicates = {}
+            checked_ids = set()
+            try:
+                checked_ids = {s.get('job_id') for s in snapshot_job_cards(self.driver, job_cards, limit=len(job_cards)) if s.get('job_id')}
+                page_duplicates = ApplicationHistory.check_duplicates_batch(checked_ids, days=30)
+                self.detailed_log(f"{len(page_duplicates)}/{len(checked_ids)} vagas da página já aplicadas")
+            except Exception as e:
+                self.detailed_log(f"Verificação em lote de duplicadas falhou: {str(e)}", "WARNING")
+            
             # Processa cada card
             for i, card in enumerate(job_cards):
+                self.cancel_token.check()
                 if applications_sent >= max_applications:
                     self.detailed_log(f"Limite de aplicações atingido: {applications_sent}/{max_applications}")
                     break
@@ -715,14 +749,18 @@ class LinkedInWithJobHistory:
                     self.detailed_log(f"Vaga encontrada: {job_info['title']} - {job_info['company']}")
                     
                     # Verifica se já foi aplicada recentemente
-                    duplicate = ApplicationHistory.check_duplicate_application(
-                        job_info.get('job_id'), 
-                        job_info.get('url'), 
-                        days=30
-                    )
+                    if job_info.get('job_id') in checked_ids:
+                        duplicate_at = page_duplicates.get(job_info.get('job_id'))
+                    else:
+                        duplicate = ApplicationHistory.check_duplicate_application(
+                            job_info.get('job_id'), 
+                            job_info.get('url'), 
+                            days=30
+                        )
+                        duplicate_at = duplicate.attempted_at if duplicate else None
                     
-                    if duplicate:
-                        self.detailed_log(f"⚠️ Vaga já aplicada em {duplicate.attempted_at.strftime('%d/%m/%Y')}", "WARNING")
+                    if duplicate_at:
+                        self.detailed_log(f"⚠️ Vaga já aplicada em {duplicate_at.strftime('%d/%m/%Y')}", "WARNING")
                         continue
                     
                     # Verifica se é relevante
@@ -731,16 +769,27 @@ class LinkedInWithJobHistory:
                         
                         # Cria registro no banco de dados
                         job_info['job_type'] = self.determine_job_type(job_info['title'], job_types)
-                        application_record = ApplicationHistory.create_application_record(
+                        # enfileirado no write-behind: gravado em lote, sem commit no meio do fluxo
+                        application_record = get_application_recorder().create(
                             job_info, 
                             status='pending', 
                             session_id=self.session_id
                         )
                         
-                        self.detailed_log(f"📝 Registro criado no banco: ID {application_record.id}")
+                        self.detailed_log(f"📝 Registro de candidatura enfileirado: {application_record.ref[:8]}")
                         
-                        # Tenta aplicar
-                        if self.apply_to_job(card, job_info, i+1, application_record):
+                        # Tenta aplicar (dentro do prazo por vaga)
+                        try:
+                            with self.cancel_token.job_scope():
+                                applied = self.apply_to_job(card, job_info, i+1, application_record)
+                        except JobDeadlineExceeded:
+                            self.detailed_log(f"⏰ Prazo da vaga esgotado ({self.cancel_token.job_timeout}s)", "WARNING")
+                            applied = False
+                        except AutomationCancelled as e:
+                            # o registro não pode ficar 'pending' para sempre
+                            application_record.update_status('failed', error_message=f"Automação interrompida ({e.reason})")
+                            raise
+                        if applied:
                             applications_sent += 1
                             job_info['status'] = 'applied'
                             self.applied_jobs.append(job_info)
@@ -752,9 +801,9 @@ class LinkedInWithJobHistory:
                             
                             # Delay entre aplicações
                             if applications_sent < max_applications:
-                                delay_time = random.uniform(15, 25)
+                                delay_time = self.rate_policy.delay("between_applications")
                                 self.detailed_log(f"Aguardando {delay_time:.1f}s antes da próxima aplicação...")
-                                time.sleep(delay_time)
+                                self.cancel_token.sleep(delay_time)
                         else:
                             job_info['status'] = 'failed'
                             self.failed_applications.append(job_info)
@@ -769,13 +818,14 @@ class LinkedInWithJobHistory:
                         self.detailed_log(f"Vaga não relevante: {job_info['title']}")
                     
                     # Delay entre análises
-                    time.sleep(random.uniform(2, 4))
+                    self.rate_policy.pace("between_analyses")
                     
                 except Exception as e:
                     self.detailed_log(f"Erro ao processar vaga {i+1}: {str(e)}", "WARNING")
                     continue
             
-            # Relatório final
+            # Relatório final (antes, grava o que ainda está na fila do write-behind)
+            get_application_recorder().flush()
             self.detailed_log("=== RELATÓRIO FINAL DE APLICAÇÕES ===", "SUCCESS")
             self.detailed_log(f"📊 Vagas analisadas: {len(job_cards)}")
             self.detailed_log(f"🎯 Vagas relevantes encontradas: {len(jobs_found)}")
@@ -805,6 +855,11 @@ class LinkedInWithJobHistory:
         try:
             job_info = {}
             
+            # Snapshot do card em um único execute_script; fallback para o caminho por elemento
+            snapshot_info = extract_job_info_snapshot(self.driver, job_card)
+            if snapshot_info:
+                return snapshot_info
+                
             # Título da vaga
             title_selectors = [
                 ".job-search-card__title a",
@@ -966,7 +1021,7 @@ class LinkedInWithJobHistory:
             easy_apply_button.click()
             
             self.detailed_log("Aguardando abertura do modal de candidatura...")
-            time.sleep(5)
+            self.waits.modal_step_changed("closed", timeout=10)
             
             # Screenshot do modal
             modal_screenshot = self.take_debug_screenshot(f"application_modal_job_{card_number}")
@@ -993,6 +1048,7 @@ class LinkedInWithJobHistory:
             questions_answered = []
             
             while current_step < max_steps:
+                self.cancel_token.check()
                 current_step += 1
                 self.detailed_log(f"--- Etapa do modal {current_step}/{max_steps} ---")
                 
@@ -1004,7 +1060,7 @@ class LinkedInWithJobHistory:
                 if step_questions:
                     questions_answered.extend(step_questions)
                     self.detailed_log("Perguntas respondidas, aguardando...")
-                    time.sleep(3)
+                    self.waits.dom_stable(quiet_ms=300, timeout=3, root_selector="div[role='dialog']")
                 
                 # Procura botão "Avançar" ou "Revisar"
                 next_button_selectors = [
@@ -1035,8 +1091,9 @@ class LinkedInWithJobHistory:
                         
                 if next_button:
                     self.detailed_log("Clicando em 'Avançar'...")
+                    signature = self.waits.modal_signature()
                     next_button.click()
-                    time.sleep(4)
+                    self.waits.modal_step_changed(signature, timeout=8)
                 else:
                     # Procura botão "Enviar candidatura"
                     submit_button_selectors = [
@@ -1066,8 +1123,9 @@ class LinkedInWithJobHistory:
                             
                     if submit_button:
                         self.detailed_log("Enviando candidatura...")
+                        signature = self.waits.modal_signature()
                         submit_button.click()
-                        time.sleep(5)
+                        self.waits.modal_step_changed(signature, timeout=10)
                         
                         # Screenshot após enviar
                         final_screenshot = self.take_debug_screenshot(f"after_submit_job_{card_number}")
@@ -1180,7 +1238,7 @@ class LinkedInWithJobHistory:
             if options:
                 options[0].click()
                 self.detailed_log("✅ Pergunta sim/não respondida")
-                time.sleep(2)
+                self.rate_policy.pace("between_actions")
                 return True
                 
         except Exception as e:
@@ -1194,15 +1252,13 @@ class LinkedInWithJobHistory:
             input_field = parent.find_element(By.CSS_SELECTOR, "input[type='text'], input[type='number']")
             
             input_field.clear()
-            time.sleep(1)
+            self.rate_policy.pace("between_actions")
             
             # Digita salário
-            for char in salary:
-                input_field.send_keys(char)
-                time.sleep(random.uniform(0.05, 0.1))
+            self.human_type(input_field, salary)
                 
             self.detailed_log("✅ Pergunta sobre salário respondida")
-            time.sleep(2)
+            self.rate_policy.pace("between_actions")
             return True
             
         except Exception as e:
@@ -1223,19 +1279,17 @@ class LinkedInWithJobHistory:
                 if options:
                     options[0].click()
                     self.detailed_log("✅ Pergunta sobre habilidade respondida (select)")
-                    time.sleep(2)
+                    self.rate_policy.pace("between_actions")
                     return True
             else:
                 # Se for input, digita o valor
                 input_field.clear()
-                time.sleep(1)
+                self.rate_policy.pace("between_actions")
                 
-                for char in score:
-                    input_field.send_keys(char)
-                    time.sleep(random.uniform(0.05, 0.1))
+                self.human_type(input_field, score)
                     
                 self.detailed_log("✅ Pergunta sobre habilidade respondida (input)")
-                time.sleep(2)
+                self.rate_policy.pace("between_actions")
                 return True
                 
         except Exception as e:
@@ -1261,8 +1315,8 @@ class LinkedInWithJobHistory:
                     self.detailed_log(f"Confirmação encontrada: {indicator}")
                     return True
                     
-            # Aguarda um pouco e verifica novamente
-            time.sleep(3)
+            # Espera o modal mudar (tela de confirmação) e verifica novamente
+            self.waits.modal_step_changed(self.waits.modal_signature(), timeout=5)
             page_source = self.driver.page_source.lower()
             
             for indicator in success_indicators:
@@ -1277,8 +1331,10 @@ class LinkedInWithJobHistory:
             self.detailed_log(f"Erro ao verificar candidatura: {str(e)}", "WARNING")
             return False
             
-    def run_full_automation(self, username, password, job_types=None, max_applications=3):
-        """Executa automação completa com histórico no banco de dados"""
+    def run_full_automation(self, username, password, job_types=None, max_applications=3,
+                            run_timeout=None, job_timeout=None):
+        """Executa automação completa com histórico no banco de dados (prazos em segundos)"""
+        self.cancel_token.start_run(run_timeout, job_timeout)
         try:
             self.detailed_log("🚀 INICIANDO AUTOMAÇÃO LINKEDIN COM HISTÓRICO NO BANCO 🚀", "SUCCESS")
             self.detailed_log(f"ID da sessão: {self.session_id}")
@@ -1326,6 +1382,18 @@ class LinkedInWithJobHistory:
             
             return results
             
+        except AutomationCancelled as e:
+            self.detailed_log(f"🛑 Automação interrompida ({e.reason})", "WARNING")
+            # grava já o 'failed' da vaga interrompida (e o resto da fila do write-behind)
+            get_application_recorder().flush()
+            return {
+                "success": True,
+                "status": "timeout" if e.reason == "deadline" else "cancelled",
+                "applications_sent": len(self.applied_jobs),
+                "applied_jobs": self.applied_jobs,
+                "failed_applications": self.failed_applications,
+                "session_id": self.session_id
+            }
         except Exception as e:
             self.detailed_log(f"❌ Erro na automação completa: {str(e)}", "ERROR")
             self.take_debug_screenshot("automation_error")
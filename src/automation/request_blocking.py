@@ -0,0 +1,150 @@
+# src/automation/request_blocking.py
+"""
+Perfil de bloqueio de requisições via CDP.
+
+Páginas de busca e o modal Easy Apply nunca precisam de imagens (avatares, logos de
+empresa), fontes, vídeo ou scripts de analytics, mas o Chrome baixa tudo em cada
+navegação. O perfil liga `Network.setBlockedURLs` com regras por tipo de recurso e
+contabiliza o que deixou de ser baixado a partir dos eventos Network.loadingFailed
+(blockedReason='inspector') lidos pelo WaitEngine.
+
+Sobre Fetch.enable: interceptar por resourceType exige responder a cada
+Fetch.requestPaused na hora, o que o execute_cdp_cmd do Selenium não permite (não há
+canal de eventos síncrono). Por isso as regras por tipo viram padrões de URL
+(extensões e hosts de CDN/tracking), que o Chrome aplica sozinho.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+# Regras por tipo de recurso CDP -> padrões de URL (curingas do setBlockedURLs)
+RESOURCE_RULES: Dict[str, List[str]] = {
+    "Image": [
+        "*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+        "*.webp", "*.webp?*", "*.svg", "*.svg?*", "*.ico",
+        "*media.licdn.com/dms/image/*", "*static.licdn.com/aero-v1/sc/h/*",
+    ],
+    "Font": ["*.woff", "*.woff2", "*.woff?*", "*.woff2?*", "*.ttf", "*.otf", "*.eot"],
+    "Media": [
+        "*.mp4", "*.mp4?*", "*.webm", "*.m3u8", "*.mp3",
+        "*dms.licdn.com/playlist/*", "*media.licdn.com/dms/video/*",
+    ],
+    "Tracker": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*px.ads.linkedin.com*", "*snap.licdn.com/li.lms-analytics*",
+        "*linkedin.com/li/track*", "*linkedin.com/sensorCollect*",
+        "*facebook.net*", "*bat.bing.com*",
+    ],
+}
+
+DEFAULT_BLOCKED_TYPES = ("Image", "Font", "Media", "Tracker")
+
+# Tamanho médio (bytes) por tipo, usado enquanto não há amostras da própria sessão
+_DEFAULT_AVG_BYTES = {
+    "Image": 25_000,
+    "Font": 40_000,
+    "Media": 400_000,
+    "Script": 30_000,
+    "XHR": 3_000,
+    "Fetch": 3_000,
+    "Other": 5_000,
+}
+
+
+class RequestBlockingProfile:
+    """
+    Liga/desliga o bloqueio no driver e guarda as estatísticas do que foi economizado.
+    `blocked_types` escolhe quais chaves de RESOURCE_RULES entram; `extra_patterns`
+    acrescenta padrões livres.
+    """
+
+    def __init__(
+        self,
+        blocked_types: Optional[Iterable[str]] = None,
+        extra_patterns: Optional[Iterable[str]] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.blocked_types = list(blocked_types or DEFAULT_BLOCKED_TYPES)
+        self.extra_patterns = list(extra_patterns or [])
+        self.logger = logger or logging.getLogger("RequestBlocking")
+        self.enabled = False
+        self.reset_stats()
+
+    def patterns(self) -> List[str]:
+        out = []
+        for kind in self.blocked_types:
+            out.extend(RESOURCE_RULES.get(kind, []))
+        out.extend(self.extra_patterns)
+        return out
+
+    def reset_stats(self):
+        self.blocked_requests = 0
+        self.blocked_by_type: Dict[str, int] = {}
+        self.loaded_requests = 0
+        self.loaded_bytes = 0
+        self._request_types: Dict[str, str] = {}
+        self._sample_bytes: Dict[str, int] = {}
+        self._sample_count: Dict[str, int] = {}
+
+    # -------------------------- driver --------------------------
+
+    def apply(self, driver) -> bool:
+        """Ativa o bloqueio na aba atual. Retorna False se o CDP não estiver disponível."""
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns()})
+            self.enabled = True
+            self.logger.info(f"🚫 Bloqueio de recursos ativo ({', '.join(self.blocked_types)}).")
+            return True
+        except Exception as e:
+            self.logger.warning(f"⚠️ Não foi possível ativar bloqueio de recursos: {e}")
+            self.enabled = False
+            return False
+
+    @staticmethod
+    def clear(driver):
+        """Remove qualquer bloqueio deixado na aba (ex.: navegador reaproveitado do pool)."""
+        try:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        except Exception:
+            pass
+
+    # -------------------------- estatísticas --------------------------
+
+    def on_cdp_event(self, event: dict):
+        """Listener para WaitEngine.add_cdp_listener."""
+        method = event.get("method", "")
+        params = event.get("params", {})
+        if method == "Network.requestWillBeSent":
+            self._request_types[params.get("requestId")] = params.get("type") or "Other"
+        elif method == "Network.loadingFailed":
+            rtype = params.get("type") or self._request_types.get(params.get("requestId")) or "Other"
+            self._request_types.pop(params.get("requestId"), None)
+            if params.get("blockedReason") == "inspector":
+                self.blocked_requests += 1
+                self.blocked_by_type[rtype] = self.blocked_by_type.get(rtype, 0) + 1
+        elif method == "Network.loadingFinished":
+            rtype = self._request_types.pop(params.get("requestId"), "Other")
+            size = int(params.get("encodedDataLength") or 0)
+            self.loaded_requests += 1
+            self.loaded_bytes += size
+            self._sample_bytes[rtype] = self._sample_bytes.get(rtype, 0) + size
+            self._sample_count[rtype] = self._sample_count.get(rtype, 0) + 1
+
+    def _avg_bytes(self, rtype: str) -> int:
+        count = self._sample_count.get(rtype)
+        if count:
+            return self._sample_bytes[rtype] // count
+        return _DEFAULT_AVG_BYTES.get(rtype, _DEFAULT_AVG_BYTES["Other"])
+
+    def stats(self) -> Dict:
+        """Requisições bloqueadas e bytes economizados (estimados pelo tamanho médio por tipo)."""
+        saved = sum(self._avg_bytes(t) * n for t, n in self.blocked_by_type.items())
+        return {
+            'enabled': self.enabled,
+            'blocked_types': self.blocked_types,
+            'blocked_requests': self.blocked_requests,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'estimated_bytes_saved': saved,
+            'loaded_requests': self.loaded_requests,
+            'loaded_bytes': self.loaded_bytes
+        }
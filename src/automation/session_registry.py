@@ -0,0 +1,116 @@
+# src/automation/session_registry.py
+"""
+Registro das sessões de automação que este processo está executando.
+
+Cada sessão (session_id = id do AutomationJob) tem seu próprio estado: bot, stop_event,
+navegador emprestado do pool, progresso e horário de início. Logs e resultados já ficam
+isolados por sessão no banco (AutomationJobEvent / AutomationJob.result / Job.automation_session_id)
+e no EventHub; aqui fica o que só existe em memória, para que /api/stop cancele na hora
+a sessão certa e /api/sessions mostre quem está usando cada navegador.
+
+O limite de sessões simultâneas vem de JOBHUNTER_MAX_SESSIONS (padrão 1). Ele é aplicado
+na fila (AutomationJob.claim_next não deixa passar de N jobs 'running' no banco, mesmo com
+vários processos de worker) e define o número padrão de workers embutidos e de navegadores
+do pool.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_MAX_SESSIONS = 1
+
+
+def max_concurrent_sessions() -> int:
+    """Quantas automações podem rodar lado a lado neste host"""
+    return max(1, int(os.environ.get("JOBHUNTER_MAX_SESSIONS", DEFAULT_MAX_SESSIONS)))
+
+
+class SessionState:
+    """Estado em memória de uma sessão em execução."""
+
+    def __init__(self, session_id: str, platform: str, worker_id: str = None):
+        self.session_id = session_id
+        self.platform = platform
+        self.worker_id = worker_id
+        self.stop_event = threading.Event()
+        self.bot = None
+        self.started_at = time.time()
+        self.progress = 0
+        self.current_platform = None
+
+    @property
+    def browser_slot(self) -> Optional[int]:
+        lease = getattr(self.bot, 'browser_lease', None)
+        return lease.slot if lease else None
+
+    def attach_bot(self, bot):
+        """Liga o bot à sessão: o stop_event da sessão passa a ser o do bot."""
+        self.bot = bot
+        bot.stop_event = self.stop_event
+
+    def to_dict(self):
+        return {
+            'session_id': self.session_id,
+            'platform': self.platform,
+            'worker_id': self.worker_id,
+            'started_at': self.started_at,
+            'elapsed_seconds': round(time.time() - self.started_at, 1),
+            'progress': self.progress,
+            'current_platform': self.current_platform or '',
+            'browser_slot': self.browser_slot,
+            'cancel_requested': self.stop_event.is_set()
+        }
+
+
+class SessionRegistry:
+    """session_id -> SessionState das sessões ativas no processo."""
+
+    def __init__(self):
+        self._sessions: Dict[str, SessionState] = {}
+        self._lock = threading.Lock()
+
+    def register(self, session_id: str, platform: str, worker_id: str = None) -> SessionState:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = self._sessions[session_id] = SessionState(session_id, platform, worker_id)
+            return state
+
+    def unregister(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def cancel(self, session_ids: List[str]) -> List[str]:
+        """Sinaliza o stop_event das sessões que rodam aqui (sem esperar o heartbeat)"""
+        cancelled = []
+        with self._lock:
+            for session_id in session_ids:
+                state = self._sessions.get(session_id)
+                if state:
+                    state.stop_event.set()
+                    cancelled.append(session_id)
+        return cancelled
+
+    def active(self) -> List[SessionState]:
+        with self._lock:
+            return list(self._sessions.values())
+
+    def stats(self) -> Dict:
+        sessions = self.active()
+        return {
+            'max_sessions': max_concurrent_sessions(),
+            'active': len(sessions),
+            'sessions': [s.to_dict() for s in sessions]
+        }
+
+
+_registry = SessionRegistry()
+
+
+def get_session_registry() -> SessionRegistry:
+    return _registry
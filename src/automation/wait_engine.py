@@ -0,0 +1,307 @@
+# src/automation/wait_engine.py
+"""
+Esperas por condição (em vez de sleeps fixos) e política explícita de ritmo humano.
+
+WaitEngine  -> espera o que a página realmente precisa:
+    - dom_stable:            MutationObserver sem mutações por N ms
+    - network_idle:          sem requisições em voo (eventos CDP via log 'performance')
+    - element_count_stable:  quantidade de elementos de um seletor parou de mudar
+    - modal_step_changed:    o passo do modal Easy Apply mudou (progresso/título/campos)
+    - page_ready:            readyState complete + network_idle + dom_stable
+
+RatePolicy  -> pausas deliberadas para parecer humano (entre cards, entre candidaturas,
+               digitação...). Ficam separadas das esperas de prontidão para que o tempo
+               de execução seja dominado pela página, e não por sleeps "por garantia".
+"""
+import json
+import logging
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_SCRIPT_TIMEOUT = 30  # padrão do WebDriver quando o driver não informa o atual
+
+_DOM_STABLE_JS = r"""
+const quiet = arguments[0], timeout = arguments[1], rootSel = arguments[2];
+const done = arguments[arguments.length - 1];
+const root = (rootSel && document.querySelector(rootSel)) || document.documentElement;
+if (!root) { done(true); return; }
+let timer = null, hard = null;
+const obs = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(finish, quiet, true); });
+function finish(ok) { obs.disconnect(); clearTimeout(timer); clearTimeout(hard); done(ok); }
+hard = setTimeout(finish, timeout, false);
+obs.observe(root, {childList: true, subtree: true, characterData: true});
+timer = setTimeout(finish, quiet, true);
+"""
+
+_COUNT_STABLE_JS = r"""
+const sel = arguments[0], stable = arguments[1], timeout = arguments[2], minCount = arguments[3];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+let last = -1, since = start;
+(function tick() {
+  let n = 0;
+  try { n = document.querySelectorAll(sel).length; } catch (e) {}
+  const now = performance.now();
+  if (n !== last) { last = n; since = now; }
+  if (n >= minCount && now - since >= stable) { done(n); return; }
+  if (now - start >= timeout) { done(n >= minCount ? n : -1); return; }
+  setTimeout(tick, 100);
+})();
+"""
+
+_RESOURCE_IDLE_JS = r"""
+const idle = arguments[0], timeout = arguments[1];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+let count = performance.getEntriesByType('resource').length, since = start;
+(function tick() {
+  const n = performance.getEntriesByType('resource').length;
+  const now = performance.now();
+  if (n !== count) { count = n; since = now; }
+  if (document.readyState === 'complete' && now - since >= idle) { done(true); return; }
+  if (now - start >= timeout) { done(false); return; }
+  setTimeout(tick, 100);
+})();
+"""
+
+_MODAL_SIGNATURE_JS = r"""
+const d = document.querySelector(
+  "div.jobs-easy-apply-modal, div[role='dialog'] form, form.jobs-easy-apply-form, div[role='dialog']"
+);
+if (!d) return 'closed';
+const dialog = d.closest("div[role='dialog']") || d;
+const p = dialog.querySelector("progress, [role='progressbar']");
+const pv = p ? (p.getAttribute('value') || p.getAttribute('aria-valuenow') || '') : '';
+const h = dialog.querySelector('h3, h2');
+const labels = Array.from(dialog.querySelectorAll('label, legend'))
+  .map(l => (l.innerText || '').trim()).join('|');
+const text = (dialog.innerText || '');
+const confirmed = /candidatura enviada|application (was )?sent|application submitted/i.test(text);
+return [pv, h ? (h.innerText || '').trim() : '', labels.slice(0, 400), confirmed ? 'sent' : ''].join('#');
+"""
+
+
+class WaitEngine:
+    def __init__(self, driver, logger: Optional[logging.Logger] = None):
+        self.driver = driver
+        self.logger = logger or logging.getLogger("WaitEngine")
+        self._inflight: Dict[str, float] = {}
+        self._cdp_listeners: List[Callable[[dict], None]] = []
+        self._perf_log_available = None
+        self.token = None  # CancellationToken: toda espera checa cancelamento e respeita o prazo
+
+    def _guard(self, timeout: float) -> float:
+        """Checa cancelamento/prazo antes de esperar e limita o timeout ao prazo restante."""
+        if self.token is None:
+            return timeout
+        self.token.check()
+        return self.token.clamp(timeout)
+
+    # -------------------------- eventos CDP --------------------------
+
+    def add_cdp_listener(self, listener: Callable[[dict], None]):
+        """Registra um callback que recebe cada evento CDP ({'method', 'params'}) lido do log."""
+        if listener not in self._cdp_listeners:
+            self._cdp_listeners.append(listener)
+
+    def remove_cdp_listener(self, listener: Callable[[dict], None]):
+        if listener in self._cdp_listeners:
+            self._cdp_listeners.remove(listener)
+
+    def pump_cdp_events(self) -> int:
+        """
+        Lê o log 'performance' do chromedriver (eventos CDP Network.*/Page.*), atualiza as
+        requisições em voo e repassa os eventos aos listeners. Precisa da capability
+        goog:loggingPrefs={'performance': 'ALL'} (ver BaseAutomation.launch_chrome).
+        O log é drenado a cada leitura, por isso todo consumidor passa por aqui.
+        """
+        if self._perf_log_available is False:
+            return 0
+        try:
+            entries = self.driver.get_log("performance")
+            self._perf_log_available = True
+        except Exception:
+            self._perf_log_available = False
+            return 0
+
+        for entry in entries:
+            try:
+                event = json.loads(entry["message"])["message"]
+            except Exception:
+                continue
+            method = event.get("method", "")
+            params = event.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self._inflight[params.get("requestId")] = time.time()
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self._inflight.pop(params.get("requestId"), None)
+            elif method == "Page.frameStartedLoading":
+                # navegação nova: requisições antigas não terminarão mais
+                self._inflight.clear()
+            for listener in list(self._cdp_listeners):
+                try:
+                    listener(event)
+                except Exception as e:
+                    self.logger.debug(f"listener CDP falhou: {e}")
+        return len(entries)
+
+    # -------------------------- condições --------------------------
+
+    def _run_async(self, script: str, timeout: float, *args):
+        """execute_async_script com timeout próprio; o do driver (compartilhado pelo pool) é restaurado."""
+        try:
+            previous = self.driver.timeouts.script
+        except Exception:
+            previous = DEFAULT_SCRIPT_TIMEOUT
+        self.driver.set_script_timeout(timeout + 5)
+        try:
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            try:
+                self.driver.set_script_timeout(previous)
+            except Exception as e:
+                self.logger.debug(f"não foi possível restaurar o script timeout: {e}")
+
+    def dom_stable(self, quiet_ms: int = 500, timeout: float = 10, root_selector: Optional[str] = None) -> bool:
+        """Espera o DOM (ou `root_selector`) ficar sem mutações por `quiet_ms`."""
+        timeout = self._guard(timeout)
+        try:
+            return bool(self._run_async(_DOM_STABLE_JS, timeout, quiet_ms, int(timeout * 1000), root_selector))
+        except Exception as e:
+            self.logger.debug(f"dom_stable falhou: {e}")
+            return False
+
+    def network_idle(self, idle_ms: int = 500, timeout: float = 15, max_inflight: int = 0) -> bool:
+        """
+        Espera até não haver mais que `max_inflight` requisições em voo por `idle_ms`.
+        Usa eventos CDP; sem o log 'performance', cai no Resource Timing do próprio navegador.
+        """
+        timeout = self._guard(timeout)
+        self.pump_cdp_events()
+        if not self._perf_log_available:
+            try:
+                return bool(self._run_async(_RESOURCE_IDLE_JS, timeout, idle_ms, int(timeout * 1000)))
+            except Exception as e:
+                self.logger.debug(f"network_idle (resource timing) falhou: {e}")
+                return False
+
+        deadline = time.time() + timeout
+        idle_since = None
+        while time.time() < deadline:
+            if self.token is not None:
+                self.token.check()
+            self.pump_cdp_events()
+            # requisições penduradas há muito tempo (long-poll, websockets) não contam
+            now = time.time()
+            busy = [rid for rid, t in self._inflight.items() if now - t < 10]
+            if len(busy) <= max_inflight:
+                idle_since = idle_since or now
+                if (now - idle_since) * 1000 >= idle_ms:
+                    return True
+            else:
+                idle_since = None
+            time.sleep(0.1)
+        return False
+
+    def element_count_stable(self, css_selector: str, stable_ms: int = 600, timeout: float = 10, min_count: int = 1) -> int:
+        """
+        Espera a quantidade de `css_selector` parar de mudar por `stable_ms` (e ser >= min_count).
+        Retorna a contagem final, ou -1 se não atingiu min_count no tempo.
+        """
+        timeout = self._guard(timeout)
+        try:
+            return int(self._run_async(_COUNT_STABLE_JS, timeout, css_selector, stable_ms, int(timeout * 1000), min_count))
+        except Exception as e:
+            self.logger.debug(f"element_count_stable falhou: {e}")
+            return -1
+
+    def modal_signature(self) -> str:
+        """Assinatura do passo atual do modal Easy Apply ('closed' se não houver modal)."""
+        try:
+            return self.driver.execute_script(_MODAL_SIGNATURE_JS) or ""
+        except Exception:
+            return ""
+
+    def modal_step_changed(self, previous: str, timeout: float = 6) -> Optional[str]:
+        """Espera a assinatura do modal ficar diferente de `previous`. Retorna a nova (ou None)."""
+        timeout = self._guard(timeout)
+        result = {}
+
+        def _changed(_):
+            if self.token is not None:
+                self.token.check()
+            sig = self.modal_signature()
+            if sig and sig != previous:
+                result["sig"] = sig
+                return True
+            return False
+
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.15).until(_changed)
+            return result.get("sig")
+        except Exception:
+            return None
+
+    def url_changed(self, previous_url: str, timeout: float = 15) -> bool:
+        timeout = self._guard(timeout)
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(lambda d: d.current_url != previous_url)
+            return True
+        except Exception:
+            return False
+
+    def page_ready(self, timeout: float = 20, quiet_ms: int = 400) -> bool:
+        """readyState complete, rede ociosa (tolerando 1 requisição longa) e DOM estável."""
+        timeout = self._guard(timeout)
+        start = time.time()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except Exception:
+            self.logger.debug("page_ready: readyState não chegou a 'complete'")
+        remaining = max(1.0, timeout - (time.time() - start))
+        self.network_idle(idle_ms=quiet_ms, timeout=remaining, max_inflight=1)
+        remaining = max(1.0, timeout - (time.time() - start))
+        return self.dom_stable(quiet_ms=quiet_ms, timeout=remaining)
+
+
+class RatePolicy:
+    """
+    Pausas humanas explícitas, por tipo de ação. Os intervalos (min, max) em segundos podem
+    ser sobrescritos no construtor; scale=0 desliga o ritmo humano (ex.: testes/headless).
+    """
+
+    DEFAULTS: Dict[str, Tuple[float, float]] = {
+        "keystroke": (0.1, 0.3),
+        "before_submit": (1.5, 3.0),
+        "between_actions": (0.2, 0.6),
+        "between_cards": (1.0, 2.0),
+        "between_analyses": (2.0, 4.0),
+        "between_applications": (15.0, 25.0),
+    }
+
+    def __init__(self, scale: float = 1.0, logger: Optional[logging.Logger] = None, **overrides):
+        self.scale = scale
+        self.logger = logger or logging.getLogger("RatePolicy")
+        self.ranges = dict(self.DEFAULTS)
+        self.ranges.update(overrides)
+        self.token = None  # com CancellationToken, a pausa acorda no cancelamento
+
+    def delay(self, kind: str) -> float:
+        low, high = self.ranges.get(kind, (0.0, 0.0))
+        return random.uniform(low, high) * self.scale
+
+    def pace(self, kind: str, log: bool = False) -> float:
+        seconds = self.delay(kind)
+        if seconds > 0:
+            if log:
+                self.logger.info(f"⏱️ Ritmo humano ({kind}): {seconds:.1f}s")
+            if self.token is not None:
+                self.token.sleep(seconds)
+            else:
+                time.sleep(seconds)
+        return seconds
@@ -0,0 +1,95 @@
+"""
+Paginação por cursor (keyset) e respostas JSON em streaming.
+
+Em vez de OFFSET (que relê e descarta todas as linhas anteriores) ou de um `limit` sem
+cursor, cada página continua de onde a anterior parou: WHERE (ts, id) < (:ts, :id)
+ORDER BY ts DESC, id DESC, servido direto pelos índices (ts, id) / (filtro, ts, id).
+O cursor é opaco para o cliente (base64 de "ts|id").
+
+stream_page() gera o JSON da página linha a linha (yield_per), sem montar a lista de
+to_dict() em memória; o next_cursor vai no fim do documento. O total de linhas do filtro
+(um COUNT a mais) só é calculado quando pedido (?with_total=1, ver wants_total).
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import literal, tuple_
+
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """Cursor de paginação malformado."""
+
+
+def encode_cursor(ts: datetime, row_id: int) -> str:
+    raw = f"{ts.isoformat() if ts else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, row_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception:
+        raise InvalidCursor("cursor inválido")
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Data (YYYY-MM-DD) ou data/hora ISO de um filtro de intervalo"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidCursor(f"data inválida: {value}")
+
+
+def page_size(value, default: int = 50) -> int:
+    return max(1, min(int(value or default), MAX_PAGE_SIZE))
+
+
+def wants_total(value: Optional[str]) -> bool:
+    return (value or '').strip().lower() in ('1', 'true', 'yes')
+
+
+def keyset_query(query, ts_column, id_column, cursor: Optional[str], limit: int):
+    """Aplica cursor + ordenação (ts DESC, id DESC) e busca limit+1 para saber se há próxima página"""
+    after = decode_cursor(cursor)
+    if after:
+        # valores ligados com o tipo da coluna: o datetime vira o mesmo texto gravado no SQLite
+        bound = tuple_(literal(after[0], ts_column.type), literal(after[1], id_column.type))
+        query = query.filter(tuple_(ts_column, id_column) < bound)
+    return query.order_by(ts_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def stream_page(query, key: str, limit: int, serialize: Callable, cursor_of: Callable,
+                extra: Optional[Dict] = None, total_query=None) -> Iterator[str]:
+    """
+    Gera {"success": true, <key>: [...], "count": n, "next_cursor": ..., "has_more": ...}
+    em pedaços. `query` já vem de keyset_query (limit+1 linhas); `cursor_of(row)` -> (ts, id).
+    Com `total_query` (a consulta filtrada, sem cursor), inclui "total": linhas do filtro todo.
+    """
+    head = {'success': True}
+    head.update(extra or {})
+    yield json.dumps(head, ensure_ascii=False)[:-1] + f', "{key}": ['
+    count = 0
+    last = None
+    has_more = False
+    for row in query.yield_per(100):
+        if count == limit:
+            has_more = True
+            break
+        yield ("," if count else "") + json.dumps(serialize(row), ensure_ascii=False, default=str)
+        count += 1
+        last = row
+    next_cursor = encode_cursor(*cursor_of(last)) if (has_more and last is not None) else None
+    tail = {'count': count, 'next_cursor': next_cursor, 'has_more': has_more}
+    if total_query is not None:
+        tail['total'] = total_query.order_by(None).count()
+    yield "], " + json.dumps(tail, ensure_ascii=False)[1:]
@@ -0,0 +1,122 @@
+"""
+Migrações simples do banco SQLite (db.create_all não altera tabelas já existentes).
+
+Cada migração tem um id e uma lista de comandos SQL idempotentes (ou funções que
+recebem a conexão, para o que o SQLite não sabe fazer com IF NOT EXISTS, como
+ADD COLUMN); as aplicadas ficam registradas em schema_migrations. run_migrations() roda na inicialização do app,
+logo depois do create_all.
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import text
+
+from src.database.search_index import create_search_index
+
+logger = logging.getLogger("Migrations")
+
+def add_column(table, column, ddl):
+    """ALTER TABLE ... ADD COLUMN só se a coluna ainda não existir (create_all já pode tê-la criado)"""
+    def apply(conn):
+        columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+        if column not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return apply
+
+
+MIGRATIONS = [
+    ("0001_application_history_indexes", [
+        # check_duplicate_application: job_id / job_url + status + janela de dias
+        "CREATE INDEX IF NOT EXISTS ix_application_history_job_id_status "
+        "ON application_history (job_id, application_status, attempted_at)",
+        "CREATE INDEX IF NOT EXISTS ix_application_history_job_url_status "
+        "ON application_history (job_url, application_status, attempted_at)",
+        # listagens recentes e estatísticas por status
+        "CREATE INDEX IF NOT EXISTS ix_application_history_attempted_at "
+        "ON application_history (attempted_at)",
+        "CREATE INDEX IF NOT EXISTS ix_application_history_status_attempted "
+        "ON application_history (application_status, attempted_at)",
+    ]),
+    ("0002_application_history_session_index", [
+        # estatísticas por sessão (get_session_statistics)
+        "CREATE INDEX IF NOT EXISTS ix_application_history_session "
+        "ON application_history (automation_session_id)",
+    ]),
+    ("0003_jobs_automation_session", [
+        # /api/results?session_id=: vagas aplicadas por cada sessão
+        add_column("jobs", "automation_session_id", "VARCHAR(36)"),
+        "CREATE INDEX IF NOT EXISTS ix_jobs_automation_session_id ON jobs (automation_session_id)",
+    ]),
+    ("0004_keyset_pagination_indexes", [
+        # created_at vinha de CURRENT_TIMESTAMP ('YYYY-MM-DD HH:MM:SS'); o SQLAlchemy grava e compara
+        # com microssegundos — normaliza para o cursor (created_at, id) ordenar e comparar igual
+        "UPDATE jobs SET created_at = created_at || '.000000' WHERE length(created_at) = 19",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_created_id ON jobs (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_company_created ON jobs (company, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_job_type_created ON jobs (job_type, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_platform_created ON jobs (platform, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_application_history_attempted_id "
+        "ON application_history (attempted_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_application_history_company_attempted "
+        "ON application_history (company_name, attempted_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_application_history_job_type_attempted "
+        "ON application_history (job_type, attempted_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_application_history_platform_attempted "
+        "ON application_history (platform, attempted_at, id)",
+    ]),
+    ("0005_fts5_search_index", [
+        # busca textual em jobs + application_history (tabela FTS5 mantida por triggers)
+        create_search_index,
+    ]),
+    ("0006_job_details_fetched_at_index", [
+        # leitura incremental do índice de matching (/api/resume/match)
+        "CREATE INDEX IF NOT EXISTS ix_job_details_fetched_at ON job_details (fetched_at)",
+    ]),
+    ("0007_application_history_completed_at_index", [
+        # verificação barata de mudanças do cache de estatísticas (MAX(completed_at))
+        "CREATE INDEX IF NOT EXISTS ix_application_history_completed_at "
+        "ON application_history (completed_at)",
+    ]),
+    ("0008_job_details_change_seq", [
+        # leitura incremental do índice de matching em ordem de commit: fetched_at é a hora da
+        # leitura no processo, não da gravação. O contador é atribuído pelo próprio SQLite dentro
+        # da transação (que segura o lock de escrita até o commit), logo cresce na ordem de commit
+        add_column("job_details", "change_seq", "INTEGER"),
+        "UPDATE job_details SET change_seq = id WHERE change_seq IS NULL",
+        "CREATE INDEX IF NOT EXISTS ix_job_details_change_seq ON job_details (change_seq)",
+        "CREATE TRIGGER IF NOT EXISTS job_details_change_seq_ai AFTER INSERT ON job_details BEGIN "
+        "UPDATE job_details SET change_seq = (SELECT coalesce(max(change_seq), 0) + 1 FROM job_details) "
+        "WHERE id = new.id; END",
+        "CREATE TRIGGER IF NOT EXISTS job_details_change_seq_au AFTER UPDATE OF "
+        "title, company, description, requirements, apply_method, content_hash ON job_details BEGIN "
+        "UPDATE job_details SET change_seq = (SELECT coalesce(max(change_seq), 0) + 1 FROM job_details) "
+        "WHERE id = new.id; END",
+    ]),
+]
+
+
+def run_migrations(db):
+    """Aplica as migrações pendentes (precisa de app context). Retorna os ids aplicados."""
+    applied_now = []
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "id VARCHAR(100) PRIMARY KEY, applied_at DATETIME NOT NULL)"
+        ))
+        done = {row[0] for row in conn.execute(text("SELECT id FROM schema_migrations"))}
+        for migration_id, statements in MIGRATIONS:
+            if migration_id in done:
+                continue
+            for statement in statements:
+                if callable(statement):
+                    statement(conn)
+                else:
+                    conn.execute(text(statement))
+            conn.execute(
+                text("INSERT INTO schema_migrations (id, applied_at) VALUES (:id, :at)"),
+                {"id": migration_id, "at": datetime.utcnow()}
+            )
+            applied_now.append(migration_id)
+            logger.info(f"🗄️ Migração aplicada: {migration_id}")
+    return applied_now
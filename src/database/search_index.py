@@ -0,0 +1,207 @@
+"""
+Busca textual (SQLite FTS5) sobre as vagas coletadas (jobs) e o histórico de candidaturas.
+
+Uma tabela virtual `search_index` guarda título, empresa, local e corpo (descrição,
+requisitos, tipo de vaga) das duas tabelas, mantida por triggers de INSERT/UPDATE/DELETE
+— nenhum código da aplicação precisa lembrar de indexar. O rowid identifica a origem
+sem índice extra: jobs.id * 2 para vagas e application_history.id * 2 + 1 para
+candidaturas, de modo que os triggers apagam/reescrevem a linha por rowid.
+
+Tokenizador unicode61 com remove_diacritics 2: "hibrido" encontra "Híbrido" e
+"precificação" encontra "precificacao". O ranking é bm25 com peso maior para o título.
+"""
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger("SearchIndex")
+
+FTS_TABLE = "search_index"
+
+# palavras que não ajudam a busca ("contas a pagar" -> contas pagar)
+STOPWORDS = {
+    "a", "o", "as", "os", "e", "de", "da", "do", "das", "dos", "em", "no", "na", "nos", "nas",
+    "para", "por", "com", "um", "uma", "the", "of", "and", "for", "in", "to",
+}
+
+# título, empresa, local, corpo
+BM25_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+_JOB_VALUES = (
+    "new.id * 2, new.title, new.company, new.location, "
+    "trim(coalesce(new.description, '') || ' ' || coalesce(new.requirements, '') || ' ' || coalesce(new.job_type, '')), "
+    "'job', new.id, new.status, new.url, new.created_at"
+)
+_APPLICATION_VALUES = (
+    "new.id * 2 + 1, new.job_title, new.company_name, new.location, "
+    "trim(coalesce(new.job_type, '') || ' ' || coalesce(new.platform, '')), "
+    "'application', new.id, new.application_status, new.job_url, new.attempted_at"
+)
+_COLUMNS = "rowid, title, company, location, body, source, source_id, status, url, ts"
+
+SCHEMA = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, company, location, body, "
+    "source UNINDEXED, source_id UNINDEXED, status UNINDEXED, url UNINDEXED, ts UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+
+    # jobs
+    f"CREATE TRIGGER IF NOT EXISTS jobs_search_ai AFTER INSERT ON jobs BEGIN "
+    f"INSERT INTO {FTS_TABLE} ({_COLUMNS}) VALUES ({_JOB_VALUES}); END",
+    f"CREATE TRIGGER IF NOT EXISTS jobs_search_au AFTER UPDATE OF "
+    f"title, company, location, description, requirements, job_type, status, url ON jobs BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2; "
+    f"INSERT INTO {FTS_TABLE} ({_COLUMNS}) VALUES ({_JOB_VALUES}); END",
+    f"CREATE TRIGGER IF NOT EXISTS jobs_search_ad AFTER DELETE ON jobs BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2; END",
+
+    # application_history
+    f"CREATE TRIGGER IF NOT EXISTS application_history_search_ai AFTER INSERT ON application_history BEGIN "
+    f"INSERT INTO {FTS_TABLE} ({_COLUMNS}) VALUES ({_APPLICATION_VALUES}); END",
+    f"CREATE TRIGGER IF NOT EXISTS application_history_search_au AFTER UPDATE OF "
+    f"job_title, company_name, location, job_type, platform, application_status, job_url ON application_history BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2 + 1; "
+    f"INSERT INTO {FTS_TABLE} ({_COLUMNS}) VALUES ({_APPLICATION_VALUES}); END",
+    f"CREATE TRIGGER IF NOT EXISTS application_history_search_ad AFTER DELETE ON application_history BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.id * 2 + 1; END",
+]
+
+
+def _backfill_statements():
+    job_select = _JOB_VALUES.replace("new.", "")
+    application_select = _APPLICATION_VALUES.replace("new.", "")
+    return [
+        f"INSERT INTO {FTS_TABLE} ({_COLUMNS}) SELECT {job_select} FROM jobs",
+        f"INSERT INTO {FTS_TABLE} ({_COLUMNS}) SELECT {application_select} FROM application_history",
+    ]
+
+
+def create_search_index(conn):
+    """Migração: cria a tabela FTS5 e os triggers e indexa as linhas existentes"""
+    try:
+        conn.execute(text("SAVEPOINT create_search_index"))
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+        ).first()
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+        if not exists:
+            for statement in _backfill_statements():
+                conn.execute(text(statement))
+        conn.execute(text("RELEASE create_search_index"))
+    except Exception as e:
+        # SQLite compilado sem FTS5: a busca cai no LIKE (search() abaixo)
+        conn.execute(text("ROLLBACK TO create_search_index"))
+        conn.execute(text("RELEASE create_search_index"))
+        logger.warning(f"⚠️ FTS5 indisponível; /api/jobs/search usará LIKE: {e}")
+
+
+def rebuild_search_index(conn):
+    """Reconstrói o índice do zero (manutenção)"""
+    conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    for statement in _backfill_statements():
+        conn.execute(text(statement))
+    conn.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"))
+
+
+def _fold(value: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", value) if not unicodedata.combining(c)).lower()
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Texto livre -> expressão MATCH do FTS5: termos entre aspas (nada do usuário vira
+    operador), stopwords removidas, todos os termos obrigatórios e o último como prefixo
+    (busca enquanto digita).
+    """
+    terms = [t for t in re.findall(r"\w+", query or "", flags=re.UNICODE)]
+    terms = [t for t in terms if _fold(t) not in STOPWORDS] or terms
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    if len(terms[-1]) >= 2:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _has_fts(session) -> bool:
+    return session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first() is not None
+
+
+def search(session, query: str, source: Optional[str] = None, status: Optional[str] = None,
+           limit: int = 20, offset: int = 0) -> List[Dict]:
+    """Resultados ordenados por relevância (bm25), com trechos destacados em <mark>"""
+    match = build_match_query(query)
+    if not match:
+        return []
+    if not _has_fts(session):
+        return _search_like(session, query, source, status, limit, offset)
+
+    filters = ""
+    params = {"match": match, "limit": limit, "offset": offset}
+    if source:
+        filters += " AND source = :source"
+        params["source"] = source
+    if status:
+        filters += " AND status = :status"
+        params["status"] = status
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    rows = session.execute(text(
+        f"SELECT source, source_id, status, url, ts, title, company, location, "
+        f"bm25({FTS_TABLE}, {weights}) AS rank, "
+        f"highlight({FTS_TABLE}, 0, '<mark>', '</mark>') AS title_highlight, "
+        f"highlight({FTS_TABLE}, 1, '<mark>', '</mark>') AS company_highlight, "
+        f"snippet({FTS_TABLE}, 3, '<mark>', '</mark>', '…', 16) AS snippet "
+        f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match{filters} "
+        f"ORDER BY rank LIMIT :limit OFFSET :offset"
+    ), params).mappings().all()
+    return [_result(row, rank=round(-row["rank"], 4)) for row in rows]
+
+
+def _result(row, rank=None) -> Dict:
+    return {
+        'source': row["source"],
+        'id': row["source_id"],
+        'title': row["title"],
+        'company': row["company"],
+        'location': row["location"],
+        'status': row["status"],
+        'url': row["url"],
+        'date': str(row["ts"]) if row["ts"] else None,
+        'rank': rank,
+        'title_highlight': row.get("title_highlight") or row["title"],
+        'company_highlight': row.get("company_highlight") or row["company"],
+        'snippet': row.get("snippet") or ''
+    }
+
+
+def _search_like(session, query, source, status, limit, offset) -> List[Dict]:
+    """Fallback sem FTS5: LIKE por termo no título/empresa (sem ranking)"""
+    terms = [t for t in re.findall(r"\w+", query, flags=re.UNICODE) if _fold(t) not in STOPWORDS][:5]
+    selects = []
+    params = {"limit": limit, "offset": offset}
+    for i, term in enumerate(terms):
+        params[f"t{i}"] = f"%{term}%"
+    for name, table, title, company, status_col, url_col, ts_col in (
+        ("job", "jobs", "title", "company", "status", "url", "created_at"),
+        ("application", "application_history", "job_title", "company_name",
+         "application_status", "job_url", "attempted_at"),
+    ):
+        if source and source != name:
+            continue
+        where = " AND ".join(f"({title} LIKE :t{i} OR {company} LIKE :t{i})" for i in range(len(terms))) or "1=1"
+        selects.append(
+            f"SELECT '{name}' AS source, id AS source_id, {title} AS title, {company} AS company, location, "
+            f"{status_col} AS status, {url_col} AS url, {ts_col} AS ts FROM {table} WHERE {where}"
+        )
+    sql = " UNION ALL ".join(selects)
+    if status:
+        sql = f"SELECT * FROM ({sql}) WHERE status = :status"
+        params["status"] = status
+    rows = session.execute(text(f"{sql} ORDER BY ts DESC LIMIT :limit OFFSET :offset"), params).mappings().all()
+    return [_result(row) for row in rows]
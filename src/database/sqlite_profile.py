@@ -0,0 +1,118 @@
+"""
+Perfil de desempenho do SQLite e sessões para threads de fundo.
+
+A API (dashboard) e as threads de automação/worker escrevem no mesmo app.db. Com o
+journal padrão (DELETE) um escritor bloqueia os leitores; em WAL os leitores leem o
+último snapshot commitado enquanto a automação escreve. Os PRAGMAs são aplicados em
+cada conexão nova do pool do SQLAlchemy (evento "connect").
+
+Configuração (variáveis de ambiente, com os padrões abaixo):
+    JOBHUNTER_SQLITE_JOURNAL_MODE   WAL
+    JOBHUNTER_SQLITE_SYNCHRONOUS    NORMAL   (seguro em WAL; perde no máximo o último commit numa queda de energia)
+    JOBHUNTER_SQLITE_CACHE_KB       65536    (cache de páginas por conexão)
+    JOBHUNTER_SQLITE_BUSY_TIMEOUT   30000    (ms esperando lock em vez de "database is locked")
+    JOBHUNTER_SQLITE_MMAP_MB        256      (I/O mapeado em memória; 0 desliga)
+    JOBHUNTER_SQLITE_FOREIGN_KEYS   1
+"""
+import logging
+import os
+from contextlib import contextmanager
+from typing import Dict
+
+from sqlalchemy import event
+
+logger = logging.getLogger("SQLiteProfile")
+
+DEFAULT_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_kb': 65536,
+    'busy_timeout': 30000,
+    'mmap_mb': 256,
+    'foreign_keys': 1,
+}
+
+
+def sqlite_profile() -> Dict:
+    """Perfil padrão sobrescrito pelas variáveis JOBHUNTER_SQLITE_*"""
+    profile = dict(DEFAULT_PROFILE)
+    for key, default in DEFAULT_PROFILE.items():
+        value = os.environ.get(f"JOBHUNTER_SQLITE_{key.upper()}")
+        if value is not None:
+            profile[key] = type(default)(value)
+    return profile
+
+
+def pragma_statements(profile: Dict):
+    return [
+        f"PRAGMA journal_mode={profile['journal_mode']}",
+        f"PRAGMA synchronous={profile['synchronous']}",
+        f"PRAGMA cache_size=-{int(profile['cache_kb'])}",  # negativo = KiB
+        f"PRAGMA busy_timeout={int(profile['busy_timeout'])}",
+        f"PRAGMA mmap_size={int(profile['mmap_mb']) * 1024 * 1024}",
+        f"PRAGMA foreign_keys={'ON' if profile['foreign_keys'] else 'OFF'}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def engine_options(profile: Dict = None) -> Dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS para SQLite: o timeout do driver acompanha o busy_timeout e
+    check_same_thread=False deixa o pool entregar a conexão à thread que a pedir (cada
+    thread continua com sua própria sessão).
+    """
+    profile = profile or sqlite_profile()
+    return {
+        'connect_args': {
+            'timeout': int(profile['busy_timeout']) / 1000,
+            'check_same_thread': False,
+        },
+        'pool_pre_ping': True,
+    }
+
+
+def configure_sqlite(app, db):
+    """Registra os PRAGMAs no engine do app (chamar depois de db.init_app, com app context)"""
+    profile = sqlite_profile()
+    engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return None
+    statements = pragma_statements(profile)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+    # conexões abertas antes do listener (create_all etc.) voltam sem os PRAGMAs
+    engine.dispose()
+    with engine.connect() as conn:
+        mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+    logger.info(f"🗄️ SQLite configurado: journal_mode={mode}, synchronous={profile['synchronous']}, "
+                f"cache={profile['cache_kb']}KB, mmap={profile['mmap_mb']}MB")
+    app.extensions['jobhunter_sqlite_profile'] = profile
+    return profile
+
+
+@contextmanager
+def session_scope(app, db):
+    """
+    Sessão para threads de fundo: empurra um app context (sessão própria da thread),
+    faz commit no fim, rollback em erro e sempre devolve a conexão ao pool.
+
+        with session_scope(app, db) as session:
+            session.add(...)
+    """
+    with app.app_context():
+        try:
+            yield db.session
+            db.session.commit()
+        except BaseException:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.remove()
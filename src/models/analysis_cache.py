@@ -0,0 +1,174 @@
+"""
+Cache das análises de currículo, endereçado pelo conteúdo.
+
+O mesmo currículo era analisado de novo a cada abertura da página ou reenvio. A chave
+aqui é o SHA-256 do texto normalizado (NFC, minúsculas, espaços colapsados — a análise
+não distingue essas variações) mais a versão do conjunto de palavras-chave
+(keyword_set_version): mudar JOB_KEYWORDS/REQUIRED_SKILLS gera outras chaves e os
+resultados antigos deixam de ser encontrados, sem limpeza manual.
+
+Duas camadas: LRU em memória (JOBHUNTER_ANALYSIS_CACHE_SIZE entradas) e a tabela
+resume_analysis_cache no SQLite, que guarda o que sai da memória e sobrevive ao restart.
+Entradas mais velhas que JOBHUNTER_ANALYSIS_CACHE_TTL_HOURS são descartadas nas duas.
+Sem app context (workers do lote, bot avulso) só a memória é usada.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from flask import has_app_context
+
+from src.models.user import db
+
+logger = logging.getLogger("AnalysisCache")
+
+DEFAULT_SIZE = 256
+DEFAULT_TTL_HOURS = 24 * 7
+PURGE_EVERY = 100  # gravações entre limpezas das linhas vencidas
+
+
+def normalize_resume_text(text: str) -> str:
+    return ' '.join(unicodedata.normalize('NFC', text or '').lower().split())
+
+
+def analysis_key(text: str, version: str) -> str:
+    raw = f"{version}\n{normalize_resume_text(text)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class ResumeAnalysisCacheEntry(db.Model):
+    __tablename__ = 'resume_analysis_cache'
+
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(64), nullable=False, unique=True, index=True)
+    keywords_version = db.Column(db.String(16), nullable=False)
+    result = db.Column(db.Text, nullable=False)  # JSON da análise
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class AnalysisCache:
+    def __init__(self, size: Optional[int] = None, ttl_hours: Optional[float] = None):
+        if size is None:
+            size = int(os.environ.get("JOBHUNTER_ANALYSIS_CACHE_SIZE", DEFAULT_SIZE))
+        if ttl_hours is None:
+            ttl_hours = float(os.environ.get("JOBHUNTER_ANALYSIS_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS))
+        self.size = max(1, size)
+        self.ttl = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()  # chave -> (criado em, resultado)
+        self._stores = 0
+        self.stats = {'hits': 0, 'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    # -------------------------- leitura --------------------------
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Resultado em cache (cópia) ou None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] >= self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                self.stats['memory_hits'] += 1
+                return copy.deepcopy(entry[1])
+        entry = self._load(key, now)
+        with self._lock:
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._remember_locked(key, entry)
+            self.stats['hits'] += 1
+            self.stats['db_hits'] += 1
+        return copy.deepcopy(entry[1])
+
+    def _load(self, key: str, now: float) -> Optional[Tuple[float, Dict]]:
+        if not has_app_context():
+            return None
+        try:
+            row = ResumeAnalysisCacheEntry.query.filter_by(key=key).first()
+        except Exception as e:
+            logger.warning(f"⚠️ Cache de análises indisponível no banco: {e}")
+            return None
+        if row is None:
+            return None
+        created = (row.created_at - datetime(1970, 1, 1)).total_seconds()
+        if now - created >= self.ttl:
+            return None
+        return created, json.loads(row.result)
+
+    # -------------------------- escrita --------------------------
+
+    def put(self, key: str, version: str, result: Dict):
+        """Guarda uma análise (resultados com erro não entram)"""
+        if result.get('error'):
+            return
+        entry = (time.time(), copy.deepcopy(result))
+        with self._lock:
+            self._remember_locked(key, entry)
+            self.stats['stores'] += 1
+            self._stores += 1
+            purge = self._stores % PURGE_EVERY == 0
+        self._persist(key, version, entry, purge)
+
+    def _remember_locked(self, key: str, entry: Tuple[float, Dict]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _persist(self, key: str, version: str, entry: Tuple[float, Dict], purge: bool):
+        if not has_app_context():
+            return
+        try:
+            row = ResumeAnalysisCacheEntry.query.filter_by(key=key).first()
+            if row is None:
+                row = ResumeAnalysisCacheEntry(key=key)
+                db.session.add(row)
+            row.keywords_version = version
+            row.result = json.dumps(entry[1], ensure_ascii=False, default=str)
+            row.created_at = datetime.utcfromtimestamp(entry[0])
+            if purge:
+                self._purge_expired()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"⚠️ Falha ao gravar análise no cache: {e}")
+
+    def _purge_expired(self):
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        ResumeAnalysisCacheEntry.query.filter(ResumeAnalysisCacheEntry.created_at < cutoff) \
+            .delete(synchronize_session=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> Dict:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {'entries': len(self._entries), 'size': self.size, 'ttl_hours': self.ttl / 3600,
+                    'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0.0, **self.stats}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnalysisCache()
+        return _cache
@@ -0,0 +1,173 @@
+"""
+Cache de deduplicação de candidaturas do processo.
+
+check_duplicate_application era chamado para cada card e fazia até duas consultas
+(job_id, depois job_url). Aqui ficam, em memória:
+    - um filtro de Bloom com todas as chaves (job_id / job_url) de candidaturas 'success'
+      recentes: se a chave não está no filtro, com certeza não é duplicada (sem ir ao banco);
+    - um LRU das chaves confirmadas recentemente (chave -> attempted_at).
+Só quando o Bloom diz "talvez" a consulta (indexada) vai ao banco.
+
+O filtro é do processo: candidaturas gravadas por outro processo (python src/worker.py)
+não entram nele. Por isso o "não" do Bloom só é definitivo com um único processo
+gravando (workers embutidos, o padrão); com workers separados
+(JOBHUNTER_EMBEDDED_WORKERS=0) toda consulta vai ao banco. JOBHUNTER_DEDUP_SINGLE_WRITER=1/0
+força um dos modos.
+
+O cache é aquecido a partir da tabela application_history na inicialização do app
+(warm) e atualizado quando uma candidatura vira 'success' (add).
+"""
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+
+class BloomFilter:
+    """Filtro de Bloom simples sobre bytearray (double hashing com blake2b)."""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def single_writer_default() -> bool:
+    """True se só este processo grava candidaturas (workers embutidos)"""
+    forced = os.environ.get("JOBHUNTER_DEDUP_SINGLE_WRITER")
+    if forced is not None:
+        return forced.strip().lower() in ("1", "true", "yes")
+    return os.environ.get("JOBHUNTER_EMBEDDED_WORKERS", "").strip() != "0"
+
+
+def _keys(job_id: Optional[str] = None, job_url: Optional[str] = None):
+    keys = []
+    if job_id:
+        keys.append(f"id:{job_id}")
+    if job_url:
+        keys.append(f"url:{job_url.split('?')[0]}")
+    return keys
+
+
+class ApplicationDedupCache:
+    def __init__(self, capacity: int = 100_000, lru_size: int = 5_000, error_rate: float = 0.001,
+                 single_writer: Optional[bool] = None):
+        self.capacity = capacity
+        self.single_writer = single_writer_default() if single_writer is None else single_writer
+        self.error_rate = error_rate
+        self.lru_size = lru_size
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._recent: "OrderedDict[str, datetime]" = OrderedDict()
+        self.warmed = False
+        self.window_days = 0
+        self.hits = {'lru': 0, 'bloom_negative': 0, 'db': 0}
+
+    def warm(self, days: int = 30) -> int:
+        """Carrega as candidaturas 'success' dos últimos `days` dias (precisa de app context)."""
+        from src.models.application_history import ApplicationHistory, db
+
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        rows = db.session.query(
+            ApplicationHistory.job_id, ApplicationHistory.job_url, ApplicationHistory.attempted_at
+        ).filter(
+            ApplicationHistory.application_status == 'success',
+            ApplicationHistory.attempted_at >= cutoff
+        ).order_by(ApplicationHistory.attempted_at).all()
+
+        with self._lock:
+            self._bloom = BloomFilter(max(self.capacity, len(rows) * 2), self.error_rate)
+            self._recent.clear()
+            for job_id, job_url, attempted_at in rows:
+                self._add_locked(job_id, job_url, attempted_at)
+            self.warmed = True
+            self.window_days = days
+        return len(rows)
+
+    def _add_locked(self, job_id, job_url, attempted_at):
+        for key in _keys(job_id, job_url):
+            self._bloom.add(key)
+            self._recent[key] = attempted_at
+            self._recent.move_to_end(key)
+        while len(self._recent) > self.lru_size:
+            self._recent.popitem(last=False)
+
+    def add(self, job_id: Optional[str] = None, job_url: Optional[str] = None, attempted_at: Optional[datetime] = None):
+        """Registra uma candidatura 'success' (chamado pelo modelo ao gravar)."""
+        with self._lock:
+            self._add_locked(job_id, job_url, attempted_at or datetime.utcnow())
+
+    def recent(self, job_id: Optional[str] = None, job_url: Optional[str] = None, days: int = 30) -> Optional[datetime]:
+        """attempted_at se a chave está no LRU e dentro da janela de `days` dias."""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        with self._lock:
+            for key in _keys(job_id, job_url):
+                attempted_at = self._recent.get(key)
+                if attempted_at and attempted_at >= cutoff:
+                    self._recent.move_to_end(key)
+                    self.hits['lru'] += 1
+                    return attempted_at
+        return None
+
+    def might_contain(self, job_id: Optional[str] = None, job_url: Optional[str] = None, days: int = 30) -> bool:
+        """
+        False = com certeza não aplicada nos últimos `days` dias. Antes do warm, para
+        janelas maiores que a aquecida ou com outros processos gravando, sempre True, e a
+        decisão fica com o banco.
+        """
+        if not self.single_writer or not self.warmed or days > self.window_days:
+            return True
+        with self._lock:
+            found = any(key in self._bloom for key in _keys(job_id, job_url))
+            if not found:
+                self.hits['bloom_negative'] += 1
+            return found
+
+    def count_db_query(self):
+        """Conta uma consulta ao banco feita pelo chamador (LRU e Bloom não resolveram)."""
+        with self._lock:
+            self.hits['db'] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'warmed': self.warmed,
+                'single_writer': self.single_writer,
+                'window_days': self.window_days,
+                'bloom_items': self._bloom.count,
+                'bloom_bits': self._bloom.size,
+                'lru_items': len(self._recent),
+                'hits': dict(self.hits)
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_application_dedup_cache() -> ApplicationDedupCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ApplicationDedupCache()
+        return _cache
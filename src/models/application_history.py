@@ -1,10 +1,27 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from src.models.jobs import db
+from src.models.application_dedup import get_application_dedup_cache
+from src.models.application_recorder import get_application_recorder
+from src.models.application_stats import get_application_statistics_cache, query_buckets, summarize
 
 class ApplicationHistory(db.Model):
     """Modelo para histórico de inscrições em vagas"""
     
     __tablename__ = 'application_history'
+    # mesmos índices das migrações (src/database/migrations.py) para bancos novos
+    __table_args__ = (
+        db.Index('ix_application_history_job_id_status', 'job_id', 'application_status', 'attempted_at'),
+        db.Index('ix_application_history_job_url_status', 'job_url', 'application_status', 'attempted_at'),
+        db.Index('ix_application_history_attempted_at', 'attempted_at'),
+        db.Index('ix_application_history_status_attempted', 'application_status', 'attempted_at'),
+        db.Index('ix_application_history_session', 'automation_session_id'),
+        # paginação keyset (attempted_at, id) e filtros do /api/applications/history
+        db.Index('ix_application_history_attempted_id', 'attempted_at', 'id'),
+        db.Index('ix_application_history_company_attempted', 'company_name', 'attempted_at', 'id'),
+        db.Index('ix_application_history_job_type_attempted', 'job_type', 'attempted_at', 'id'),
+        db.Index('ix_application_history_platform_attempted', 'platform', 'attempted_at', 'id'),
+        db.Index('ix_application_history_completed_at', 'completed_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     
@@ -62,29 +79,39 @@ class ApplicationHistory(db.Model):
             'screenshot_path': self.screenshot_path
         }
     
+    @staticmethod
+    def fields_from_job_info(job_info, status='pending', session_id=None):
+        """Colunas de um novo registro a partir do job_info da automação"""
+        return {
+            'job_title': job_info.get('title', 'Título não identificado'),
+            'company_name': job_info.get('company', 'Empresa não identificada'),
+            'job_url': job_info.get('url'),
+            'job_id': job_info.get('job_id'),
+            'location': job_info.get('location', 'São Paulo, SP'),
+            'platform': 'LinkedIn',
+            'application_status': status,
+            'job_type': job_info.get('job_type'),
+            'automation_session_id': session_id,
+            'attempted_at': datetime.utcnow()
+        }
+    
     @staticmethod
     def create_application_record(job_info, status='pending', session_id=None):
-        """Cria um novo registro de inscrição"""
-        application = ApplicationHistory(
-            job_title=job_info.get('title', 'Título não identificado'),
-            company_name=job_info.get('company', 'Empresa não identificada'),
-            job_url=job_info.get('url'),
-            job_id=job_info.get('job_id'),
-            location=job_info.get('location', 'São Paulo, SP'),
-            platform='LinkedIn',
-            application_status=status,
-            job_type=job_info.get('job_type'),
-            automation_session_id=session_id,
-            attempted_at=datetime.utcnow()
-        )
+        """Cria um novo registro de inscrição (commit imediato; a automação usa o ApplicationRecorder)"""
+        application = ApplicationHistory(**ApplicationHistory.fields_from_job_info(job_info, status, session_id))
         
         db.session.add(application)
         db.session.commit()
         
+        get_application_statistics_cache().record(application)
+        if status == 'success':
+            get_application_dedup_cache().add(application.job_id, application.job_url, application.attempted_at)
+        
         return application
     
-    def update_status(self, status, error_message=None, questions=None, screenshot_path=None):
-        """Atualiza o status da inscrição"""
+    def apply_status(self, status, error_message=None, questions=None, screenshot_path=None, at=None):
+        """Aplica a troca de status sem commit. Retorna o status anterior"""
+        old_status = self.application_status
         self.application_status = status
         
         if error_message:
@@ -97,30 +124,68 @@ class ApplicationHistory(db.Model):
             self.screenshot_path = screenshot_path
             
         if status in ['success', 'failed']:
-            self.completed_at = datetime.utcnow()
-            
+            self.completed_at = at or datetime.utcnow()
+        
+        return old_status
+    
+    def update_status(self, status, error_message=None, questions=None, screenshot_path=None):
+        """Atualiza o status da inscrição"""
+        old_status = self.apply_status(status, error_message, questions, screenshot_path)
         db.session.commit()
+        
+        get_application_statistics_cache().record(self, old_status=old_status)
+        if status == 'success':
+            get_application_dedup_cache().add(self.job_id, self.job_url, self.attempted_at)
     
     @staticmethod
-    def get_session_statistics(session_id):
+    def get_statistics(top_companies=10):
+        """Estatísticas gerais (uma consulta agrupada, em cache e atualizada a cada escrita)"""
+        return get_application_statistics_cache().get(top_companies)
+    
+    @staticmethod
+    def get_session_statistics(session_id, include_applications=True):
         """Obtém estatísticas de uma sessão de automação"""
-        applications = ApplicationHistory.query.filter_by(
-            automation_session_id=session_id
-        ).all()
-        
-        total = len(applications)
-        success = len([app for app in applications if app.application_status == 'success'])
-        failed = len([app for app in applications if app.application_status == 'failed'])
-        pending = len([app for app in applications if app.application_status == 'pending'])
+        summary = summarize(query_buckets(session_id))
+        total = summary['total_applications']
+        success = summary['successful_applications']
         
-        return {
+        statistics = {
             'total_attempts': total,
             'successful_applications': success,
-            'failed_applications': failed,
-            'pending_applications': pending,
+            'failed_applications': summary['failed_applications'],
+            'pending_applications': summary['pending_applications'],
             'success_rate': (success / total * 100) if total > 0 else 0,
-            'applications': [app.to_dict() for app in applications]
+            'by_job_type': summary['by_job_type'],
+            'by_day': summary['by_day']
         }
+        if include_applications:
+            applications = ApplicationHistory.query.filter_by(
+                automation_session_id=session_id
+            ).order_by(ApplicationHistory.attempted_at).all()
+            statistics['applications'] = [app.to_dict() for app in applications]
+        
+        return statistics
+    
+    @staticmethod
+    def filtered_query(status=None, company=None, job_type=None, platform=None,
+                       date_from=None, date_to=None, session_id=None):
+        """Consulta com os filtros do histórico (cada um coberto por um índice (coluna, attempted_at, id))"""
+        query = ApplicationHistory.query
+        if status:
+            query = query.filter(ApplicationHistory.application_status == status)
+        if company:
+            query = query.filter(ApplicationHistory.company_name == company)
+        if job_type:
+            query = query.filter(ApplicationHistory.job_type == job_type)
+        if platform:
+            query = query.filter(ApplicationHistory.platform == platform)
+        if session_id:
+            query = query.filter(ApplicationHistory.automation_session_id == session_id)
+        if date_from:
+            query = query.filter(ApplicationHistory.attempted_at >= date_from)
+        if date_to:
+            query = query.filter(ApplicationHistory.attempted_at < date_to)
+        return query
     
     @staticmethod
     def get_recent_applications(limit=50):
@@ -134,31 +199,79 @@ class ApplicationHistory(db.Model):
     @staticmethod
     def check_duplicate_application(job_id, job_url, days=30):
         """Verifica se já foi feita inscrição para esta vaga nos últimos X dias"""
-        from datetime import timedelta
+        cache = get_application_dedup_cache()
+        
+        # candidatura 'success' ainda na fila do write-behind (não chegou ao banco)
+        in_flight = get_application_recorder().pending_success(job_id, job_url)
+        if in_flight is not None:
+            return in_flight
+        
+        # LRU: candidatura recente já vista por este processo (ApplicationHistory transiente)
+        attempted_at = cache.recent(job_id, job_url, days=days)
+        if attempted_at:
+            return ApplicationHistory(job_id=job_id, job_url=job_url, attempted_at=attempted_at,
+                                      application_status='success')
+        
+        # Bloom: se a vaga nunca foi aplicada, responde sem ir ao banco (só com um processo gravando)
+        if not cache.might_contain(job_id, job_url, days=days):
+            return None
         
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        # Verifica por job_id primeiro
+        # Uma consulta (índices job_id/job_url + status + attempted_at)
+        conditions = []
         if job_id:
-            existing = ApplicationHistory.query.filter(
-                ApplicationHistory.job_id == job_id,
-                ApplicationHistory.attempted_at >= cutoff_date,
-                ApplicationHistory.application_status == 'success'
-            ).first()
-            
-            if existing:
-                return existing
-        
-        # Se não encontrou por job_id, verifica por URL
+            conditions.append(ApplicationHistory.job_id == job_id)
         if job_url:
-            existing = ApplicationHistory.query.filter(
-                ApplicationHistory.job_url == job_url,
+            conditions.append(ApplicationHistory.job_url == job_url)
+        if not conditions:
+            return None
+        
+        cache.count_db_query()
+        existing = ApplicationHistory.query.filter(
+            db.or_(*conditions),
+            ApplicationHistory.attempted_at >= cutoff_date,
+            ApplicationHistory.application_status == 'success'
+        ).order_by(ApplicationHistory.attempted_at.desc()).first()
+        
+        if existing:
+            cache.add(existing.job_id, existing.job_url, existing.attempted_at)
+        
+        return existing
+    
+    @staticmethod
+    def check_duplicates_batch(job_ids, days=30):
+        """
+        Verifica uma página inteira de job_ids de uma vez.
+        Retorna {job_id: attempted_at} só para os já aplicados nos últimos X dias.
+        LRU e Bloom respondem a maioria; o resto vai numa única consulta IN
+        (com workers em outros processos o Bloom não descarta nada: tudo vai na consulta).
+        """
+        cache = get_application_dedup_cache()
+        duplicates = {}
+        to_query = []
+        
+        for job_id in {str(j) for j in job_ids if j}:
+            attempted_at = cache.recent(job_id=job_id, days=days)
+            if attempted_at:
+                duplicates[job_id] = attempted_at
+            elif cache.might_contain(job_id=job_id, days=days):
+                to_query.append(job_id)
+        
+        if to_query:
+            cache.count_db_query()
+            cutoff_date = datetime.utcnow() - timedelta(days=days)
+            rows = db.session.query(
+                ApplicationHistory.job_id,
+                db.func.max(ApplicationHistory.attempted_at)
+            ).filter(
+                ApplicationHistory.job_id.in_(to_query),
                 ApplicationHistory.attempted_at >= cutoff_date,
                 ApplicationHistory.application_status == 'success'
-            ).first()
+            ).group_by(ApplicationHistory.job_id).all()
             
-            if existing:
-                return existing
+            for job_id, attempted_at in rows:
+                duplicates[job_id] = attempted_at
+                cache.add(job_id=job_id, attempted_at=attempted_at)
         
-        return None
-
+        return duplicates
@@ -0,0 +1,303 @@
+"""
+Gravação write-behind do histórico de candidaturas.
+
+create_application_record / update_status faziam um commit (fsync do SQLite) por evento,
+no meio do fluxo do navegador. O ApplicationRecorder recebe os eventos da thread de
+automação (criação, troca de status, perguntas respondidas, screenshot) numa fila em
+memória e uma thread de fundo grava em lote: quando juntar `batch_size` eventos, a cada
+`flush_interval` segundos, em flush() explícito e no encerramento do processo.
+
+Garantias:
+    - os eventos de um registro são aplicados na ordem em que foram enfileirados
+      (um status nunca chega antes da criação);
+    - um lote que falha é desfeito e refeito evento a evento: os que gravam ficam, o que
+      falha volta para o início da fila (com os eventos seguintes do mesmo registro) e é
+      tentado de novo no próximo flush, até MAX_WRITE_ATTEMPTS vezes; depois é descartado
+      com log de erro. Se a criação é descartada, os status desse registro também são;
+    - a deduplicação enxerga o que ainda está na fila: o cache de duplicadas é atualizado
+      no enqueue e check_duplicate_application consulta pending_success() antes do banco.
+
+Sem start(app) (scripts avulsos, testes) o recorder grava de forma síncrona, como antes.
+"""
+import atexit
+import logging
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.database.sqlite_profile import session_scope
+from src.models.application_dedup import get_application_dedup_cache
+from src.models.user import db
+
+logger = logging.getLogger("ApplicationRecorder")
+
+MAX_WRITE_ATTEMPTS = 3
+
+
+class PendingApplication:
+    """
+    Registro de candidatura devolvido à automação. Expõe `id` (preenchido depois do flush)
+    e update_status(), com a mesma assinatura do modelo, que só enfileira o evento.
+    """
+
+    def __init__(self, recorder, fields: Dict):
+        self.ref = uuid.uuid4().hex
+        self.id = None
+        self.fields = fields
+        self.attempts = 0      # falhas de gravação do evento da vez
+        self.failed = False    # criação descartada: os status seguintes não têm onde ser aplicados
+        self._recorder = recorder
+
+    @property
+    def application_status(self):
+        return self.fields['application_status']
+
+    def update_status(self, status, error_message=None, questions=None, screenshot_path=None):
+        self._recorder.update_status(self, status, error_message, questions, screenshot_path)
+
+
+class ApplicationRecorder:
+    def __init__(self, batch_size: int = 50, flush_interval: float = 2.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.app = None
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, PendingApplication] = {}  # ref -> registro ainda não gravado
+        self._thread = None
+        self._stopping = False
+        self.stats = {'enqueued': 0, 'flushed': 0, 'batches': 0, 'errors': 0, 'retried': 0, 'dropped': 0}
+
+    # -------------------------- ciclo de vida --------------------------
+
+    def start(self, app):
+        """Liga o modo write-behind (thread de flush com app context)"""
+        with self._cond:
+            self.app = app
+            self._stopping = False
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ApplicationRecorder", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Grava o que falta e encerra a thread (chamado também no atexit)"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        # eventos devolvidos à fila ganham as tentativas que faltam antes de encerrar
+        for _ in range(MAX_WRITE_ATTEMPTS):
+            self.flush()
+            with self._cond:
+                if not self._queue:
+                    break
+
+    @property
+    def write_behind(self) -> bool:
+        return self._thread is not None and self.app is not None
+
+    # -------------------------- eventos --------------------------
+
+    def create(self, job_info: Dict, status: str = 'pending', session_id: Optional[str] = None) -> PendingApplication:
+        """Enfileira a criação de um registro; devolve um PendingApplication"""
+        from src.models.application_history import ApplicationHistory
+
+        record = PendingApplication(self, ApplicationHistory.fields_from_job_info(job_info, status, session_id))
+        if status == 'success':
+            self._mark_success(record)
+        self._enqueue(('create', record, None))
+        return record
+
+    def update_status(self, record: PendingApplication, status, error_message=None, questions=None, screenshot_path=None):
+        changes = {'status': status, 'error_message': error_message, 'questions': questions,
+                   'screenshot_path': screenshot_path, 'at': datetime.utcnow()}
+        record.fields['application_status'] = status
+        if status == 'success':
+            self._mark_success(record)
+        self._enqueue(('status', record, changes))
+
+    def _mark_success(self, record: PendingApplication):
+        # a dedup precisa ver a candidatura antes de ela chegar ao banco
+        get_application_dedup_cache().add(record.fields['job_id'], record.fields['job_url'],
+                                          record.fields['attempted_at'])
+
+    def _enqueue(self, event):
+        if not self.write_behind:
+            if self._write([event]) is None and event[0] == 'create':
+                event[1].failed = True
+            return
+        with self._cond:
+            self._pending[event[1].ref] = event[1]
+            self._queue.append(event)
+            self.stats['enqueued'] += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+
+    def pending_success(self, job_id: Optional[str] = None, job_url: Optional[str] = None):
+        """Candidatura 'success' ainda na fila para esta vaga (ApplicationHistory transiente) ou None"""
+        from src.models.application_history import ApplicationHistory
+
+        url = job_url.split('?')[0] if job_url else None
+        with self._cond:
+            for record in self._pending.values():
+                fields = record.fields
+                if record.failed or fields['application_status'] != 'success':
+                    continue
+                if (job_id and fields['job_id'] == job_id) or \
+                        (url and fields['job_url'] and fields['job_url'].split('?')[0] == url):
+                    return ApplicationHistory(**fields)
+        return None
+
+    # -------------------------- flush --------------------------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._queue and not self._stopping:
+                    self._cond.wait(self.flush_interval)
+                elif len(self._queue) < self.batch_size and not self._stopping:
+                    # junta mais eventos até o intervalo ou o tamanho do lote
+                    self._cond.wait(self.flush_interval)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def flush(self) -> int:
+        """
+        Grava os eventos enfileirados (em lotes de batch_size). Retorna quantos foram
+        efetivamente gravados; se algum voltou para a fila, para e deixa para o próximo flush.
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    return written
+                if self.app is not None:
+                    with session_scope(self.app, db):
+                        committed, retry = self._write_batch(batch)
+                else:
+                    committed, retry = self._write_batch(batch)
+                written += committed
+                with self._cond:
+                    # o que falhou volta para o início, na ordem original
+                    self._queue.extendleft(reversed(retry))
+                    still_queued = {event[1].ref for event in self._queue}
+                    for _, record, _ in batch:
+                        if record.ref not in still_queued:
+                            self._pending.pop(record.ref, None)
+                if retry:
+                    return written
+
+    def _write_batch(self, batch: List):
+        """
+        Grava o lote numa transação; se falhar, isola o evento ruim gravando um a um.
+        Retorna (eventos gravados, eventos para tentar de novo).
+        """
+        if len(batch) > 1:
+            committed = self._write(batch)
+            if committed is not None:
+                return committed, []
+            logger.warning(f"⚠️ Regravando os {len(batch)} eventos do lote um a um")
+
+        committed, retry, blocked = 0, [], set()
+        for event in batch:
+            kind, record, _ = event
+            if record.ref in blocked:
+                # um evento anterior do mesmo registro voltou para a fila: mantém a ordem
+                retry.append(event)
+                continue
+            applied = self._write([event])
+            if applied is not None:
+                committed += applied
+                record.attempts = 0
+                continue
+            record.attempts += 1
+            if record.attempts < MAX_WRITE_ATTEMPTS:
+                self.stats['retried'] += 1
+                retry.append(event)
+                blocked.add(record.ref)
+                continue
+            self.stats['dropped'] += 1
+            record.attempts = 0
+            if kind == 'create':
+                record.failed = True
+            logger.error(f"💥 Evento '{kind}' do registro {record.ref} descartado após "
+                         f"{MAX_WRITE_ATTEMPTS} tentativas")
+        return committed, retry
+
+    def _write(self, batch: List) -> Optional[int]:
+        """
+        Aplica os eventos em ordem numa única transação. Retorna quantos foram aplicados,
+        ou None se a transação falhou (rollback, nada gravado).
+        """
+        from src.models.application_history import ApplicationHistory, db
+        from src.models.application_stats import get_application_statistics_cache
+
+        rows = {}
+        created, changed = [], {}  # changed: linha já existente -> status antes do lote
+        applied = 0
+        try:
+            for kind, record, changes in batch:
+                if record.failed:
+                    # a criação foi descartada: não há linha para este status
+                    self.stats['dropped'] += 1
+                    continue
+                if kind == 'create':
+                    row = ApplicationHistory(**record.fields)
+                    db.session.add(row)
+                    rows[record.ref] = row
+                    created.append(row)
+                    applied += 1
+                    continue
+                row = rows.get(record.ref)
+                if row is None and record.id is not None:
+                    row = rows[record.ref] = db.session.get(ApplicationHistory, record.id)
+                if row is None:
+                    logger.warning(f"⚠️ Registro {record.ref} não encontrado para atualizar status")
+                    continue
+                old_status = row.apply_status(changes['status'], changes['error_message'],
+                                              changes['questions'], changes['screenshot_path'], changes['at'])
+                if row not in created:
+                    changed.setdefault(row, old_status)
+                applied += 1
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            self.stats['errors'] += 1
+            logger.error(f"💥 Falha ao gravar lote de {len(batch)} eventos de candidatura: {e}")
+            return None
+
+        for kind, record, _ in batch:
+            if kind == 'create' and record.ref in rows:
+                record.id = rows[record.ref].id
+        stats_cache = get_application_statistics_cache()
+        for row in created:
+            stats_cache.record(row)
+        for row, old_status in changed.items():
+            stats_cache.record(row, old_status=old_status)
+        self.stats['flushed'] += applied
+        self.stats['batches'] += 1
+        return applied
+
+    def info(self) -> Dict:
+        with self._cond:
+            return {'write_behind': self.write_behind, 'queued': len(self._queue),
+                    'batch_size': self.batch_size, 'flush_interval': self.flush_interval, **self.stats}
+
+
+_recorder = ApplicationRecorder()
+
+
+def get_application_recorder() -> ApplicationRecorder:
+    return _recorder
+
+
+atexit.register(_recorder.stop)
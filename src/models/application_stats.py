@@ -0,0 +1,234 @@
+"""
+Estatísticas agregadas do histórico de candidaturas.
+
+Uma única consulta agrupada (empresa, tipo de vaga, plataforma, dia) com contagem
+condicional por status monta os "buckets"; totais, top empresas, séries por dia etc.
+são derivados deles em memória. O resultado fica em cache e é atualizado
+incrementalmente por create_application_record / update_status, então o dashboard
+não relê a tabela inteira a cada chamada.
+
+Workers em outros processos também gravam candidaturas. Antes de servir o cache, get()
+lê o PRAGMA data_version da conexão, que só muda quando outra conexão faz commit; se ele
+não mudou desde a última leitura nessa conexão, o cache é servido sem tocar na tabela.
+Senão, compara uma assinatura barata (MAX(id) e MAX(completed_at), ambos resolvidos pelo
+índice) com a esperada pelas escritas deste processo; se divergir, os buckets são relidos.
+Trocas de status sem completed_at (ex.: skipped) não mudam a assinatura: para elas os
+buckets também expiram depois de JOBHUNTER_STATS_CACHE_TTL segundos (padrão 30).
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+STATUSES = ('success', 'failed', 'pending', 'skipped')
+
+BucketKey = Tuple[str, str, str, str]  # (empresa, tipo de vaga, plataforma, dia)
+Signature = Tuple[int, str]  # (maior id, maior completed_at)
+DataVersion = Tuple[int, int]  # (conexão, PRAGMA data_version)
+
+DEFAULT_TTL_SECONDS = 30.0
+
+
+def _day(value) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    return str(value or '')[:10]
+
+
+def query_buckets(session_id: Optional[str] = None) -> Dict[BucketKey, Dict[str, int]]:
+    """Uma consulta GROUP BY com SUM(CASE ...) por status (precisa de app context)."""
+    from src.models.application_history import ApplicationHistory, db
+
+    day = db.func.date(ApplicationHistory.attempted_at)
+    status_columns = [
+        db.func.sum(db.case((ApplicationHistory.application_status == status, 1), else_=0))
+        for status in STATUSES
+    ]
+    query = db.session.query(
+        ApplicationHistory.company_name,
+        ApplicationHistory.job_type,
+        ApplicationHistory.platform,
+        day,
+        db.func.count(ApplicationHistory.id),
+        *status_columns
+    )
+    if session_id:
+        query = query.filter(ApplicationHistory.automation_session_id == session_id)
+    rows = query.group_by(
+        ApplicationHistory.company_name, ApplicationHistory.job_type, ApplicationHistory.platform, day
+    ).all()
+
+    buckets = {}
+    for company, job_type, platform, row_day, total, *by_status in rows:
+        counts = {status: int(n or 0) for status, n in zip(STATUSES, by_status)}
+        # status fora da lista conhecida entram só no total
+        counts['total'] = int(total or 0)
+        buckets[(company or '', job_type or '', platform or '', _day(row_day))] = counts
+    return buckets
+
+
+def query_signature() -> Signature:
+    """MAX(id) e MAX(completed_at) da tabela, sem varrer linhas (precisa de app context)."""
+    from src.models.application_history import ApplicationHistory, db
+
+    max_id, max_completed = db.session.query(
+        db.func.max(ApplicationHistory.id),
+        db.func.max(ApplicationHistory.completed_at)
+    ).one()
+    return int(max_id or 0), str(max_completed or '')
+
+
+def query_data_version() -> Optional[DataVersion]:
+    """
+    (id da conexão DBAPI, PRAGMA data_version) da conexão da sessão; None fora do SQLite.
+    O valor é por conexão, então só é comparável com uma leitura feita na mesma conexão.
+    """
+    from sqlalchemy import text
+    from src.models.application_history import db
+
+    connection = db.session.connection()
+    if connection.dialect.name != 'sqlite':
+        return None
+    version = connection.execute(text("PRAGMA data_version")).scalar()
+    return id(connection.connection.dbapi_connection), int(version or 0)
+
+
+def summarize(buckets: Dict[BucketKey, Dict[str, int]], top_companies: int = 10) -> Dict:
+    """Deriva totais e quebras por empresa / tipo / plataforma / dia a partir dos buckets."""
+    totals = defaultdict(int)
+    by_company = defaultdict(lambda: defaultdict(int))
+    by_job_type = defaultdict(lambda: defaultdict(int))
+    by_platform = defaultdict(lambda: defaultdict(int))
+    by_day = defaultdict(lambda: defaultdict(int))
+
+    for (company, job_type, platform, day), counts in buckets.items():
+        for key, n in counts.items():
+            totals[key] += n
+            by_company[company][key] += n
+            by_job_type[job_type or 'não informado'][key] += n
+            by_platform[platform][key] += n
+            by_day[day][key] += n
+
+    def _rate(counts):
+        return round(counts['success'] / counts['total'] * 100, 2) if counts['total'] else 0
+
+    def _breakdown(groups):
+        return {name: {**counts, 'success_rate': _rate(counts)} for name, counts in groups.items()}
+
+    companies = sorted(by_company.items(), key=lambda item: item[1]['total'], reverse=True)[:top_companies]
+    return {
+        'total_applications': totals['total'],
+        'successful_applications': totals['success'],
+        'failed_applications': totals['failed'],
+        'pending_applications': totals['pending'],
+        'skipped_applications': totals['skipped'],
+        'success_rate': _rate(totals),
+        'company_statistics': [
+            {
+                'company': company,
+                'total_applications': counts['total'],
+                'successful_applications': counts['success'],
+                'success_rate': _rate(counts)
+            }
+            for company, counts in companies
+        ],
+        'by_job_type': _breakdown(by_job_type),
+        'by_platform': _breakdown(by_platform),
+        'by_day': _breakdown(dict(sorted(by_day.items())))
+    }
+
+
+class ApplicationStatisticsCache:
+    """Buckets globais em memória, carregados sob demanda e mantidos pelos writes do modelo."""
+
+    def __init__(self, ttl: Optional[float] = None):
+        if ttl is None:
+            ttl = float(os.environ.get("JOBHUNTER_STATS_CACHE_TTL", DEFAULT_TTL_SECONDS))
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._buckets: Optional[Dict[BucketKey, Dict[str, int]]] = None
+        self._summary: Optional[Dict] = None
+        self._summary_top = None
+        self._signature: Optional[Signature] = None  # esperada, já contando as escritas locais
+        self._data_version: Optional[DataVersion] = None
+        self._loaded_at = 0.0
+        self.stats = {'loads': 0, 'hits': 0, 'external_changes': 0, 'signature_checks': 0}
+
+    def get(self, top_companies: int = 10) -> Dict:
+        data_version = query_data_version()
+        with self._lock:
+            unchanged = (data_version is not None and data_version == self._data_version
+                         and self._buckets is not None)
+        signature = None
+        if not unchanged:
+            signature = query_signature()
+        with self._lock:
+            if signature is not None:
+                self.stats['signature_checks'] += 1
+            if self._buckets is not None:
+                if signature is not None and signature != self._signature:
+                    # outro processo gravou (ou a estimativa local divergiu): relê
+                    self.stats['external_changes'] += 1
+                    self._buckets = None
+                elif time.monotonic() - self._loaded_at >= self.ttl:
+                    self._buckets = None
+            if self._buckets is None:
+                self._buckets = query_buckets()
+                self._signature = signature if signature is not None else query_signature()
+                self._loaded_at = time.monotonic()
+                self._summary = None
+                self.stats['loads'] += 1
+            else:
+                self.stats['hits'] += 1
+            self._data_version = data_version
+            if self._summary is None or self._summary_top != top_companies:
+                self._summary = summarize(self._buckets, top_companies)
+                self._summary_top = top_companies
+            return self._summary
+
+    def record(self, application, old_status: Optional[str] = None):
+        """
+        Aplica uma escrita ao cache: nova candidatura (old_status=None) ou troca de status.
+        Se o cache ainda não foi carregado, não há nada a atualizar.
+        """
+        with self._lock:
+            if self._buckets is None:
+                return
+            key = (application.company_name or '', application.job_type or '',
+                   application.platform or '', _day(application.attempted_at))
+            counts = self._buckets.setdefault(key, dict.fromkeys(STATUSES + ('total',), 0))
+            if old_status is None:
+                counts['total'] += 1
+            elif old_status in counts:
+                counts[old_status] -= 1
+            if application.application_status in STATUSES:
+                counts[application.application_status] = counts.get(application.application_status, 0) + 1
+            self._summary = None
+            self._expect_locked(application, created=old_status is None)
+
+    def _expect_locked(self, application, created: bool):
+        """Avança a assinatura esperada com uma escrita deste processo"""
+        if self._signature is None:
+            return
+        max_id, max_completed = self._signature
+        if created:
+            max_id = max(max_id, application.id or 0)
+        if application.completed_at is not None:
+            max_completed = max(max_completed, str(application.completed_at))
+        self._signature = (max_id, max_completed)
+
+    def invalidate(self):
+        with self._lock:
+            self._buckets = None
+            self._summary = None
+            self._signature = None
+            self._data_version = None
+
+
+_cache = ApplicationStatisticsCache()
+
+
+def get_application_statistics_cache() -> ApplicationStatisticsCache:
+    return _cache
@@ -0,0 +1,234 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+from src.models.user import db
+from src.automation.event_stream import get_event_hub
+
+
+class AutomationJob(db.Model):
+    """Execução de automação enfileirada (fila durável consumida por src/worker.py)"""
+
+    __tablename__ = 'automation_jobs'
+    __table_args__ = (
+        db.Index('ix_automation_jobs_status_created', 'status', 'created_at'),
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))  # = session_id
+    platform = db.Column(db.String(50), nullable=False, default='linkedin')
+
+    # Status: queued, running, succeeded, failed, cancelled
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    payload = db.Column(db.Text, nullable=True)  # JSON: critérios, block_resources...
+
+    # Worker
+    worker_id = db.Column(db.String(100), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+
+    # Progresso / resultado
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    current_platform = db.Column(db.String(50), nullable=True)
+    result = db.Column(db.Text, nullable=True)  # JSON
+    error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    ACTIVE = ('queued', 'running')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'session_id': self.id,
+            'platform': self.platform,
+            'status': self.status,
+            'running': self.status in AutomationJob.ACTIVE,
+            'payload': json.loads(self.payload) if self.payload else {},
+            'worker_id': self.worker_id,
+            'claimed_at': self.claimed_at.isoformat() if self.claimed_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'cancel_requested': self.cancel_requested,
+            'attempts': self.attempts,
+            'progress': self.progress,
+            'current_platform': self.current_platform or '',
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    # -------------------------- Fila --------------------------
+
+    @staticmethod
+    def enqueue(payload, platform='linkedin'):
+        """Cria um job 'queued'. Retorna o job (id = session_id)"""
+        job = AutomationJob(platform=platform, payload=json.dumps(payload or {}), status='queued')
+        db.session.add(job)
+        db.session.commit()
+        AutomationJobEvent.add(job.id, "📥 Automação enfileirada", "INFO")
+        return job
+
+    @staticmethod
+    def claim_next(worker_id, platform=None, max_running=None):
+        """
+        Reivindica o job 'queued' mais antigo. O UPDATE condicional (status='queued')
+        garante que só um worker ganha o job, mesmo com vários processos. Com
+        `max_running`, o mesmo UPDATE só passa se houver menos de N jobs 'running'
+        (limite de sessões simultâneas do host).
+        """
+        for _ in range(5):
+            query = AutomationJob.query.filter_by(status='queued', cancel_requested=False)
+            if platform:
+                query = query.filter_by(platform=platform)
+            candidate = query.order_by(AutomationJob.created_at).first()
+            if not candidate:
+                return None
+            now = datetime.utcnow()
+            claim = AutomationJob.query.filter_by(id=candidate.id, status='queued')
+            if max_running:
+                running = db.select(db.func.count(AutomationJob.id)).where(
+                    AutomationJob.status == 'running'
+                ).scalar_subquery()
+                claim = claim.filter(running < max_running)
+            claimed = claim.update({
+                'status': 'running',
+                'worker_id': worker_id,
+                'claimed_at': now,
+                'heartbeat_at': now,
+                'attempts': AutomationJob.attempts + 1
+            }, synchronize_session=False)
+            db.session.commit()
+            if claimed:
+                db.session.expire_all()
+                return db.session.get(AutomationJob, candidate.id)
+            if max_running and AutomationJob.running_count() >= max_running:
+                return None
+        return None
+
+    @staticmethod
+    def running_count():
+        return AutomationJob.query.filter_by(status='running').count()
+
+    @staticmethod
+    def heartbeat(job_id, progress=None, current_platform=None):
+        """Atualiza heartbeat (e progresso). Retorna True se foi pedido cancelamento."""
+        values = {'heartbeat_at': datetime.utcnow()}
+        if progress is not None:
+            values['progress'] = progress
+        if current_platform is not None:
+            values['current_platform'] = current_platform
+        AutomationJob.query.filter_by(id=job_id).update(values, synchronize_session=False)
+        db.session.commit()
+        get_event_hub().publish_progress(job_id, state='running', **{k: v for k, v in values.items() if k != 'heartbeat_at'})
+        row = db.session.query(AutomationJob.cancel_requested).filter_by(id=job_id).first()
+        return bool(row and row[0])
+
+    @staticmethod
+    def finish(job_id, status, result=None, error=None):
+        AutomationJob.query.filter_by(id=job_id).update({
+            'status': status,
+            'progress': 100,
+            'result': json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+            'error': error,
+            'finished_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        get_event_hub().publish_progress(job_id, finished=True, state=status, progress=100)
+
+    @staticmethod
+    def request_cancel(job_id=None):
+        """Pede cancelamento de um job (ou de todos os ativos). Jobs ainda na fila são cancelados na hora."""
+        query = AutomationJob.query.filter(AutomationJob.status.in_(AutomationJob.ACTIVE))
+        if job_id:
+            query = query.filter_by(id=job_id)
+        jobs = query.all()
+        for job in jobs:
+            job.cancel_requested = True
+            if job.status == 'queued':
+                job.status = 'cancelled'
+                job.finished_at = datetime.utcnow()
+        db.session.commit()
+        for job in jobs:
+            AutomationJobEvent.add(job.id, "🛑 Cancelamento solicitado pelo usuário", "WARNING")
+            get_event_hub().publish_progress(job.id, finished=job.status == 'cancelled', state=job.status)
+        return [job.id for job in jobs]
+
+    @staticmethod
+    def requeue_stale(timeout_seconds=120, max_attempts=3):
+        """Devolve à fila jobs 'running' cujo worker parou de mandar heartbeat."""
+        cutoff = datetime.utcnow() - timedelta(seconds=timeout_seconds)
+        stale = AutomationJob.query.filter(
+            AutomationJob.status == 'running',
+            AutomationJob.heartbeat_at < cutoff
+        ).all()
+        for job in stale:
+            if job.cancel_requested or job.attempts >= max_attempts:
+                job.status = 'failed' if not job.cancel_requested else 'cancelled'
+                job.error = job.error or 'Worker parou de responder'
+                job.finished_at = datetime.utcnow()
+            else:
+                job.status = 'queued'
+                job.worker_id = None
+        db.session.commit()
+        for job in stale:
+            AutomationJobEvent.add(job.id, f"♻️ Worker sem heartbeat; job agora '{job.status}'", "WARNING")
+            get_event_hub().publish_progress(job.id, finished=job.status != 'queued', state=job.status)
+        return len(stale)
+
+    @staticmethod
+    def latest():
+        return AutomationJob.query.order_by(AutomationJob.created_at.desc()).first()
+
+
+class AutomationJobEvent(db.Model):
+    """Linha de progresso/log de um job (id crescente serve de cursor)"""
+
+    __tablename__ = 'automation_job_events'
+    __table_args__ = (
+        db.Index('ix_automation_job_events_job_id', 'job_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), db.ForeignKey('automation_jobs.id'), nullable=False)
+    level = db.Column(db.String(20), nullable=False, default='INFO')
+    message = db.Column(db.Text, nullable=False)
+    progress = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'timestamp': self.created_at.strftime("%H:%M:%S") if self.created_at else None,
+            'level': self.level,
+            'message': self.message,
+            'progress': self.progress
+        }
+
+    @staticmethod
+    def add(job_id, message, level="INFO", progress=None):
+        event = AutomationJobEvent(job_id=job_id, message=message, level=level, progress=progress)
+        db.session.add(event)
+        db.session.commit()
+        # o id da linha é o cursor do stream (SSE / long-poll)
+        get_event_hub().publish(job_id, event.to_dict())
+        return event
+
+    @staticmethod
+    def since(job_id, after_id=0, limit=100):
+        return AutomationJobEvent.query.filter(
+            AutomationJobEvent.job_id == job_id,
+            AutomationJobEvent.id > after_id
+        ).order_by(AutomationJobEvent.id).limit(limit).all()
+
+    @staticmethod
+    def last_id(job_id):
+        return db.session.query(db.func.max(AutomationJobEvent.id)).filter_by(job_id=job_id).scalar() or 0
+
+    @staticmethod
+    def tail(job_id, limit=100):
+        events = AutomationJobEvent.query.filter_by(job_id=job_id).order_by(
+            AutomationJobEvent.id.desc()
+        ).limit(limit).all()
+        return list(reversed(events))
@@ -0,0 +1,276 @@
+"""
+Cache dos detalhes das vagas (descrição, requisitos, método de candidatura) por job_id.
+
+O painel de detalhes de uma vaga era aberto e lido de novo a cada execução, mesmo para
+vagas já vistas, e Job.description / Job.requirements nunca eram preenchidos. Aqui a
+primeira leitura do painel (ou da resposta JSON da API) fica gravada na tabela
+job_details com um hash do conteúdo, a hora da leitura (fetched_at) e a última vez que
+a vaga apareceu numa lista (last_seen_at). Nas execuções seguintes a automação lê daqui:
+    - a lista já chega com descrição/método de candidatura (priorização antes do clique);
+    - vagas de candidatura externa nem são abertas numa busca Easy Apply;
+    - o painel só é relido quando o registro passa de JOBHUNTER_JOB_DETAIL_TTL_DAYS dias.
+
+A frente é um LRU em memória; as escritas ficam pendentes e vão ao banco em lote
+(flush a cada FLUSH_EVERY alterações e no fim de cada execução). Sem app context
+(bot avulso) o cache funciona só em memória.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from flask import has_app_context
+
+from src.models.user import db
+
+logger = logging.getLogger("JobDetailCache")
+
+DEFAULT_TTL_DAYS = 14
+FLUSH_EVERY = 20
+
+# títulos de seção que abrem a lista de requisitos / que a encerram
+_REQUIREMENTS_HEADING = re.compile(
+    r"^(requisitos|requerimentos|qualifica[cç][õo]es|pr[ée]-?requisitos|exig[êe]ncias|"
+    r"o que (voc[êe]|buscamos|esperamos)|requirements|qualifications|what you)", re.I)
+_OTHER_HEADING = re.compile(
+    r"^(benef[íi]cios|responsabilidades|atividades|atribui[cç][õo]es|diferenciais|sobre|"
+    r"local|hor[áa]rio|remunera[cç][ãa]o|benefits|responsibilities|about)", re.I)
+_BULLET = re.compile(r"^[\s•\-–*·●▪]+")
+MAX_REQUIREMENTS = 30
+
+
+def extract_requirements(description: Optional[str]) -> List[str]:
+    """Linhas da seção de requisitos/qualificações da descrição (lista vazia se não houver)"""
+    lines = [line.strip() for line in (description or "").splitlines()]
+    requirements = []
+    inside = False
+    for line in lines:
+        if not line:
+            continue
+        heading = _BULLET.sub("", line)
+        if _REQUIREMENTS_HEADING.match(heading) and len(heading) <= 80:
+            inside = True
+            # "Requisitos: Excel avançado" -> o resto da linha também é requisito
+            rest = heading.split(":", 1)[1].strip() if ":" in heading else ""
+            if rest:
+                requirements.append(rest)
+            continue
+        if inside and _OTHER_HEADING.match(heading) and len(heading) <= 80:
+            inside = False
+            continue
+        if inside:
+            requirements.append(heading)
+            if len(requirements) >= MAX_REQUIREMENTS:
+                break
+    return requirements
+
+
+def content_hash(description: Optional[str], requirements: Optional[List[str]], apply_method: Optional[str]) -> str:
+    normalized = " ".join((description or "").split())
+    raw = json.dumps([normalized, requirements or [], apply_method or ""], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class JobDetail(db.Model):
+    __tablename__ = 'job_details'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(255), nullable=False, unique=True, index=True)
+    platform = db.Column(db.String(50), default='LinkedIn')
+    title = db.Column(db.String(255))
+    company = db.Column(db.String(255))
+    description = db.Column(db.Text)
+    requirements = db.Column(db.Text)  # JSON (lista de linhas)
+    apply_method = db.Column(db.String(20))  # easy_apply, external
+    content_hash = db.Column(db.String(64), nullable=False)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # última leitura do painel/API
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow)  # última vez que apareceu numa lista
+    change_seq = db.Column(db.Integer, index=True)  # contador de alterações, preenchido por trigger (migração 0008)
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'platform': self.platform,
+            'title': self.title,
+            'company': self.company,
+            'description': self.description,
+            'requirements': json.loads(self.requirements) if self.requirements else [],
+            'apply_method': self.apply_method,
+            'content_hash': self.content_hash,
+            'fetched_at': self.fetched_at,
+            'last_seen_at': self.last_seen_at
+        }
+
+
+class JobDetailCache:
+    def __init__(self, ttl_days: Optional[float] = None, lru_size: int = 2_000):
+        if ttl_days is None:
+            ttl_days = float(os.environ.get("JOBHUNTER_JOB_DETAIL_TTL_DAYS", DEFAULT_TTL_DAYS))
+        self.ttl = timedelta(days=ttl_days)
+        self.lru_size = lru_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._dirty: Dict[str, str] = {}  # job_id -> 'detail' (upsert) | 'seen' (só last_seen_at)
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'stored': 0, 'unchanged': 0, 'flushed': 0}
+
+    # -------------------------- leitura --------------------------
+
+    def _load(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is not None:
+                self._entries.move_to_end(job_id)
+                return entry
+        if not has_app_context():
+            return None
+        row = JobDetail.query.filter_by(job_id=job_id).first()
+        if row is None:
+            return None
+        entry = row.to_dict()
+        with self._lock:
+            self._remember_locked(job_id, entry)
+        return entry
+
+    def _remember_locked(self, job_id: str, entry: Dict):
+        self._entries[job_id] = entry
+        self._entries.move_to_end(job_id)
+        while len(self._entries) > self.lru_size:
+            # entradas ainda não gravadas ficam em memória até o flush
+            victim = next((key for key in self._entries if key not in self._dirty), None)
+            if victim is None:
+                break
+            del self._entries[victim]
+
+    def is_fresh(self, entry: Optional[Dict]) -> bool:
+        return bool(entry) and entry.get('fetched_at') is not None and \
+            datetime.utcnow() - entry['fetched_at'] < self.ttl
+
+    def get(self, job_id: Optional[str], allow_stale: bool = False) -> Optional[Dict]:
+        """Detalhes da vaga se estiverem no cache e dentro do TTL (ou qualquer idade com allow_stale)"""
+        if not job_id:
+            return None
+        entry = self._load(str(job_id))
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        if not allow_stale and not self.is_fresh(entry):
+            self.stats['stale'] += 1
+            return None
+        self.stats['hits'] += 1
+        return dict(entry)
+
+    def seen(self, job_id: Optional[str]) -> Optional[Dict]:
+        """get() + marca a vaga como vista agora numa lista (last_seen_at)"""
+        entry = self.get(job_id)
+        if entry is not None:
+            with self._lock:
+                cached = self._entries.get(str(job_id))
+                if cached is not None:
+                    cached['last_seen_at'] = datetime.utcnow()
+                    self._dirty.setdefault(str(job_id), 'seen')
+            self._maybe_flush()
+        return entry
+
+    # -------------------------- escrita --------------------------
+
+    def store(self, job_id: Optional[str], description: Optional[str] = None, apply_method: Optional[str] = None,
+              title: Optional[str] = None, company: Optional[str] = None, platform: str = 'LinkedIn') -> Optional[Dict]:
+        """
+        Guarda o que foi lido do painel/API. Se o conteúdo não mudou (mesmo hash) só renova
+        fetched_at/last_seen_at. Retorna a entrada (com `requirements` extraídos da descrição).
+        """
+        if not job_id or not (description or apply_method):
+            return None
+        job_id = str(job_id)
+        current = self._load(job_id)
+        description = description or (current or {}).get('description')
+        apply_method = apply_method or (current or {}).get('apply_method')
+        requirements = extract_requirements(description)
+        digest = content_hash(description, requirements, apply_method)
+        now = datetime.utcnow()
+        with self._lock:
+            if current is not None and current.get('content_hash') == digest:
+                current['fetched_at'] = current['last_seen_at'] = now
+                self.stats['unchanged'] += 1
+                entry = current
+            else:
+                entry = {
+                    'job_id': job_id, 'platform': platform,
+                    'title': title or (current or {}).get('title'),
+                    'company': company or (current or {}).get('company'),
+                    'description': description, 'requirements': requirements,
+                    'apply_method': apply_method, 'content_hash': digest,
+                    'fetched_at': now, 'last_seen_at': now
+                }
+                self._remember_locked(job_id, entry)
+                self.stats['stored'] += 1
+            self._dirty[job_id] = 'detail'
+        self._maybe_flush()
+        return dict(entry)
+
+    def _maybe_flush(self):
+        with self._lock:
+            pending = len(self._dirty)
+        if pending >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> int:
+        """Grava as alterações pendentes numa única transação (precisa de app context)"""
+        if not has_app_context():
+            return 0
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            entries = {job_id: dict(self._entries[job_id]) for job_id in dirty if job_id in self._entries}
+        if not entries:
+            return 0
+        try:
+            rows = {row.job_id: row for row in JobDetail.query.filter(JobDetail.job_id.in_(list(entries))).all()}
+            for job_id, entry in entries.items():
+                row = rows.get(job_id)
+                if row is None:
+                    row = JobDetail(job_id=job_id)
+                    db.session.add(row)
+                if dirty[job_id] == 'detail' or row.content_hash is None:
+                    row.platform = entry['platform']
+                    row.title = entry['title']
+                    row.company = entry['company']
+                    row.description = entry['description']
+                    row.requirements = json.dumps(entry['requirements'], ensure_ascii=False)
+                    row.apply_method = entry['apply_method']
+                    row.content_hash = entry['content_hash']
+                    row.fetched_at = entry['fetched_at']
+                row.last_seen_at = entry['last_seen_at']
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # devolve as pendências para a próxima tentativa
+            with self._lock:
+                for job_id, kind in dirty.items():
+                    if self._dirty.get(job_id) != 'detail':
+                        self._dirty[job_id] = kind
+            logger.warning(f"⚠️ Falha ao gravar {len(entries)} detalhes de vagas: {e}")
+            return 0
+        self.stats['flushed'] += len(entries)
+        return len(entries)
+
+    def info(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'pending': len(self._dirty),
+                    'ttl_days': self.ttl.days, **self.stats}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_job_detail_cache() -> JobDetailCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = JobDetailCache()
+        return _cache
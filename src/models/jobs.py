@@ -1,8 +1,17 @@
+from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from src.models.user import db
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    # mesmos índices das migrações (src/database/migrations.py): paginação keyset (created_at, id) + filtros
+    __table_args__ = (
+        db.Index('ix_jobs_created_id', 'created_at', 'id'),
+        db.Index('ix_jobs_status_created', 'status', 'created_at', 'id'),
+        db.Index('ix_jobs_company_created', 'company', 'created_at', 'id'),
+        db.Index('ix_jobs_job_type_created', 'job_type', 'created_at', 'id'),
+        db.Index('ix_jobs_platform_created', 'platform', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.String(255), nullable=False)  # ID único da vaga
@@ -19,9 +28,32 @@ class Job(db.Model):
     requirements = db.Column(db.Text)  # JSON string com requisitos
     modality = db.Column(db.String(50))  # híbrido, presencial, remoto
     job_type = db.Column(db.String(100))  # Analista financeiro, Contas a pagar, etc.
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    automation_session_id = db.Column(db.String(36), index=True)  # sessão (AutomationJob) que aplicou
+    # datetime do Python (UTC, como CURRENT_TIMESTAMP) para o texto gravado bater com o cursor keyset
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
     
+    @staticmethod
+    def filtered_query(status=None, company=None, job_type=None, platform=None,
+                       date_from=None, date_to=None, session_id=None):
+        """Consulta com os filtros de /api/results (cada um coberto por um índice (coluna, created_at, id))"""
+        query = Job.query
+        if status:
+            query = query.filter(Job.status == status)
+        if company:
+            query = query.filter(Job.company == company)
+        if job_type:
+            query = query.filter(Job.job_type == job_type)
+        if platform:
+            query = query.filter(Job.platform == platform)
+        if session_id:
+            query = query.filter(Job.automation_session_id == session_id)
+        if date_from:
+            query = query.filter(Job.created_at >= date_from)
+        if date_to:
+            query = query.filter(Job.created_at < date_to)
+        return query
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -39,6 +71,7 @@ class Job(db.Model):
             'requirements': self.requirements,
             'modality': self.modality,
             'job_type': self.job_type,
+            'automation_session_id': self.automation_session_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
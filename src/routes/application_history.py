@@ -1,19 +1,74 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from src.database.keyset import InvalidCursor, keyset_query, page_size, parse_date, stream_page, wants_total
+from src.database.search_index import search
 from src.models.application_history import ApplicationHistory, db
+from src.models.application_dedup import get_application_dedup_cache
 
 application_history_bp = Blueprint('application_history', __name__)
 
 @application_history_bp.route('/api/applications/history', methods=['GET'])
 def get_application_history():
-    """Obtém o histórico de inscrições"""
+    """
+    Obtém o histórico de inscrições, paginado por cursor (attempted_at, id), mais recentes primeiro.
+    Filtros: status, company, job_type, platform, session_id, date_from, date_to.
+    A próxima página vem de ?cursor=<next_cursor>; ?with_total=1 inclui o total do filtro.
+    """
     try:
-        limit = request.args.get('limit', 50, type=int)
-        applications = ApplicationHistory.get_recent_applications(limit)
+        limit = page_size(request.args.get('limit'), 50)
+        query = ApplicationHistory.filtered_query(
+            status=request.args.get('status'),
+            company=request.args.get('company'),
+            job_type=request.args.get('job_type'),
+            platform=request.args.get('platform'),
+            session_id=request.args.get('session_id'),
+            date_from=parse_date(request.args.get('date_from')),
+            date_to=parse_date(request.args.get('date_to'))
+        )
+        total_query = query if wants_total(request.args.get('with_total')) else None
+        query = keyset_query(query, ApplicationHistory.attempted_at, ApplicationHistory.id,
+                             request.args.get('cursor'), limit)
+        
+        body = stream_page(query, 'applications', limit,
+                           serialize=lambda app: app.to_dict(),
+                           cursor_of=lambda app: (app.attempted_at, app.id),
+                           total_query=total_query)
+        return Response(stream_with_context(body), mimetype='application/json')
+        
+    except InvalidCursor as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@application_history_bp.route('/api/jobs/search', methods=['GET'])
+def search_jobs():
+    """
+    Busca textual (FTS5) em vagas coletadas e no histórico de candidaturas.
+    ?q=contas a pagar híbrido [&source=job|application] [&status=] [&limit=20] [&offset=0]
+    Resultados por relevância, com título/empresa destacados e trecho da descrição.
+    """
+    try:
+        q = (request.args.get('q') or '').strip()
+        if not q:
+            return jsonify({
+                'success': False,
+                'error': 'Parâmetro q é obrigatório'
+            }), 400
+        limit = page_size(request.args.get('limit'), 20)
+        offset = max(0, request.args.get('offset', 0, type=int))
+        results = search(db.session, q, source=request.args.get('source'),
+                         status=request.args.get('status'), limit=limit, offset=offset)
         
         return jsonify({
             'success': True,
-            'applications': applications,
-            'total': len(applications)
+            'query': q,
+            'results': results,
+            'count': len(results)
         })
         
     except Exception as e:
@@ -26,41 +81,14 @@ def get_application_history():
 def get_application_statistics():
     """Obtém estatísticas gerais de inscrições"""
     try:
-        # Estatísticas gerais
-        total_applications = ApplicationHistory.query.count()
-        successful_applications = ApplicationHistory.query.filter_by(application_status='success').count()
-        failed_applications = ApplicationHistory.query.filter_by(application_status='failed').count()
-        pending_applications = ApplicationHistory.query.filter_by(application_status='pending').count()
-        
-        success_rate = (successful_applications / total_applications * 100) if total_applications > 0 else 0
-        
-        # Estatísticas por empresa (top 10)
-        from sqlalchemy import func
-        company_stats = db.session.query(
-            ApplicationHistory.company_name,
-            func.count(ApplicationHistory.id).label('total'),
-            func.sum(func.case([(ApplicationHistory.application_status == 'success', 1)], else_=0)).label('success')
-        ).group_by(ApplicationHistory.company_name).order_by(func.count(ApplicationHistory.id).desc()).limit(10).all()
-        
-        company_statistics = []
-        for company, total, success in company_stats:
-            company_statistics.append({
-                'company': company,
-                'total_applications': total,
-                'successful_applications': success or 0,
-                'success_rate': (success / total * 100) if total > 0 and success else 0
-            })
+        top = request.args.get('top', 10, type=int)
+        
+        # Uma consulta agrupada (status x empresa x tipo x plataforma x dia), em cache
+        statistics = ApplicationHistory.get_statistics(top_companies=top)
         
         return jsonify({
             'success': True,
-            'statistics': {
-                'total_applications': total_applications,
-                'successful_applications': successful_applications,
-                'failed_applications': failed_applications,
-                'pending_applications': pending_applications,
-                'success_rate': round(success_rate, 2),
-                'company_statistics': company_statistics
-            }
+            'statistics': statistics
         })
         
     except Exception as e:
@@ -73,7 +101,8 @@ def get_application_statistics():
 def get_session_statistics(session_id):
     """Obtém estatísticas de uma sessão específica"""
     try:
-        statistics = ApplicationHistory.get_session_statistics(session_id)
+        include_applications = request.args.get('include_applications', 'true').lower() != 'false'
+        statistics = ApplicationHistory.get_session_statistics(session_id, include_applications)
         
         return jsonify({
             'success': True,
@@ -116,6 +145,32 @@ def check_duplicate_application():
             'error': str(e)
         }), 500
 
+@application_history_bp.route('/api/applications/check-duplicates', methods=['POST'])
+def check_duplicate_applications_batch():
+    """Verifica uma página inteira de job_ids de uma vez"""
+    try:
+        data = request.get_json() or {}
+        job_ids = data.get('job_ids') or []
+        days = data.get('days', 30)
+        
+        duplicates = ApplicationHistory.check_duplicates_batch(job_ids, days)
+        
+        return jsonify({
+            'success': True,
+            'duplicates': {
+                job_id: attempted_at.isoformat() if attempted_at else None
+                for job_id, attempted_at in duplicates.items()
+            },
+            'checked': len(job_ids),
+            'cache': get_application_dedup_cache().stats()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @application_history_bp.route('/api/applications/create', methods=['POST'])
 def create_application_record():
     """Cria um novo registro de inscrição"""
@@ -1,286 +1,356 @@
 import json
 import time
-import threading
-import uuid
-from flask import Blueprint, request, jsonify, current_app
-from src.automation.linkedin_full_flow import LinkedInFullFlow
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from src.automation.event_stream import get_event_hub
+from src.database.keyset import InvalidCursor, keyset_query, page_size, parse_date, stream_page, wants_total
+from src.automation.linkedin_super_robust_driver import LinkedInSuperRobustDriver
+from src.automation.browser_pool import get_browser_pool
+from src.automation.session_registry import get_session_registry, max_concurrent_sessions
+from src.models.automation_job import AutomationJob, AutomationJobEvent
 from src.models.jobs import Job, db
 from src.models.credentials import Credentials
+from src.worker import ensure_embedded_workers
 
 automation_bp = Blueprint('automation', __name__)
 
-# Variável global para controlar o status da automação
-automation_status = {
-    'running': False,
-    'progress': 0,
-    'current_platform': '',
-    'logs': [],
-    'results': {
-        'total_jobs': 0,
-        'applications_sent': 0,
-        'success_rate': 0,
-        'jobs_by_platform': {}
-    }
+EMPTY_RESULTS = {
+    'total_jobs': 0,
+    'applications_sent': 0,
+    'success_rate': 0,
+    'jobs_by_platform': {}
 }
 
-def add_log(message, level="INFO"):
-    """Adiciona log ao status da automação"""
-    timestamp = time.strftime("%H:%M:%S")
-    log_entry = {
-        'timestamp': timestamp,
-        'level': level,
-        'message': message
+
+def _find_job(session_id=None):
+    """Job pedido (?session_id=) ou o mais recente"""
+    if session_id:
+        return db.session.get(AutomationJob, session_id)
+    return AutomationJob.latest()
+
+
+def _tail_logs(session_id, limit=100):
+    """Últimos logs: do ring buffer em memória quando ele tem o trecho, senão do banco"""
+    if limit <= 0:
+        return []
+    buffer = get_event_hub().get(session_id)
+    if buffer and buffer.local:
+        entries = buffer.tail(limit)
+        if len(entries) >= limit or buffer.covers(0):
+            return entries
+    return [e.to_dict() for e in AutomationJobEvent.tail(session_id, limit)]
+
+
+def _events_after(session_id, after_id, limit=200):
+    """Logs com id > after_id: ring buffer se cobrir o trecho, senão banco (worker em outro processo)"""
+    buffer = get_event_hub().get(session_id)
+    if buffer and buffer.covers(after_id):
+        return buffer.since(after_id)[:limit]
+    return [e.to_dict() for e in AutomationJobEvent.since(session_id, after_id, limit)]
+
+
+def _progress_snapshot(job):
+    return {
+        'state': job.status,
+        'running': job.status in AutomationJob.ACTIVE,
+        'progress': job.progress,
+        'current_platform': job.current_platform or ''
+    }
+
+
+def _job_status(job, log_limit=100):
+    """Status no formato que o frontend já consome (running/progress/logs/results)"""
+    if not job:
+        return {
+            'running': False,
+            'progress': 0,
+            'current_platform': '',
+            'logs': [],
+            'results': dict(EMPTY_RESULTS)
+        }
+    data = job.to_dict()
+    return {
+        'session_id': job.id,
+        'state': job.status,
+        'running': data['running'],
+        'cancel_requested': job.cancel_requested,
+        'progress': job.progress,
+        'current_platform': data['current_platform'],
+        'worker_id': job.worker_id,
+        'logs': _tail_logs(job.id, log_limit),
+        'results': data['result'] or dict(EMPTY_RESULTS),
+        'error': job.error
     }
-    automation_status['logs'].append(log_entry)
-    
-    # Mantém apenas os últimos 100 logs
-    if len(automation_status['logs']) > 100:
-        automation_status['logs'] = automation_status['logs'][-100:]
-
-def run_linkedin_automation(credentials, job_criteria, session_id):
-    """Executa a automação do LinkedIn em thread separada"""
-    try:
-        add_log("🚀 Iniciando automação do LinkedIn...", "SUCCESS")
-        automation_status['current_platform'] = 'LinkedIn'
-        automation_status['progress'] = 10
-        
-        # Inicializa a automação com histórico no banco de dados
-        linkedin_bot = LinkedInFullFlow(
-            headless=False  # Não headless para debug visual e verificação manual
-        )
-        add_log("✅ Bot do LinkedIn com histórico no banco inicializado")
-        
-        automation_status['progress'] = 20
-        
-        # Prepara tipos de vaga
-        job_types = []
-        if job_criteria.get('analista_financeiro'):
-            job_types.append("analista financeiro")
-        if job_criteria.get('contas_pagar'):
-            job_types.append("contas a pagar")
-        if job_criteria.get('contas_receber'):
-            job_types.append("contas a receber")
-        if job_criteria.get('analista_precificacao'):
-            job_types.append("analista de precificacao")
-        if job_criteria.get('custos'):
-            job_types.append("custos")
-            
-        if not job_types:
-            job_types = ["analista financeiro"]  # Padrão
-            
-        add_log(f"🎯 Tipos de vaga selecionados: {', '.join(job_types)}")
-        
-        # Máximo de aplicações
-        max_applications = job_criteria.get('max_applications', 3)
-        add_log(f"📊 Máximo de aplicações configurado: {max_applications}")
-        
-        # Extrai credenciais do dicionário
-        linkedin_email = credentials.get("linkedin_email")
-        linkedin_password = credentials.get("linkedin_password")
-
-        if not linkedin_email or not linkedin_password:
-            add_log("❌ Credenciais do LinkedIn não fornecidas ou incompletas.", "ERROR")
-            return
-
-        # Executa automação completa com histórico
-        add_log("🚀 Executando automação completa com histórico no banco...")
-        result = linkedin_bot.start_full_automation(
-            username=linkedin_email,
-            password=linkedin_password,
-            job_types=job_types,
-            max_applications=max_applications,
-            session_id=automation_status["session_id"]
-        )
 
-        
-        
-        if result.get("success"):
-            applications_sent = result.get("applications_sent", 0)
-            applied_jobs = result.get("applied_jobs", [])
-            
-            add_log(f"🎉 Automação concluída com sucesso!", "SUCCESS")
-            add_log(f"📈 Total de aplicações enviadas: {applications_sent}", "SUCCESS")
-            
-            # Atualiza resultados
-            automation_status['results']['applications_sent'] += applications_sent
-            automation_status['results']['total_jobs'] += len(applied_jobs)
-            automation_status['results']['jobs_by_platform']['LinkedIn'] = {
-                'found': len(applied_jobs),
-                'applied': applications_sent
-            }
-            
-            # Salva no banco de dados
-            for job_info in applied_jobs:
-                try:
-                    job = Job(
-                        title=job_info.get('title', ''),
-                        company=job_info.get('company', ''),
-                        location=job_info.get('location', ''),
-                        platform='LinkedIn',
-                        job_url=job_info.get('url', ''),
-                        status='applied',
-                        job_id=job_info.get('job_id', '')
-                    )
-                    db.session.add(job)
-                    db.session.commit()
-                    add_log(f"💾 Vaga salva: {job_info.get('title', 'N/A')}")
-                except Exception as e:
-                    add_log(f"⚠️ Erro ao salvar vaga: {str(e)}", "WARNING")
-                    
-        else:
-            error_msg = result.get("error", "Erro desconhecido")
-            add_log(f"❌ Falha na automação: {error_msg}", "ERROR")
-        
-        # Fecha o navegador
-        linkedin_bot.close()
-        add_log("🔚 Navegador fechado")
-        
-    except Exception as e:
-        add_log(f"💥 Erro crítico na automação: {str(e)}", "ERROR")
-        automation_status['progress'] = 100
-    finally:
-        automation_status['running'] = False
-        automation_status['current_platform'] = ''
-        add_log("🏁 Automação finalizada", "SUCCESS")
 
 @automation_bp.route('/start', methods=['POST'])
 def start_automation():
-    """Inicia o processo de automação"""
+    """Enfileira uma automação (executada por um worker)"""
     try:
-        if automation_status['running']:
-            return jsonify({'error': 'Automação já está em execução'}), 400
-            
         data = request.get_json()
         
         if not data:
             return jsonify({'error': 'Dados não fornecidos'}), 400
             
-        # Reseta status        automation_status["running"] = True
-        automation_status["logs"] = []
-        automation_status['results'] = {
-            'total_jobs': 0,
-            'applications_sent': 0,
-            'success_rate': 0,
-            'jobs_by_platform': {}
-        }
-        
-        add_log("🎬 Iniciando processo de automação...", "SUCCESS")
+        if not data.get('platforms', {}).get('linkedin', False):
+            return jsonify({
+                'success': True,
+                'message': 'LinkedIn não selecionado para automação'
+            }), 200
         
-        # Obtém credenciais do banco
-        credentials = {}
-        try:
-            linkedin_cred = Credentials.query.filter_by(platform='linkedin').first()
-            if linkedin_cred:
-                credentials['linkedin_email'] = linkedin_cred.username
-                credentials['linkedin_password'] = linkedin_cred.password
-                add_log("✅ Credenciais do LinkedIn carregadas")
-            else:
-                add_log("⚠️ Credenciais do LinkedIn não encontradas", "WARNING")
-        except Exception as e:
-            add_log(f"❌ Erro ao carregar credenciais: {str(e)}", "ERROR")
-            
-        # Critérios de busca
-        job_criteria = data.get('criteria', {})
-        add_log(f"📋 Critérios de busca configurados: {json.dumps(job_criteria, indent=2)}")
+        # Critérios de busca + opções ('block_resources' liga/desliga o bloqueio de
+        # imagens, fontes, vídeo e trackers; 'headless' roda sem janela; 'run_timeout' e
+        # 'job_timeout' são os prazos em segundos da execução e de cada vaga; 'resume_profile'
+        # (análise do currículo), 'relevance_threshold' e 'max_cards' decidem quais cards abrir)
+        payload = {
+            'criteria': data.get('criteria', {}),
+            'block_resources': data.get('block_resources'),
+            'headless': bool(data.get('headless', False)),
+            'run_timeout': data.get('run_timeout'),
+            'job_timeout': data.get('job_timeout'),
+            'resume_profile': data.get('resume_profile'),
+            'relevance_threshold': data.get('relevance_threshold'),
+            'max_cards': data.get('max_cards')
+        }
+        job = AutomationJob.enqueue(payload, platform='linkedin')
+        AutomationJobEvent.add(job.id, f"📋 Critérios de busca configurados: {json.dumps(payload['criteria'], indent=2)}")
         
-        # Inicia automação em thread separada
-        if data.get('platforms', {}).get('linkedin', False):
-            session_id = str(uuid.uuid4())
-            automation_status['session_id'] = session_id
-            thread = threading.Thread(
-                target=run_linkedin_automation,
-                args=(credentials, job_criteria, session_id)
-            )
-
-            thread.daemon = True
-            thread.start()
-            add_log("🚀 Thread de automação do LinkedIn iniciada")
-        else:
-            add_log("ℹ️ LinkedIn não selecionado para automação", "INFO")
-            automation_status['running'] = False
+        ensure_embedded_workers(current_app._get_current_object())
             
         return jsonify({
             'success': True,
-            'message': 'Automação iniciada com sucesso'
+            'message': 'Automação enfileirada com sucesso',
+            'session_id': job.id,
+            'running_sessions': AutomationJob.running_count(),
+            'max_sessions': max_concurrent_sessions()
         }), 200
         
     except Exception as e:
-        automation_status['running'] = False
-        add_log(f"💥 Erro ao iniciar automação: {str(e)}", "ERROR")
         return jsonify({'error': f'Erro ao iniciar automação: {str(e)}'}), 500
 
 @automation_bp.route('/status', methods=['GET'])
 def get_automation_status():
-    """Retorna o status atual da automação"""
+    """Retorna o status de uma automação (?session_id=, padrão: a mais recente)"""
     try:
-        # Calcula taxa de sucesso
-        if automation_status['results']['total_jobs'] > 0:
-            success_rate = (automation_status['results']['applications_sent'] / 
-                          automation_status['results']['total_jobs']) * 100
-            automation_status['results']['success_rate'] = round(success_rate, 1)
-            
+        job = _find_job(request.args.get('session_id'))
         return jsonify({
             'success': True,
-            'status': automation_status
+            'status': _job_status(job)
         }), 200
         
     except Exception as e:
         return jsonify({'error': f'Erro ao obter status: {str(e)}'}), 500
 
+def _sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@automation_bp.route('/stream', methods=['GET'])
+def stream_automation():
+    """
+    Server-Sent Events: só logs novos (event: log, id = cursor) e mudanças de progresso
+    (event: progress). Retoma do header Last-Event-ID ou de ?after=. Termina com event: end.
+    """
+    session_id = request.args.get('session_id')
+    job = _find_job(session_id)
+    if not job:
+        return jsonify({'error': 'Automação não encontrada'}), 404
+    session_id = job.id
+    after = request.headers.get('Last-Event-ID', type=int)
+    if after is None:
+        after = request.args.get('after', 0, type=int)
+    keepalive = request.args.get('keepalive', 15, type=int)
+
+    def generate():
+        last_id = after
+        last_progress = None
+        last_beat = time.time()
+        hub = get_event_hub()
+        while True:
+            for entry in _events_after(session_id, last_id):
+                last_id = entry['id']
+                yield _sse('log', entry, event_id=entry['id'])
+
+            db.session.expire_all()
+            current = db.session.get(AutomationJob, session_id)
+            snapshot = _progress_snapshot(current) if current else {'state': 'missing', 'running': False}
+            if snapshot != last_progress:
+                last_progress = snapshot
+                yield _sse('progress', snapshot)
+            if not snapshot['running'] and not _events_after(session_id, last_id, limit=1):
+                yield _sse('end', snapshot)
+                return
+
+            # worker no mesmo processo: acorda na hora; em outro processo: consulta a cada 1s
+            buffer = hub.get(session_id)
+            if buffer and buffer.local:
+                changed = buffer.wait(last_id, buffer.progress_version, timeout=keepalive)
+            else:
+                time.sleep(1)
+                changed = True
+            if not changed or time.time() - last_beat >= keepalive:
+                last_beat = time.time()
+                yield ": keepalive\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@automation_bp.route('/logs/poll', methods=['GET'])
+def poll_automation_logs():
+    """Long-poll (para quem não usa SSE): espera até `timeout` s por logs com id > after"""
+    try:
+        job = _find_job(request.args.get('session_id'))
+        if not job:
+            return jsonify({'error': 'Automação não encontrada'}), 404
+        after = request.args.get('after', 0, type=int)
+        timeout = min(request.args.get('timeout', 25, type=float), 60)
+
+        events = _events_after(job.id, after)
+        deadline = time.time() + timeout
+        while not events and job.status in AutomationJob.ACTIVE and time.time() < deadline:
+            buffer = get_event_hub().get(job.id)
+            if buffer and buffer.local:
+                buffer.wait(after, buffer.progress_version, timeout=deadline - time.time())
+            else:
+                time.sleep(min(1.0, max(deadline - time.time(), 0)))
+            events = _events_after(job.id, after)
+            db.session.expire_all()
+            job = db.session.get(AutomationJob, job.id)
+
+        return jsonify({
+            'success': True,
+            'session_id': job.id,
+            'logs': events,
+            'last_id': events[-1]['id'] if events else after,
+            **_progress_snapshot(job)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao obter logs: {str(e)}'}), 500
+
+@automation_bp.route('/jobs', methods=['GET'])
+def list_automation_jobs():
+    """Lista a fila de automações (mais recentes primeiro)"""
+    try:
+        limit = request.args.get('limit', 20, type=int)
+        query = AutomationJob.query
+        if request.args.get('status'):
+            query = query.filter_by(status=request.args['status'])
+        jobs = query.order_by(AutomationJob.created_at.desc()).limit(limit).all()
+        return jsonify({
+            'success': True,
+            'jobs': [job.to_dict() for job in jobs]
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao listar automações: {str(e)}'}), 500
+
+@automation_bp.route('/sessions', methods=['GET'])
+def list_sessions():
+    """Sessões em execução (neste processo e na fila) e o limite de sessões simultâneas"""
+    try:
+        running = AutomationJob.query.filter_by(status='running').order_by(AutomationJob.claimed_at).all()
+        queued = AutomationJob.query.filter_by(status='queued').count()
+        return jsonify({
+            'success': True,
+            'max_sessions': max_concurrent_sessions(),
+            'running': [job.to_dict() for job in running],
+            'queued': queued,
+            'local': get_session_registry().stats()['sessions']
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao listar sessões: {str(e)}'}), 500
+
 @automation_bp.route('/stop', methods=['POST'])
 def stop_automation():
-    """Para a automação em execução"""
+    """Pede o cancelamento de uma automação (ou de todas as ativas)"""
     try:
-        if not automation_status['running']:
+        data = request.get_json(silent=True) or {}
+        session_id = data.get('session_id') or request.args.get('session_id')
+        cancelled = AutomationJob.request_cancel(session_id)
+        if not cancelled:
             return jsonify({'error': 'Nenhuma automação em execução'}), 400
-            
-        automation_status['running'] = False
-        add_log("🛑 Automação interrompida pelo usuário", "WARNING")
+        # sessões rodando neste processo param já; as de outros processos, no próximo heartbeat
+        get_session_registry().cancel(cancelled)
         
         return jsonify({
             'success': True,
-            'message': 'Automação interrompida'
+            'message': 'Cancelamento solicitado',
+            'session_ids': cancelled
         }), 200
         
     except Exception as e:
         return jsonify({'error': f'Erro ao parar automação: {str(e)}'}), 500
 
+def _result_row(job_row):
+    return {
+        'id': job_row.id,
+        'title': job_row.title,
+        'company': job_row.company,
+        'location': job_row.location,
+        'platform': job_row.platform,
+        'status': job_row.status,
+        'job_type': job_row.job_type,
+        'applied_at': job_row.created_at.isoformat() if job_row.created_at else None,
+        'job_url': job_row.url
+    }
+
 @automation_bp.route('/results', methods=['GET'])
 def get_results():
-    """Retorna os resultados das aplicações"""
+    """
+    Retorna os resultados das aplicações, paginados por cursor (created_at, id).
+    Filtros: session_id, status, company, job_type, platform, date_from, date_to; próxima página
+    em ?cursor=<next_cursor>; ?with_total=1 inclui o total do filtro.
+    """
     try:
+        session_id = request.args.get('session_id')
+        job = _find_job(session_id)
+        limit = page_size(request.args.get('limit'), 50)
+        
         # Busca vagas do banco de dados
-        jobs = Job.query.order_by(Job.created_at.desc()).limit(50).all()
+        query = Job.filtered_query(
+            status=request.args.get('status'),
+            company=request.args.get('company'),
+            job_type=request.args.get('job_type'),
+            platform=request.args.get('platform'),
+            session_id=session_id,
+            date_from=parse_date(request.args.get('date_from')),
+            date_to=parse_date(request.args.get('date_to'))
+        )
+        total_query = query if wants_total(request.args.get('with_total')) else None
+        query = keyset_query(query, Job.created_at, Job.id, request.args.get('cursor'), limit)
         
-        jobs_data = []
-        for job in jobs:
-            jobs_data.append({
-                'id': job.id,
-                'title': job.title,
-                'company': job.company,
-                'location': job.location,
-                'platform': job.platform,
-                'status': job.status,
-                'applied_at': job.created_at.isoformat() if job.created_at else None,
-                'job_url': job.job_url
-            })
-            
-        return jsonify({
-            'success': True,
-            'results': automation_status['results'],
-            'jobs': jobs_data
-        }), 200
+        body = stream_page(query, 'jobs', limit, serialize=_result_row,
+                           cursor_of=lambda job_row: (job_row.created_at, job_row.id),
+                           extra={'results': _job_status(job, log_limit=0)['results']},
+                           total_query=total_query)
+        return Response(stream_with_context(body), mimetype='application/json')
         
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Erro ao obter resultados: {str(e)}'}), 500
 
 @automation_bp.route('/logs', methods=['GET'])
 def get_logs():
-    """Retorna os logs da automação"""
+    """Retorna os logs da automação (?after=<id> para só os novos)"""
     try:
+        job = _find_job(request.args.get('session_id'))
+        if not job:
+            return jsonify({'success': True, 'logs': []}), 200
+        after = request.args.get('after', type=int)
+        logs = _events_after(job.id, after) if after is not None else _tail_logs(job.id)
         return jsonify({
             'success': True,
-            'logs': automation_status['logs']
+            'session_id': job.id,
+            'logs': logs
         }), 200
         
     except Exception as e:
@@ -348,8 +418,20 @@ def run_automation():
     password = data.get("password")
     job_types = data.get("job_types", ["analista financeiro"])
 
-    driver = LinkedInSuperRobustDriver(headless=False)
+    driver = LinkedInSuperRobustDriver(headless=False, use_pool=True)
     result = driver.run_full_automation(username, password, job_types, max_applications=2)
     driver.close()
 
-    return jsonify(result)
\ No newline at end of file
+    return jsonify(result)
+
+@automation_bp.route('/browser-pool', methods=['GET'])
+def get_browser_pool_stats():
+    """Retorna o estado do pool de navegadores"""
+    try:
+        return jsonify({
+            'success': True,
+            'pool': get_browser_pool().stats()
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao obter pool: {str(e)}'}), 500
@@ -1,8 +1,11 @@
-import os
-import tempfile
-from flask import Blueprint, request, jsonify, current_app
+import json
+import time
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from werkzeug.utils import secure_filename
-from src.analysis.resume_analyzer import ResumeAnalyzer
+from src.analysis.keywords import JOB_KEYWORDS
+from src.analysis.resume_analyzer import get_resume_analyzer
+from src.analysis.batch_analysis import expand_uploads, get_batch_analyzer
+from src.models.analysis_cache import get_analysis_cache
 
 resume_analysis_bp = Blueprint('resume_analysis', __name__)
 
@@ -31,39 +34,60 @@ def upload_resume():
         if not allowed_file(file.filename):
             return jsonify({'error': 'Tipo de arquivo não permitido. Use: PDF, TXT, DOC, DOCX'}), 400
         
-        # Salva o arquivo temporariamente
+        # Analisa direto da memória (sem arquivo temporário)
         filename = secure_filename(file.filename)
-        temp_dir = tempfile.mkdtemp()
-        file_path = os.path.join(temp_dir, filename)
-        file.save(file_path)
+        analyzer = get_resume_analyzer()
+        analysis_result = analyzer.analyze_bytes(file.stream, filename)
         
-        try:
-            # Analisa o currículo
-            analyzer = ResumeAnalyzer()
-            analysis_result = analyzer.analyze_resume(file_path)
-            
-            # Remove o arquivo temporário
-            os.remove(file_path)
-            os.rmdir(temp_dir)
-            
-            return jsonify({
-                'success': True,
-                'analysis': analysis_result,
-                'filename': filename
-            }), 200
-            
-        except Exception as e:
-            # Remove o arquivo temporário em caso de erro
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            if os.path.exists(temp_dir):
-                os.rmdir(temp_dir)
-            raise e
+        return jsonify({
+            'success': True,
+            'analysis': analysis_result,
+            'filename': filename
+        }), 200
             
     except Exception as e:
         current_app.logger.error(f"Erro na análise do currículo: {str(e)}")
         return jsonify({'error': f'Erro na análise: {str(e)}'}), 500
 
+@resume_analysis_bp.route('/upload-resumes', methods=['POST'])
+def upload_resumes():
+    """
+    Análise em lote: vários arquivos no campo `resumes` (ou um .zip com a pasta).
+    Resposta em NDJSON, uma linha por arquivo assim que termina e um resumo no fim.
+    """
+    try:
+        files = request.files.getlist('resumes') + request.files.getlist('resume')
+        files = [f for f in files if f.filename]
+        if not files:
+            return jsonify({'error': 'Nenhum arquivo foi enviado'}), 400
+        
+        batch = get_batch_analyzer()
+        uploads = expand_uploads(((secure_filename(f.filename) or 'arquivo', f.stream) for f in files),
+                                 ALLOWED_EXTENSIONS)
+        
+        def generate():
+            started = time.perf_counter()
+            summary = {'files': 0, 'analyzed': 0, 'cached': 0, 'errors': 0}
+            for item in batch.analyze(uploads):
+                summary['files'] += 1
+                if item.get('error'):
+                    summary['errors'] += 1
+                elif item['cached']:
+                    summary['cached'] += 1
+                else:
+                    summary['analyzed'] += 1
+                yield json.dumps(item, ensure_ascii=False, default=str) + '\n'
+            summary['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+            yield json.dumps({'done': True, **summary}) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+            'X-Accel-Buffering': 'no'
+        })
+        
+    except Exception as e:
+        current_app.logger.error(f"Erro na análise em lote: {str(e)}")
+        return jsonify({'error': f'Erro na análise: {str(e)}'}), 500
+
 @resume_analysis_bp.route('/analyze-text', methods=['POST'])
 def analyze_text():
     """Analisa texto de currículo enviado diretamente"""
@@ -78,47 +102,35 @@ def analyze_text():
         if not resume_text.strip():
             return jsonify({'error': 'Texto do currículo não pode estar vazio'}), 400
         
-        # Cria um arquivo temporário com o texto
-        temp_dir = tempfile.mkdtemp()
-        file_path = os.path.join(temp_dir, 'resume.txt')
+        # Analisa o texto direto (antes ia para um arquivo temporário e era relido)
+        analyzer = get_resume_analyzer()
+        analysis_result = analyzer.analyze_text(resume_text)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(resume_text)
-        
-        try:
-            # Analisa o currículo
-            analyzer = ResumeAnalyzer()
-            analysis_result = analyzer.analyze_resume(file_path)
-            
-            # Remove o arquivo temporário
-            os.remove(file_path)
-            os.rmdir(temp_dir)
-            
-            return jsonify({
-                'success': True,
-                'analysis': analysis_result
-            }), 200
-            
-        except Exception as e:
-            # Remove o arquivo temporário em caso de erro
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            if os.path.exists(temp_dir):
-                os.rmdir(temp_dir)
-            raise e
+        return jsonify({
+            'success': True,
+            'analysis': analysis_result
+        }), 200
             
     except Exception as e:
         current_app.logger.error(f"Erro na análise do texto: {str(e)}")
         return jsonify({'error': f'Erro na análise: {str(e)}'}), 500
 
+@resume_analysis_bp.route('/analysis-cache', methods=['GET'])
+def get_analysis_cache_stats():
+    """Contadores do cache de análises (acertos, falhas, remoções)"""
+    return jsonify({
+        'success': True,
+        'cache': get_analysis_cache().info()
+    }), 200
+
 @resume_analysis_bp.route('/job-keywords', methods=['GET'])
 def get_job_keywords():
     """Retorna as palavras-chave para cada tipo de vaga"""
     try:
-        analyzer = ResumeAnalyzer()
+        # tabela estática: não precisa do analisador (nem do NLTK)
         return jsonify({
             'success': True,
-            'keywords': analyzer.job_keywords
+            'keywords': JOB_KEYWORDS
         }), 200
         
     except Exception as e:
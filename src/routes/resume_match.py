@@ -0,0 +1,45 @@
+import time
+from flask import Blueprint, request, jsonify, current_app
+from src.analysis.job_matcher import get_job_match_index
+
+resume_match_bp = Blueprint('resume_match', __name__)
+
+MAX_LIMIT = 500
+
+
+@resume_match_bp.route('/resume/match', methods=['POST'])
+def match_resume():
+    """
+    Ranking das vagas guardadas para um currículo (cosseno TF-IDF).
+    JSON: text (obrigatório), limit (20), min_score (0), exclude_applied (false), job_ids (opcional)
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        resume_text = data.get('text') or ''
+        if not resume_text.strip():
+            return jsonify({'success': False, 'error': 'Texto do currículo é obrigatório'}), 400
+
+        limit = max(1, min(int(data.get('limit', 20)), MAX_LIMIT))
+        min_score = float(data.get('min_score', 0.0))
+
+        started = time.perf_counter()
+        exclude_applied = bool(data.get('exclude_applied', False))
+        index = get_job_match_index()
+        index.refresh()
+        if exclude_applied:
+            index.refresh_applied()
+        results = index.match(resume_text, limit=limit, min_score=min_score,
+                              job_ids=data.get('job_ids'), exclude_applied=exclude_applied)
+        index.mark_applied(results)
+        return jsonify({
+            'success': True,
+            'results': results,
+            'count': len(results),
+            'indexed_jobs': index.info()['jobs'],
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        })
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': f'Parâmetro inválido: {e}'}), 400
+    except Exception as e:
+        current_app.logger.error(f"Erro no matching de vagas: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -0,0 +1,106 @@
+import os
+import sys
+# DON'T CHANGE THIS !!!
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import logging
+import socket
+import threading
+import time
+import uuid
+
+from src.automation.automation_runner import execute_job
+from src.automation.session_registry import max_concurrent_sessions
+from src.models.automation_job import AutomationJob
+
+logger = logging.getLogger("Worker")
+
+STALE_AFTER_SECONDS = 120
+
+
+class Worker:
+    """
+    Consome a fila durável de AutomationJob: reivindica, executa (com heartbeat e
+    cancelamento cooperativo) e volta a procurar. Vários workers, em processos
+    diferentes, podem dividir a mesma fila; no total nunca rodam mais que
+    JOBHUNTER_MAX_SESSIONS jobs ao mesmo tempo.
+    """
+
+    def __init__(self, app, worker_id=None, poll_interval=2.0, platform=None):
+        self.app = app
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval
+        self.platform = platform
+        self._stop = threading.Event()
+
+    def run_once(self):
+        """Executa um job da fila, se houver. Retorna True se executou algum."""
+        with self.app.app_context():
+            AutomationJob.requeue_stale(STALE_AFTER_SECONDS)
+            job = AutomationJob.claim_next(self.worker_id, self.platform, max_running=max_concurrent_sessions())
+            if not job:
+                return False
+            logger.info(f"🛠️ Worker {self.worker_id} executando job {job.id}")
+            execute_job(self.app, job, self.worker_id)
+            return True
+
+    def run_forever(self):
+        logger.info(f"🛠️ Worker {self.worker_id} aguardando jobs...")
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception as e:
+                logger.error(f"💥 Erro no worker: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+_embedded_workers = []
+_embedded_lock = threading.Lock()
+
+
+def ensure_embedded_workers(app, count=None):
+    """
+    Sobe workers como threads dentro do processo Flask (modo padrão, sem processo
+    separado): um por sessão simultânea permitida (JOBHUNTER_MAX_SESSIONS).
+    Desligue com JOBHUNTER_EMBEDDED_WORKERS=0 quando rodar `python src/worker.py`.
+    """
+    if count is None:
+        count = int(os.environ.get("JOBHUNTER_EMBEDDED_WORKERS", max_concurrent_sessions()))
+    with _embedded_lock:
+        while len(_embedded_workers) < count:
+            worker = Worker(app)
+            thread = threading.Thread(target=worker.run_forever, daemon=True)
+            thread.start()
+            _embedded_workers.append(worker)
+    return len(_embedded_workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker da fila de automações do JobHunter")
+    parser.add_argument("--threads", type=int, default=1, help="jobs em paralelo neste processo")
+    parser.add_argument("--poll", type=float, default=2.0, help="intervalo entre consultas à fila (s)")
+    parser.add_argument("--platform", default=None, help="só consome jobs desta plataforma")
+    args = parser.parse_args()
+
+    os.environ.setdefault("JOBHUNTER_EMBEDDED_WORKERS", "0")
+    from src.main import app
+
+    workers = [Worker(app, poll_interval=args.poll, platform=args.platform) for _ in range(args.threads)]
+    threads = [threading.Thread(target=w.run_forever, daemon=True) for w in workers]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(t.is_alive() for t in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.stop()
+
+
+if __name__ == '__main__':
+    main()
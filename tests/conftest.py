@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from flask import Flask
+
+
+@pytest.fixture
+def app():
+    """App Flask com SQLite em memória, tabelas e migrações aplicadas"""
+    from src.database.migrations import run_migrations
+    from src.models.user import db
+    # modelos das tabelas que as migrações alteram
+    import src.models.analysis_cache  # noqa: F401
+    import src.models.application_history  # noqa: F401
+    import src.models.automation_job  # noqa: F401
+    import src.models.job_detail  # noqa: F401
+    import src.models.jobs  # noqa: F401
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        run_migrations(db)
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,86 @@
+import time
+from datetime import datetime, timedelta
+
+from src.analysis.keywords import JOB_KEYWORDS, keyword_set_version
+from src.models.analysis_cache import AnalysisCache, ResumeAnalysisCacheEntry, analysis_key, normalize_resume_text
+
+RESULT = {'overall_rating': 4, 'skills': ['excel']}
+
+
+def test_key_ignores_case_spacing_and_unicode_form():
+    version = keyword_set_version()
+    assert analysis_key("Analista  Financeiro\n", version) == analysis_key("analista financeiro", version)
+    assert analysis_key("Precificação", version) == analysis_key("Precificação", version)
+    assert normalize_resume_text("  A\tB  ") == "a b"
+
+
+def test_keyword_set_change_changes_key():
+    changed = dict(JOB_KEYWORDS, extra=['novo termo'])
+    assert keyword_set_version(changed) != keyword_set_version()
+    assert analysis_key("texto", keyword_set_version(changed)) != analysis_key("texto", keyword_set_version())
+
+
+def test_memory_hit_returns_copy():
+    cache = AnalysisCache(size=4, ttl_hours=1)
+    cache.put("k", "v1", RESULT)
+    cached = cache.get("k")
+    assert cached == RESULT
+    cached['skills'].append('sap')
+    assert cache.get("k") == RESULT
+    assert cache.info()['memory_hits'] == 2
+
+
+def test_errors_are_not_cached():
+    cache = AnalysisCache(size=4, ttl_hours=1)
+    cache.put("k", "v1", {'error': 'falhou'})
+    assert cache.get("k") is None
+    assert cache.info()['stores'] == 0
+
+
+def test_lru_eviction():
+    cache = AnalysisCache(size=2, ttl_hours=1)
+    cache.put("a", "v", RESULT)
+    cache.put("b", "v", RESULT)
+    cache.get("a")
+    cache.put("c", "v", RESULT)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.info()['evictions'] == 1
+
+
+def test_memory_ttl_expires():
+    cache = AnalysisCache(size=4, ttl_hours=0.05 / 3600)
+    cache.put("k", "v", RESULT)
+    time.sleep(0.08)
+    assert cache.get("k") is None
+    assert cache.info()['entries'] == 0
+
+
+def test_db_layer_survives_memory_clear(app):
+    cache = AnalysisCache(size=4, ttl_hours=1)
+    cache.put("k", "v1", RESULT)
+    cache.clear()
+    assert cache.get("k") == RESULT
+    assert cache.info()['db_hits'] == 1
+
+
+def test_db_ttl_expires(app):
+    from src.models.user import db
+
+    cache = AnalysisCache(size=4, ttl_hours=1)
+    cache.put("k", "v1", RESULT)
+    cache.clear()
+    row = ResumeAnalysisCacheEntry.query.filter_by(key="k").one()
+    row.created_at = datetime.utcnow() - timedelta(hours=2)
+    db.session.commit()
+    assert cache.get("k") is None
+    assert cache.info()['misses'] == 1
+
+
+def test_new_version_misses_old_entries(app):
+    cache = AnalysisCache(size=4, ttl_hours=1)
+    old_version = keyword_set_version()
+    cache.put(analysis_key("currículo", old_version), old_version, RESULT)
+    new_version = keyword_set_version(dict(JOB_KEYWORDS, extra=['x']))
+    assert cache.get(analysis_key("currículo", new_version)) is None
+    assert cache.get(analysis_key("currículo", old_version)) == RESULT
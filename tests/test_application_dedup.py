@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models import application_dedup
+from src.models.application_dedup import ApplicationDedupCache, BloomFilter
+
+
+@pytest.fixture
+def dedup(monkeypatch):
+    """Troca o cache global do processo por um novo (modo definido em cada teste)"""
+    def install(single_writer):
+        cache = ApplicationDedupCache(capacity=1_000, single_writer=single_writer)
+        monkeypatch.setattr(application_dedup, "_cache", cache)
+        return cache
+    return install
+
+
+def _job(job_id):
+    return {'title': 'Analista Financeiro', 'company': 'ACME', 'job_id': job_id,
+            'url': f'https://www.linkedin.com/jobs/view/{job_id}/'}
+
+
+def _insert_from_other_process(db, job_id):
+    """Candidatura gravada fora deste processo: não passa pelo cache"""
+    db.session.execute(db.text(
+        "INSERT INTO application_history (job_title, company_name, job_id, job_url, platform, "
+        "application_status, attempted_at) VALUES ('Analista', 'Outra', :job_id, :url, 'LinkedIn', 'success', :at)"
+    ), {'job_id': job_id, 'url': f'https://www.linkedin.com/jobs/view/{job_id}/', 'at': datetime.utcnow()})
+    db.session.commit()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    keys = [f"id:{i}" for i in range(1_000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 1_000
+
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    bloom = BloomFilter(capacity=1_000, error_rate=0.01)
+    for i in range(1_000):
+        bloom.add(f"id:{i}")
+    false_positives = sum(f"url:{i}" in bloom for i in range(10_000))
+    assert false_positives / 10_000 < 0.03
+
+
+def test_might_contain_is_true_before_warm():
+    cache = ApplicationDedupCache(single_writer=True)
+    assert cache.might_contain(job_id="123")
+
+
+def test_single_writer_trusts_bloom_negative(app):
+    cache = ApplicationDedupCache(single_writer=True)
+    cache.warm(days=30)
+    cache.add(job_id="1", job_url="https://x/1?trk=abc")
+    assert cache.might_contain(job_id="1")
+    assert cache.might_contain(job_url="https://x/1")
+    assert not cache.might_contain(job_id="2")
+    assert cache.stats()['hits']['bloom_negative'] == 1
+    # janela maior que a aquecida: decide o banco
+    assert cache.might_contain(job_id="2", days=60)
+
+
+def test_multi_writer_never_trusts_bloom_negative(app):
+    cache = ApplicationDedupCache(single_writer=False)
+    cache.warm(days=30)
+    assert cache.might_contain(job_id="2")
+    assert cache.stats()['hits']['bloom_negative'] == 0
+
+
+def test_single_writer_default_follows_embedded_workers(monkeypatch):
+    monkeypatch.delenv("JOBHUNTER_DEDUP_SINGLE_WRITER", raising=False)
+    monkeypatch.delenv("JOBHUNTER_EMBEDDED_WORKERS", raising=False)
+    assert application_dedup.single_writer_default()
+    monkeypatch.setenv("JOBHUNTER_EMBEDDED_WORKERS", "0")
+    assert not application_dedup.single_writer_default()
+    monkeypatch.setenv("JOBHUNTER_DEDUP_SINGLE_WRITER", "1")
+    assert application_dedup.single_writer_default()
+
+
+def test_recent_respects_window():
+    cache = ApplicationDedupCache(single_writer=True)
+    cache.add(job_id="old", attempted_at=datetime.utcnow() - timedelta(days=40))
+    cache.add(job_id="new")
+    assert cache.recent(job_id="old", days=30) is None
+    assert cache.recent(job_id="new", days=30) is not None
+
+
+def test_check_duplicate_sees_other_process_writes(app, dedup):
+    from src.models.application_history import ApplicationHistory, db
+
+    cache = dedup(single_writer=False)
+    cache.warm()
+    _insert_from_other_process(db, "777")
+    existing = ApplicationHistory.check_duplicate_application("777", None)
+    assert existing is not None and existing.job_id == "777"
+    assert ApplicationHistory.check_duplicate_application("778", None) is None
+
+
+def test_check_duplicate_uses_own_writes(app, dedup):
+    from src.models.application_history import ApplicationHistory
+
+    dedup(single_writer=True).warm()
+    ApplicationHistory.create_application_record(_job("42"), status='success')
+    assert ApplicationHistory.check_duplicate_application("42", None) is not None
+    assert ApplicationHistory.check_duplicate_application("43", None) is None
+
+
+def test_check_duplicates_batch_queries_db_in_multi_writer_mode(app, dedup):
+    from src.models.application_history import ApplicationHistory, db
+
+    cache = dedup(single_writer=False)
+    cache.warm()
+    ApplicationHistory.create_application_record(_job("1"), status='success')
+    _insert_from_other_process(db, "2")
+    duplicates = ApplicationHistory.check_duplicates_batch(["1", "2", "3"])
+    assert set(duplicates) == {"1", "2"}
+
+
+def test_check_duplicate_answers_from_lru_without_db(app, dedup):
+    from src.models.application_history import ApplicationHistory
+
+    cache = dedup(single_writer=False)
+    cache.warm()
+    ApplicationHistory.create_application_record(_job("55"), status='success')
+
+    duplicate = ApplicationHistory.check_duplicate_application("55", None)
+    assert duplicate is not None and duplicate.attempted_at is not None
+    assert cache.stats()['hits']['db'] == 0
+    assert cache.stats()['hits']['lru'] == 1
+
+    assert ApplicationHistory.check_duplicate_application("56", None) is None
+    assert cache.stats()['hits']['db'] == 1
@@ -0,0 +1,69 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from src.models.application_stats import ApplicationStatisticsCache
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """Como o fixture app, mas em arquivo: outra conexão sqlite3 consegue gravar na mesma base"""
+    from src.models.user import db
+    import src.models.application_history  # noqa: F401
+
+    path = tmp_path / 'jobhunter.db'
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app, str(path)
+        db.session.remove()
+        db.drop_all()
+
+
+def _add(status='pending', company='ACME'):
+    from src.models.application_history import ApplicationHistory, db
+
+    application = ApplicationHistory(job_title='Dev', company_name=company, platform='LinkedIn',
+                                     application_status=status, attempted_at=datetime(2026, 1, 1))
+    db.session.add(application)
+    db.session.commit()
+    return application
+
+
+def test_local_writes_skip_signature_query(file_app):
+    cache = ApplicationStatisticsCache(ttl=3600)
+    _add()
+    assert cache.get()['total_applications'] == 1
+    checks = cache.stats['signature_checks']
+
+    cache.record(_add(status='success'))
+    summary = cache.get()
+
+    assert summary['total_applications'] == 2
+    assert summary['successful_applications'] == 1
+    assert cache.stats['signature_checks'] == checks
+    assert cache.stats['loads'] == 1
+
+
+def test_write_from_other_connection_reloads(file_app):
+    _, path = file_app
+    cache = ApplicationStatisticsCache(ttl=3600)
+    _add()
+    assert cache.get()['total_applications'] == 1
+
+    other = sqlite3.connect(path)
+    other.execute("INSERT INTO application_history (job_title, company_name, platform, application_status, "
+                  "attempted_at) VALUES ('Dev', 'Beta', 'LinkedIn', 'failed', '2026-01-02 00:00:00')")
+    other.commit()
+    other.close()
+
+    summary = cache.get()
+    assert summary['total_applications'] == 2
+    assert summary['failed_applications'] == 1
+    assert cache.stats['external_changes'] == 1
+    assert cache.stats['loads'] == 2
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import pytest
+
+from src.automation.browser_pool import BrowserPool, BrowserPoolTimeout
+from src.automation.cancellation import AutomationCancelled, CancellationToken
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = BrowserPool(size=1, factory=lambda headless, slot: FakeDriver(), profile_root=str(tmp_path))
+    pool._warm_up = lambda lease: None
+    yield pool
+    pool.shutdown()
+
+
+def test_acquire_times_out_when_pool_is_full(pool):
+    pool.acquire(timeout=1)
+    started = time.monotonic()
+    with pytest.raises(BrowserPoolTimeout):
+        pool.acquire(timeout=0.2)
+    assert time.monotonic() - started < 1
+
+
+def test_acquire_without_timeout_uses_configured_limit(pool, monkeypatch):
+    monkeypatch.setenv("JOBHUNTER_BROWSER_POOL_ACQUIRE_TIMEOUT", "0.2")
+    pool.acquire()
+    with pytest.raises(BrowserPoolTimeout):
+        pool.acquire()
+
+
+def test_acquire_wait_is_cancellable(pool):
+    pool.acquire(timeout=1)
+    token = CancellationToken()
+    threading.Timer(0.1, token.cancel).start()
+    started = time.monotonic()
+    with pytest.raises(AutomationCancelled):
+        pool.acquire(timeout=30, token=token)
+    assert time.monotonic() - started < 3
+
+
+def test_acquire_wait_respects_run_deadline(pool):
+    pool.acquire(timeout=1)
+    token = CancellationToken(run_timeout=0.2)
+    started = time.monotonic()
+    with pytest.raises((AutomationCancelled, BrowserPoolTimeout)):
+        pool.acquire(timeout=30, token=token)
+    assert time.monotonic() - started < 3
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from src.automation.cancellation import AutomationCancelled, CancellationToken, JobDeadlineExceeded
+
+
+def test_no_deadline_never_interrupts():
+    token = CancellationToken()
+    assert token.remaining() is None
+    assert token.clamp(30) == 30
+    token.check()
+    assert not token.cancelled
+
+
+def test_interruptions_escape_except_exception():
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(AutomationCancelled):
+        try:
+            token.check()
+        except Exception:
+            pytest.fail("cancelamento capturado por except Exception")
+
+
+def test_cancel_reports_reason():
+    token = CancellationToken()
+    token.cancel()
+    assert token.reason == "cancelled"
+    with pytest.raises(AutomationCancelled) as info:
+        token.check()
+    assert info.value.reason == "cancelled"
+
+
+def test_run_deadline_cancels_run():
+    token = CancellationToken(run_timeout=0.05)
+    time.sleep(0.08)
+    assert token.reason == "deadline"
+    assert token.cancelled
+    with pytest.raises(AutomationCancelled):
+        token.check()
+
+
+def test_job_scope_deadline_only_abandons_job():
+    token = CancellationToken(job_timeout=0.05)
+    with pytest.raises(JobDeadlineExceeded):
+        with token.job_scope():
+            time.sleep(0.08)
+            assert not token.cancelled
+            token.check()
+    # fora da vaga o prazo não vale mais
+    token.check()
+    assert token.reason is None
+
+
+def test_nested_job_scope_keeps_shortest_deadline():
+    token = CancellationToken()
+    with token.job_scope(0.2):
+        outer = token.remaining()
+        with token.job_scope(10):
+            assert token.remaining() <= outer
+        with token.job_scope(0.05):
+            assert token.remaining() <= 0.05
+        assert token.remaining() == pytest.approx(outer, abs=0.05)
+
+
+def test_clamp_limits_timeout_to_remaining():
+    token = CancellationToken(run_timeout=1)
+    assert token.clamp(30) <= 1
+    assert token.clamp(0.2) == pytest.approx(0.2)
+    with token.job_scope(0.01):
+        time.sleep(0.02)
+        assert token.clamp(30) == CancellationToken.MIN_WAIT
+
+
+def test_sleep_wakes_up_on_cancel():
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+    started = time.monotonic()
+    with pytest.raises(AutomationCancelled):
+        token.sleep(5)
+    assert time.monotonic() - started < 1
+
+
+def test_sleep_stops_at_job_deadline():
+    token = CancellationToken()
+    started = time.monotonic()
+    with pytest.raises(JobDeadlineExceeded):
+        with token.job_scope(0.1):
+            token.sleep(5)
+    assert time.monotonic() - started < 1
@@ -0,0 +1,43 @@
+from src.automation.job_api_capture import JobApiCapture
+
+URN = "urn:li:fsd_jobPosting:4242"
+
+
+def _posting(method_type):
+    return {"included": [{"$type": "com.linkedin.voyager.dash.jobs.JobPosting", "entityUrn": URN,
+                          "title": "Dev Python", "companyName": "ACME",
+                          "applyMethod": {"$type": method_type}}]}
+
+
+def _card(footer=""):
+    return {"included": [{"$type": "com.linkedin.voyager.dash.jobs.JobPostingCard", "jobPostingUrn": URN,
+                          "jobPostingTitle": {"text": "Dev Python"}, "primaryDescription": {"text": "ACME"},
+                          "footerItems": [{"type": footer}] if footer else []}]}
+
+
+def test_card_after_posting_keeps_easy_apply():
+    capture = JobApiCapture(driver=None)
+    capture.add_payload(_posting("com.linkedin.voyager.jobs.OnsiteApply"))
+    capture.add_payload(_card())
+
+    job = capture.get_job("4242")
+    assert job["easy_apply"] is True
+    assert job["apply_method"] == "easy_apply"
+
+
+def test_posting_after_card_decides_easy_apply():
+    capture = JobApiCapture(driver=None)
+    capture.add_payload(_card("EASY_APPLY_TEXT"))
+    capture.add_payload(_posting("com.linkedin.voyager.jobs.OffsiteApply"))
+
+    assert capture.get_job("4242")["easy_apply"] is False
+
+
+def test_false_flag_does_not_overwrite_true():
+    capture = JobApiCapture(driver=None)
+    capture.add_payload(_card("APPLIED"))
+    capture.add_payload(_card())
+
+    job = capture.get_job("4242")
+    assert job["already_applied"] is True
+    assert job["title"] == "Dev Python"
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.analysis import job_matcher  # noqa: E402
+from src.analysis.job_matcher import JobMatchIndex  # noqa: E402
+
+FINANCE = "Analista financeiro: fluxo de caixa, DRE, orçamento, conciliação bancária e Excel avançado."
+PAYABLE = "Contas a pagar: lançamento de notas fiscais, pagamentos a fornecedores e conciliação."
+DEV = "Desenvolvedor backend Python, APIs REST, Docker e Kubernetes."
+
+
+def _index():
+    index = JobMatchIndex()
+    index.add("fin", "Analista Financeiro", FINANCE)
+    index.add("cap", "Analista de Contas a Pagar", PAYABLE)
+    index.add("dev", "Desenvolvedor Python", DEV)
+    return index
+
+
+def test_match_ranks_by_cosine():
+    results = _index().match("Experiência com fluxo de caixa, DRE e orçamento em Excel")
+    assert results[0]['job_id'] == "fin"
+    assert "fluxo de caixa" in results[0]['matched_terms']
+    scores = [r['score'] for r in results]
+    assert scores == sorted(scores, reverse=True)
+    assert "dev" not in [r['job_id'] for r in results]
+
+
+def test_match_filters():
+    index = _index()
+    text = "conciliação e pagamentos a fornecedores"
+    assert [r['job_id'] for r in index.match(text, job_ids=["fin"])] == ["fin"]
+    assert len(index.match(text, limit=1)) == 1
+    assert index.match(text, min_score=0.99) == []
+    index.applied = {"cap"}
+    assert "cap" not in [r['job_id'] for r in index.match(text, exclude_applied=True)]
+
+
+def test_reindex_replaces_row_and_document_frequency():
+    index = _index()
+    col = index.vocab["docker"]
+    index.add("dev", "Desenvolvedor Python", "Python e Django")
+    assert index.df[col] == 0
+    assert index.info()['dead_rows'] == 1
+    assert index.match("docker kubernetes") == []
+    assert index.match("django")[0]['job_id'] == "dev"
+
+
+def test_compaction_drops_dead_rows_and_keeps_results():
+    index = JobMatchIndex()
+    for i in range(200):
+        index.add(f"job{i}", f"Vaga {i}", f"termo{i} comum")
+    before = index.match("termo150")[0]
+    for i in range(150):
+        index.add(f"job{i}", f"Vaga {i}", f"novo{i} comum")
+    info = index.info()
+    assert info['jobs'] == 200
+    assert info['dead_rows'] < 0.3 * len(index.docs)
+    assert len(index.docs) < 350
+    after = index.match("termo150")[0]
+    assert after['job_id'] == before['job_id'] == "job150"
+    assert index.match("novo10")[0]['job_id'] == "job10"
+
+
+def _store_detail(db, job_id, description, fetched_at):
+    from src.models.job_detail import JobDetail, content_hash
+
+    row = JobDetail.query.filter_by(job_id=job_id).first() or JobDetail(job_id=job_id)
+    row.title, row.company, row.description = "Analista", "ACME", description
+    row.requirements = "[]"
+    row.content_hash = content_hash(description, [], None)
+    row.fetched_at = fetched_at
+    db.session.add(row)
+    db.session.commit()
+
+
+def test_refresh_is_incremental(app):
+    from src.models.jobs import Job
+    from src.models.user import db
+
+    index = JobMatchIndex()
+    db.session.add(Job(job_id="1", platform="LinkedIn", title="Analista Financeiro", company="ACME",
+                       location="São Paulo", url="https://x/1", description=FINANCE))
+    db.session.commit()
+    assert index.refresh() == 1
+    assert index.refresh() == 0
+    db.session.add(Job(job_id="2", platform="LinkedIn", title="Contas a Pagar", company="Beta",
+                       location="São Paulo", url="https://x/2", description=PAYABLE))
+    db.session.commit()
+    assert index.refresh() == 1
+    assert index.info()['jobs'] == 2
+
+
+def test_refresh_follows_commit_order_not_fetched_at(app):
+    from src.models.user import db
+
+    index = JobMatchIndex()
+    now = datetime.utcnow()
+    _store_detail(db, "10", FINANCE, now)
+    assert index.refresh() == 1
+    # gravado depois, mas lido antes (flush atrasado / outro processo): fetched_at mais antigo
+    _store_detail(db, "11", PAYABLE, now - timedelta(hours=1))
+    # mesmo fetched_at da marca anterior
+    _store_detail(db, "12", DEV, now)
+    assert index.refresh() == 2
+    assert {"10", "11", "12"} <= set(index.row_of)
+
+
+def test_refresh_skips_unchanged_content(app):
+    from src.models.user import db
+
+    index = JobMatchIndex()
+    _store_detail(db, "20", FINANCE, datetime.utcnow())
+    index.refresh()
+    row = index.row_of["20"]
+    # só fetched_at renovado: o trigger não avança o contador
+    _store_detail(db, "20", FINANCE, datetime.utcnow())
+    assert index.refresh() == 0
+    _store_detail(db, "20", PAYABLE, datetime.utcnow())
+    assert index.refresh() == 1
+    assert index.row_of["20"] != row
+
+
+def test_singleton():
+    assert job_matcher.get_job_match_index() is job_matcher.get_job_match_index()
+
+
+def test_applied_status_is_read_on_demand(app):
+    from src.models.jobs import Job
+    from src.models.user import db
+
+    index = JobMatchIndex()
+    job = Job(job_id="30", platform="LinkedIn", title="Analista Financeiro", company="ACME",
+              location="São Paulo", url="https://x/30", description=FINANCE)
+    db.session.add(job)
+    db.session.commit()
+    index.refresh()
+    results = index.mark_applied(index.match("fluxo de caixa"))
+    assert results[0]['applied'] is False
+    # status muda depois da inserção: refresh() não relê, a consulta sim
+    job.status = "applied"
+    db.session.commit()
+    assert index.refresh() == 0
+    assert index.mark_applied(index.match("fluxo de caixa"))[0]['applied'] is True
+    index.refresh_applied()
+    assert index.match("fluxo de caixa", exclude_applied=True) == []
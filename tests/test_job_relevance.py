@@ -0,0 +1,63 @@
+from src.analysis.job_relevance import JobRelevanceScorer
+
+
+def _scorer(**kwargs):
+    kwargs.setdefault('threshold', 0.25)
+    return JobRelevanceScorer(['Analista Financeiro'], location='São Paulo, SP', **kwargs)
+
+
+def test_title_match_outranks_unrelated_job():
+    scorer = _scorer()
+    relevant = {'title': 'Analista Financeiro Pleno', 'location': 'São Paulo, SP', 'easy_apply': True}
+    unrelated = {'title': 'Desenvolvedor Front-end', 'location': 'Curitiba, PR', 'easy_apply': True}
+    assert scorer.score(relevant) > scorer.score(unrelated)
+    assert scorer.details(relevant)['title'] == 1.0
+
+
+def test_synonyms_and_accents_in_title():
+    scorer = _scorer()
+    assert scorer.details({'title': 'Financial Analyst'})['title'] == 1.0
+    assert scorer.details({'title': 'Analista de Finanças'})['title'] == 1.0
+
+
+def test_external_apply_scores_zero():
+    scorer = _scorer()
+    assert scorer.score({'title': 'Analista Financeiro', 'apply_method': 'external'}) == 0.0
+
+
+def test_description_keywords_and_skills_add_up():
+    scorer = _scorer(profile={'skills': ['excel', 'sap', 'power bi']})
+    bare = {'title': 'Analista Financeiro'}
+    rich = dict(bare, description='Fluxo de caixa, DRE, orçamento e controladoria. Excel avançado e SAP.')
+    assert scorer.score(rich) > scorer.score(bare)
+    assert scorer.details(rich)['skills'] > 0
+
+
+def test_resume_fit_weights_title():
+    weak = _scorer(profile={'job_scores': {'analista_financeiro': 0}})
+    strong = _scorer(profile={'job_scores': {'analista_financeiro': 100}})
+    job = {'title': 'Analista Financeiro'}
+    assert strong.score(job) > weak.score(job)
+
+
+def test_rank_orders_by_score_and_splits_threshold():
+    scorer = _scorer(threshold=0.3)
+    jobs = [
+        {'job_id': 'dev', 'title': 'Desenvolvedor Java', 'location': 'Recife'},
+        {'job_id': 'partial', 'title': 'Assistente Financeiro', 'location': 'São Paulo'},
+        {'job_id': 'best', 'title': 'Analista Financeiro', 'location': 'São Paulo', 'easy_apply': True},
+    ]
+    selected, skipped = scorer.rank(jobs)
+    assert [j['job_id'] for j in selected][0] == 'best'
+    assert all(j['relevance'] >= 0.3 for j in selected)
+    assert 'dev' in [j['job_id'] for j in skipped]
+    assert all('relevance' in j for j in jobs)
+    scores = [j['relevance'] for j in selected]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_rank_keeps_list_order_on_ties():
+    scorer = _scorer(threshold=0.0)
+    jobs = [{'job_id': str(i), 'title': 'Analista Financeiro'} for i in range(3)]
+    selected, _ = scorer.rank(jobs)
+    assert [j['job_id'] for j in selected] == ['0', '1', '2']
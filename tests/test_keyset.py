@@ -0,0 +1,79 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.database.keyset import (InvalidCursor, MAX_PAGE_SIZE, decode_cursor, encode_cursor, keyset_query,
+                                 page_size, stream_page)
+
+
+@pytest.fixture
+def history(app):
+    """25 candidaturas; de 5 em 5 com o mesmo attempted_at (empates resolvidos pelo id)"""
+    from src.models.application_history import ApplicationHistory, db
+
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    for i in range(25):
+        db.session.add(ApplicationHistory(job_title=f'Vaga {i}', company_name='ACME' if i % 2 else 'Beta',
+                                          platform='LinkedIn', application_status='success',
+                                          attempted_at=base + timedelta(minutes=i // 5)))
+    db.session.commit()
+    return ApplicationHistory
+
+
+def _page(model, query, cursor, limit, total=False):
+    paged = keyset_query(query, model.attempted_at, model.id, cursor, limit)
+    body = ''.join(stream_page(paged, 'items', limit, serialize=lambda row: row.id,
+                               cursor_of=lambda row: (row.attempted_at, row.id),
+                               total_query=query if total else None))
+    return json.loads(body)
+
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 3, 4, 5, 6, 7, 890123)
+    assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["nada", "MTIz", "!!!"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_page_size_bounds():
+    assert page_size(None) == 50
+    assert page_size("0") == 1
+    assert page_size("-3") == 1
+    assert page_size(str(MAX_PAGE_SIZE * 10)) == MAX_PAGE_SIZE
+
+
+def test_pages_cover_every_row_once_in_order(history):
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = _page(history, history.query, cursor, 7)
+        pages += 1
+        seen.extend(page['items'])
+        assert page['count'] == len(page['items'])
+        assert 'total' not in page
+        if not page['has_more']:
+            assert page['next_cursor'] is None
+            break
+        cursor = page['next_cursor']
+    assert pages == 4
+    expected = [row.id for row in history.query.order_by(history.attempted_at.desc(), history.id.desc())]
+    assert seen == expected
+
+
+def test_exact_multiple_has_no_empty_last_page(history):
+    first = _page(history, history.query, None, 25)
+    assert first['count'] == 25
+    assert not first['has_more'] and first['next_cursor'] is None
+
+
+def test_with_total_counts_whole_filter(history):
+    query = history.query.filter(history.company_name == 'ACME')
+    page = _page(history, query, None, 5, total=True)
+    assert page['count'] == 5
+    assert page['total'] == 12
+    assert page['has_more']
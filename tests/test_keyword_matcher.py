@@ -0,0 +1,71 @@
+import random
+
+from src.analysis.keyword_matcher import KeywordMatcher, fold, get_keyword_matcher
+
+
+def _naive(phrases, text):
+    """Busca ingênua com as mesmas regras (texto já normalizado, espaços simples)"""
+    found = []
+    for phrase in phrases:
+        start = text.find(phrase)
+        while start != -1:
+            end = start + len(phrase)
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                found.append((phrase, start, end))
+            start = text.find(phrase, start + 1)
+    return sorted(found, key=lambda m: (m[1], m[2]))
+
+
+def test_fold_keeps_length_and_removes_accents():
+    assert fold("Precificação Ágil") == "precificacao agil"
+    assert len(fold("ãéîõü")) == 5
+
+
+def test_overlapping_phrases_are_all_found():
+    matcher = KeywordMatcher({'g': ['he', 'she', 'his', 'hers']})
+    text = "ushers he she his hers"
+    found = [(m.phrase, m.start, m.end) for m in matcher.find(text)]
+    assert ('he', 7, 9) in found and ('she', 10, 13) in found and ('hers', 18, 22) in found
+    # dentro de "ushers" nada casa: limite de palavra
+    assert all(start >= 7 for _, start, _ in found)
+
+
+def test_word_boundaries():
+    matcher = KeywordMatcher({'g': ['r', 'sql']})
+    assert [m.phrase for m in matcher.find("rotina com R e SQL, mysql")] == ['r', 'sql']
+
+
+def test_positions_refer_to_original_text():
+    matcher = KeywordMatcher({'g': ['fluxo de caixa', 'contas a pagar']})
+    text = "Gestão do Fluxo  de\nCaixa e CONTAS A PAGAR."
+    matches = matcher.find(text)
+    assert [m.phrase for m in matches] == ['fluxo de caixa', 'contas a pagar']
+    assert text[matches[0].start:matches[0].end] == "Fluxo  de\nCaixa"
+    assert text[matches[1].start:matches[1].end] == "CONTAS A PAGAR"
+
+
+def test_scan_and_group_counts():
+    matcher = KeywordMatcher({'job:a': ['excel', 'sap'], 'skill:b': ['excel']})
+    hits = matcher.scan("Excel, excel e SAP")
+    assert hits['excel']['count'] == 2
+    assert matcher.found(hits, 'job:a') == {'excel', 'sap'}
+    assert matcher.group_counts(hits) == {'job:a': 3, 'skill:b': 2}
+
+
+def test_matches_naive_search_on_random_text():
+    rng = random.Random(7)
+    words = ['conta', 'contas', 'a', 'pagar', 'receber', 'caixa', 'fluxo', 'de', 'custo', 'custos']
+    phrases = ['contas a pagar', 'contas a receber', 'fluxo de caixa', 'custo', 'custos', 'a', 'de caixa']
+    matcher = KeywordMatcher({'g': phrases})
+    for _ in range(200):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 30)))
+        got = [(m.phrase, m.start, m.end) for m in matcher.find(text)]
+        assert got == _naive(phrases, text)
+
+
+def test_default_matcher_has_all_groups():
+    matcher = get_keyword_matcher()
+    assert any(group.startswith('job:') for group in matcher.groups)
+    assert any(group.startswith('skill:') for group in matcher.groups)
+    assert any(group.startswith('education:') for group in matcher.groups)
+    assert get_keyword_matcher() is matcher
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.automation.wait_engine import WaitEngine
+
+
+class FakeDriver:
+    """Driver mínimo: guarda o script timeout e devolve o resultado configurado"""
+
+    def __init__(self, script_timeout=30, result=True):
+        self.timeouts = SimpleNamespace(script=script_timeout)
+        self.result = result
+        self.seen_timeouts = []
+
+    def set_script_timeout(self, seconds):
+        self.timeouts.script = seconds
+
+    def execute_async_script(self, script, *args):
+        self.seen_timeouts.append(self.timeouts.script)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_dom_stable_restores_script_timeout():
+    driver = FakeDriver(script_timeout=12)
+    assert WaitEngine(driver).dom_stable(timeout=3) is True
+    assert driver.seen_timeouts == [8]
+    assert driver.timeouts.script == 12
+
+
+def test_script_timeout_is_restored_when_script_fails():
+    driver = FakeDriver(script_timeout=12, result=RuntimeError("script timeout"))
+    with pytest.raises(RuntimeError):
+        WaitEngine(driver)._run_async("return 1", 3)
+    assert driver.timeouts.script == 12